@@ -1,37 +1,56 @@
 # main.py
 import os
 import time
+import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
 from uuid import uuid4
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, ValidationError
-from typing import List
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Literal, Optional
+from fastapi.responses import JSONResponse, StreamingResponse
 
-import redis
-from rq import Queue
+from rq import Callback, Queue, Retry
 
 # Import your config
 from src.agent.config import settings
 
-# Import LangGraph chain
-from src.agent.application.agents.chains.connection_finding_chain import (
-    connection_finding_chain
+from src.agent.application.ingestion import ingest_profiles, iter_ndjson, iter_records
+from src.agent.application.jobs import (
+    encode_match_job,
+    on_match_job_failure,
+    run_match_job,
 )
 
 # Import LangGraph graphs
 from src.agent.application.agents.graphs.build_proj_gen_graph import projects_agent
 from src.agent.application.agents.graphs.build_interest_gen_graph import interests_agent
-from src.agent.application.agents.graphs.build_find_match_graph import match_agent
 
 # Import domain models and services
 from src.agent.domain.fyp_data import Fyp_data
 from src.agent.domain.metadata import Metadata
 from src.agent.domain.match_state import Match_State
-from src.agent.infrastructure.mongo.service import MongoDBService
+from src.agent.domain.match_constraints import Match_constraints, Profile_id
+from src.agent.domain.match_score import Match_score
+from src.agent.domain.top_k import Top_k
+from src.agent.infrastructure.mongo.async_service import AsyncMongoDBService
+from src.agent.infrastructure.mongo.client import close_mongo_clients, close_async_mongo_clients
+from src.agent.infrastructure.mongo.indexes import (
+    STD_PROFILES_INDEXES,
+    STD_PROFILES_UNIQUE_INDEXES,
+    MATCH_SCORES_INDEXES,
+)
+from src.agent.infrastructure.redis import (
+    get_redis_connection,
+    get_async_redis_connection,
+    progress_channel,
+    progress_key,
+    JobStore,
+    RedisCheckpointSaver,
+    get_worker_pool_states,
+)
 
 # ---------------------------------------------------
 # Configure LangSmith Tracing
@@ -53,10 +72,37 @@ logger = logging.getLogger("langgraph_api")
 # ---------------------------------------------------
 # FastAPI App
 # ---------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with AsyncMongoDBService(model=Fyp_data, collection_name="std_profiles") as service:
+            await service.create_indexes(STD_PROFILES_INDEXES)
+        logger.info("✅ std_profiles indexes ensured")
+    except Exception as e:
+        logger.error(f"❌ Failed to create std_profiles indexes: {e}")
+    try:
+        async with AsyncMongoDBService(model=Fyp_data, collection_name="std_profiles") as service:
+            await service.create_indexes(STD_PROFILES_UNIQUE_INDEXES)
+        logger.info("✅ std_profiles unique student index ensured")
+    except Exception as e:
+        logger.error(f"❌ Failed to create the unique student index (remove duplicate profiles first): {e}")
+    if settings.MATCH_SCORE_CACHE_MONGO:
+        try:
+            async with AsyncMongoDBService(model=Match_score, collection_name="match_scores") as service:
+                await service.create_indexes(MATCH_SCORES_INDEXES)
+            logger.info("✅ match_scores indexes ensured")
+        except Exception as e:
+            logger.error(f"❌ Failed to create match_scores indexes: {e}")
+    yield
+    await close_async_mongo_clients()
+    close_mongo_clients()
+
+
 app = FastAPI(
     title="LangGraph API",
     description="API wrapper for LangGraph agents",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS
@@ -73,23 +119,12 @@ app.add_middleware(
 # ---------------------------------------------------
 # Redis + RQ setup
 # ---------------------------------------------------
-def get_redis_connection():
-    return redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        decode_responses=True,
-        username=settings.REDIS_USERNAME,
-        password=settings.REDIS_PASSWORD,
-        socket_connect_timeout=10,
-        socket_timeout=10,
-        retry_on_timeout=True,
-        health_check_interval=30,
-        max_connections=20,
-    )
-
-
+# These clients block: async routes call them with asyncio.to_thread so a
+# slow Redis does not stall the event loop.
 redis_conn = get_redis_connection()
 queue = Queue("matches", connection=redis_conn)
+checkpoints = RedisCheckpointSaver()
+job_store = JobStore()
 
 
 # ---------------------------------------------------
@@ -114,6 +149,13 @@ class MetadataRequest(BaseModel):
     email: str
 
 
+class MatchConstraintsRequest(BaseModel):
+    same_year: bool = False
+    departments: Optional[List[str]] = None
+    min_skill_overlap: int = 0
+    exclude_ids: List[Profile_id] = []
+
+
 class MatchRequest(BaseModel):
     id: str
     title: str
@@ -123,6 +165,11 @@ class MatchRequest(BaseModel):
     interests: List[str]
     score: float
     metadata: MetadataRequest
+    prefilter_top_n: Optional[int] = None
+    scoring_mode: Optional[Literal["llm", "heuristic", "hybrid"]] = None
+    constraints: Optional[MatchConstraintsRequest] = None
+    incremental: bool = False
+    top_k: Optional[int] = Field(default=None, ge=1, le=100)
 
 
 class UserIngestionRequest(BaseModel):
@@ -136,23 +183,6 @@ class UserIngestionRequest(BaseModel):
     metadata: MetadataRequest
 
 
-# ---------------------------------------------------
-# Background worker
-# ---------------------------------------------------
-def run_match_agent(job_id: str, initial_state: Match_State):
-    logger.info(f"🚀 Running match agent for job {job_id}...")
-    try:
-        result = match_agent.invoke(initial_state)
-        matches = result.get("all_data", [])
-
-        payload = {"status": "done", "result": jsonable_encoder(matches)}
-        redis_conn.set(job_id, json.dumps(payload))
-        logger.info(f"✅ Job {job_id} completed with {len(matches)} matches")
-    except Exception as e:
-        logger.error(f"❌ Job {job_id} failed: {e}")
-        redis_conn.set(job_id, json.dumps({"status": "error", "error": str(e)}))
-
-
 # ---------------------------------------------------
 # Routes
 # ---------------------------------------------------
@@ -165,7 +195,7 @@ def health_check():
 async def generate_project(req: ProjectRequest):
     try:
         logger.info(f"📥 /generate_project request: {req.json()}")
-        result = projects_agent.invoke({"domain": req.domain})
+        result = await projects_agent.ainvoke({"domain": req.domain})
         logger.info(f"📤 /generate_project response: {result}")
         return {"success": True, "result": result}
     except Exception as e:
@@ -177,7 +207,7 @@ async def generate_project(req: ProjectRequest):
 async def generate_interests(req: InterestRequest):
     try:
         logger.info(f"📥 /generate_interests request: {req.json()}")
-        result = interests_agent.invoke({
+        result = await interests_agent.ainvoke({
             "student_id": req.student_id,
             "interests": req.interests
         })
@@ -203,15 +233,47 @@ async def find_matches(req: MatchRequest):
             metadata=query_metadata,
         )
 
+        scoring_mode = req.scoring_mode or settings.MATCH_SCORING_MODE
+        limit = (
+            settings.MATCH_HEURISTIC_BATCH_SIZE if scoring_mode == "heuristic"
+            else settings.MATCH_LLM_BATCH_SIZE
+        )
+
         initial_state = Match_State(
             all_data=[], query=query_data, done=False,
-            offset=0, limit=25, results={},
-            chain=connection_finding_chain()
+            offset=0, limit=limit,
+            batch_token_budget=settings.MATCH_BATCH_TOKEN_BUDGET,
+            results=Top_k(k=req.top_k or settings.MATCH_TOP_K),
+            max_in_flight=settings.MATCH_MAX_IN_FLIGHT,
+            prefilter_top_n=(
+                req.prefilter_top_n if req.prefilter_top_n is not None
+                else settings.MATCH_PREFILTER_TOP_N
+            ),
+            scoring_mode=scoring_mode,
+            constraints=(
+                Match_constraints(**req.constraints.dict())
+                if req.constraints else None
+            ),
+            incremental=req.incremental,
+            job_id=job_id,
         )
 
-        # enqueue background job
-        queue.enqueue(run_match_agent, job_id, initial_state)
-        redis_conn.set(job_id, json.dumps({"status": "processing"}))
+        # enqueue background job; the worker uses its own shared chain, so
+        # the payload only carries the query and parameters. The job is
+        # recorded first so a fast worker's result is not overwritten. The
+        # RQ job shares the match job's id, which is also the thread id of
+        # its checkpoints: a retried job resumes where it stopped.
+        await asyncio.to_thread(job_store.create, job_id)
+        await asyncio.to_thread(
+            queue.enqueue,
+            run_match_job,
+            job_id,
+            encode_match_job(initial_state),
+            job_id=job_id,
+            retry=Retry(max=settings.JOB_MAX_RETRIES) if settings.JOB_MAX_RETRIES else None,
+            # Records the failures the job cannot, e.g. a dead worker.
+            on_failure=Callback(on_match_job_failure),
+        )
 
         return {"success": True, "job_id": job_id, "status": "processing"}
     except Exception as e:
@@ -219,13 +281,105 @@ async def find_matches(req: MatchRequest):
         raise HTTPException(status_code=500, detail="Match finding failed")
 
 
+def read_match_job(job_id: str) -> Optional[dict]:
+    """The stored job, with the position of its last checkpoint while it runs."""
+    job_data = job_store.get(job_id)
+    if (
+        job_data is not None
+        and job_data["status"] == "processing"
+        and settings.JOB_CHECKPOINTS_ENABLED
+    ):
+        job_data["checkpoint"] = checkpoints.get_position(job_id)
+    return job_data
+
+
 @app.get("/find_matches/{job_id}", tags=["Matching"])
 async def get_match_status(job_id: str):
-    """Check the status or result of a match-finding job."""
-    job_data = redis_conn.get(job_id)
-    if not job_data:
+    """Check the status or result of a match-finding job.
+
+    While the job runs, `checkpoint` tells how far its last checkpoint got.
+    """
+    job_data = await asyncio.to_thread(read_match_job, job_id)
+    if job_data is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_data
+
+
+@app.get("/find_matches/{job_id}/status", tags=["Matching"])
+async def get_match_job_status(job_id: str):
+    """Check the status of a match-finding job without loading its result."""
+    status = await asyncio.to_thread(job_store.get_status, job_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    return json.loads(job_data)
+    return status
+
+
+def read_worker_state() -> dict:
+    """State of the matches queue and of the match worker pools."""
+    return {
+        "queue": {
+            "name": queue.name,
+            "queued": queue.count,
+            "started": queue.started_job_registry.count,
+        },
+        "pools": get_worker_pool_states(),
+    }
+
+
+@app.get("/workers", tags=["Matching"])
+async def get_workers():
+    """State of the matches queue and of the match worker pools."""
+    try:
+        return await asyncio.to_thread(read_worker_state)
+    except Exception as e:
+        logger.error(f"❌ Error in /workers: {e}")
+        raise HTTPException(status_code=500, detail="Failed to read worker state")
+
+
+@app.get("/find_matches/{job_id}/stream", tags=["Matching"])
+async def stream_match_progress(job_id: str, request: Request):
+    """Stream the progress and provisional top-k of a match-finding job (SSE)."""
+    if not await asyncio.to_thread(job_store.exists, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        client = get_async_redis_connection()
+        pubsub = client.pubsub()
+        try:
+            # Subscribe before reading the snapshot so no event is missed.
+            await pubsub.subscribe(progress_channel(job_id))
+
+            latest = await client.get(progress_key(job_id))
+            if latest is None:
+                # The progress snapshot expires before the job itself.
+                job_data = await asyncio.to_thread(job_store.get, job_id)
+                latest = json.dumps(job_data) if job_data else None
+            while True:
+                if latest is not None:
+                    yield f"data: {latest}\n\n"
+                    if json.loads(latest).get("status") in ("done", "error"):
+                        return
+
+                if await request.is_disconnected():
+                    return
+
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=15.0
+                )
+                if message is None:
+                    latest = None
+                    yield ": keep-alive\n\n"
+                else:
+                    latest = message["data"]
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.post("/ingest_user", tags=["Users"])
@@ -239,8 +393,11 @@ async def ingest_user(req: UserIngestionRequest):
             interests=req.interests, score=req.score,
             metadata=metadata
         )
-        with MongoDBService(model=Fyp_data, collection_name="std_profiles") as service:
-            service.ingest_documents([user_data])
+        # Resubmitting the form replaces the student's profile.
+        report = await ingest_profiles(iter_records([user_data.model_dump()]))
+        if report.failed:
+            raise Exception(report.failed[0].error)
+
         logger.info(f"✅ Successfully ingested user data for ID: {req.id}")
         return {"success": True, "message": "User data ingested successfully"}
     except Exception as e:
@@ -248,11 +405,41 @@ async def ingest_user(req: UserIngestionRequest):
         raise HTTPException(status_code=500, detail="User ingestion failed")
 
 
+@app.post("/ingest_users", tags=["Users"])
+async def ingest_users(request: Request):
+    """Ingest many profiles from a JSON array or an NDJSON stream.
+
+    Invalid or rejected records are reported without aborting the others.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        records = iter_ndjson(request.stream())
+    else:
+        try:
+            body = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        if not isinstance(body, list):
+            raise HTTPException(status_code=422, detail="Body must be a JSON array of profiles")
+        records = iter_records(body)
+
+    try:
+        report = await ingest_profiles(records)
+        logger.info(
+            f"✅ Ingested {report.inserted}/{report.received} users, "
+            f"{len(report.failed)} failed"
+        )
+        return {"success": True, **report.model_dump()}
+    except Exception as e:
+        logger.error(f"❌ Error in /ingest_users: {e}")
+        raise HTTPException(status_code=500, detail="Bulk user ingestion failed")
+
+
 @app.get("/stats", tags=["Stats"])
 async def get_stats():
     try:
-        with MongoDBService(model=Fyp_data, collection_name="std_profiles") as service:
-            count = service.get_collection_count()
+        async with AsyncMongoDBService(model=Fyp_data, collection_name="std_profiles") as service:
+            count = await service.get_collection_count()
         logger.info(f"📊 Stats requested, total profiles = {count}")
         return {"success": True, "total_profiles": count}
     except Exception as e:
@@ -1,11 +1,13 @@
-from langchain.output_parsers import PydanticOutputParser
-from langchain_core.output_parsers.json import JsonOutputParser
 from langchain_groq import ChatGroq
 
-from src.agent.application.agents.prompts.pull_connection_finding_prompt import (
-    pull_connection_finding_prompt
+from src.agent.application.agents.prompts.connection_finding_prompt import (
+    build_connection_finding_prompt
 )
-from src.agent.domain.connection_llm_output import Connection_llm_output
+from src.agent.application.agents.prompts.partial_connection_finding_prompt import (
+    build_partial_connection_finding_prompt
+)
+from src.agent.application.agents.chains.rate_limit import rate_limit_step
+from src.agent.application.agents.chains.score_output_parser import ScoreOutputParser
 from src.agent.config import settings
 
 from loguru import logger
@@ -14,23 +16,53 @@ from loguru import logger
 def connection_finding_chain():
     logger.info("[Chain] Building connection finding chain...")
 
-    parser = PydanticOutputParser(pydantic_object=Connection_llm_output)
+    parser = ScoreOutputParser()
+    format_instructions = parser.get_format_instructions()
+
+    llm = ChatGroq(
+        api_key=settings.GROQ_API_KEY,
+        model="llama-3.1-8b-instant",
+        temperature=0,
+        # Failed batches are retried by the scorer (see scoring/retry.py).
+        max_retries=0,
+        model_kwargs={
+            "top_p": 0.95,
+            "response_format": {"type": "json_object"}
+        }
+    )
+
+    prompt = build_connection_finding_prompt()
+
+    chain = prompt.partial(
+        format_instructions=format_instructions
+    ) | rate_limit_step(llm.model_name) | llm | parser
+
+    return chain
+
+
+def partial_connection_finding_chain():
+    logger.info("[Chain] Building partial connection finding chain...")
+
+    # Two criteria of 0.0–1.0.
+    parser = ScoreOutputParser(max_score=2.0)
     format_instructions = parser.get_format_instructions()
 
     llm = ChatGroq(
         api_key=settings.GROQ_API_KEY,
         model="llama-3.1-8b-instant",
         temperature=0,
+        # Failed batches are retried by the scorer (see scoring/retry.py).
+        max_retries=0,
         model_kwargs={
             "top_p": 0.95,
             "response_format": {"type": "json_object"}
         }
     )
 
-    prompt = pull_connection_finding_prompt()
+    prompt = build_partial_connection_finding_prompt()
 
     chain = prompt.partial(
         format_instructions=format_instructions
-    ) | llm | JsonOutputParser()
+    ) | rate_limit_step(llm.model_name) | llm | parser
 
     return chain
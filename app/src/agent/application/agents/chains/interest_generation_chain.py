@@ -7,6 +7,7 @@ from src.agent.application.agents.prompts.pull_interest_prompt import (
 )
 
 from src.agent.domain.gen_state import Gen_State
+from src.agent.application.agents.chains.rate_limit import rate_limit_step
 from src.agent.config import settings
 
 from loguru import logger
@@ -34,6 +35,6 @@ def build_interest_generation_chain():
 
     chain = prompt.partial(
         format_instructions=format_instructions
-    ) | llm | JsonOutputParser()
+    ) | rate_limit_step(llm.model_name) | llm | JsonOutputParser()
 
     return chain
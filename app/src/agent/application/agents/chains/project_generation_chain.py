@@ -6,6 +6,7 @@ from src.agent.application.agents.prompts.pull_proj_prompts import (
     pull_proj_gen_prompt
 )
 from src.agent.domain.gen_state import Gen_State
+from src.agent.application.agents.chains.rate_limit import rate_limit_step
 from src.agent.config import settings
 
 from loguru import logger
@@ -33,6 +34,6 @@ def build_project_generation_chain():
  
     chain = prompt.partial(
         format_instructions=format_instructions
-    ) | llm | JsonOutputParser()
+    ) | rate_limit_step(llm.model_name) | llm | JsonOutputParser()
 
     return chain
@@ -0,0 +1,59 @@
+from typing import Any, Optional
+
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.agent.config import settings
+from src.agent.infrastructure.redis import estimate_tokens, get_rate_limiter
+
+
+def _request_tokens(prompt_value: PromptValue) -> int:
+    return (
+        estimate_tokens(prompt_value.to_string())
+        + settings.GROQ_COMPLETION_TOKENS_ESTIMATE
+    )
+
+
+class RateLimitStep(Runnable[PromptValue, PromptValue]):
+    '''
+    Pass-through step placed between the prompt and the LLM that waits until
+    the shared Groq quota of `model` allows the request.
+
+    It only holds the model name and looks the process-wide limiter up on
+    every call, so chains containing it can be pickled.
+    '''
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self.name = f"rate_limit[{model}]"
+
+    def _wait(self, prompt_value: PromptValue) -> PromptValue:
+        get_rate_limiter(self.model).acquire(_request_tokens(prompt_value))
+        return prompt_value
+
+    async def _await(self, prompt_value: PromptValue) -> PromptValue:
+        await get_rate_limiter(self.model).aacquire(_request_tokens(prompt_value))
+        return prompt_value
+
+    def invoke(
+        self,
+        input: PromptValue,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any
+    ) -> PromptValue:
+        return self._call_with_config(self._wait, input, config)
+
+    async def ainvoke(
+        self,
+        input: PromptValue,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any
+    ) -> PromptValue:
+        return await self._acall_with_config(self._await, input, config)
+
+
+def rate_limit_step(model: str) -> RateLimitStep:
+    '''
+    Rate-limit step for the Groq quota of `model`.
+    '''
+    return RateLimitStep(model)
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Callable
+
+from loguru import logger
+
+from src.agent.application.agents.chains.connection_finding_chain import (
+    connection_finding_chain,
+    partial_connection_finding_chain,
+)
+from src.agent.application.agents.chains.interest_generation_chain import (
+    build_interest_generation_chain,
+)
+from src.agent.application.agents.chains.project_generation_chain import (
+    build_project_generation_chain,
+)
+from src.agent.application.agents.prompts.registry import get_prompt_registry
+
+
+# Builder of each chain, and the LangSmith prompt it is built from (None
+# for prompts defined in code). The connection finding prompts are defined
+# in code: their answer format and profile encoding change with the parser
+# and the encoder, which a LangSmith prompt would not follow.
+CHAIN_BUILDERS: dict[str, tuple[Callable[[], Any], str | None]] = {
+    "connection_finding": (connection_finding_chain, None),
+    "partial_connection_finding": (partial_connection_finding_chain, None),
+    "project_generation": (build_project_generation_chain, "project_generation"),
+    "interest_generation": (build_interest_generation_chain, "interest_generation"),
+}
+
+
+class ChainRegistry:
+    """Chains built once per process and reused by every request and job.
+
+    Chains are kept by name and version, the commit hash of their prompt,
+    so a prompt refreshed from LangSmith is picked up by the next `get`.
+    Their Groq clients keep their HTTP connection pools between calls.
+    Async HTTP clients cannot be shared between event loops, so chains used
+    from a running loop are kept per loop, like the async MongoDB clients.
+    """
+
+    def __init__(self) -> None:
+        self._chains: dict[tuple[str, str], Any] = {}
+        self._loop_chains: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple[str, str], Any]
+        ] = weakref.WeakKeyDictionary()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # Connections of the inherited HTTP clients belong to the parent.
+        self._chains = {}
+        self._loop_chains = weakref.WeakKeyDictionary()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def version(self, name: str) -> str:
+        """Return the version of a chain: the commit hash of its prompt.
+
+        Args:
+            name: Name of the chain, a key of CHAIN_BUILDERS.
+
+        Returns:
+            The commit hash, or "local" for prompts not pulled from LangSmith.
+        """
+
+        prompt_name = CHAIN_BUILDERS[name][1]
+        if prompt_name is None:
+            return "local"
+        return get_prompt_registry().version(prompt_name)
+
+    def get(self, name: str) -> Any:
+        """Return a chain, building it on first use.
+
+        Args:
+            name: Name of the chain, a key of CHAIN_BUILDERS.
+
+        Returns:
+            The chain.
+
+        Raises:
+            KeyError: If the chain is unknown.
+        """
+
+        if name not in CHAIN_BUILDERS:
+            raise KeyError(f"Unknown chain: '{name}'.")
+        if os.getpid() != self._pid:
+            # Safety net in case the at-fork hook did not run.
+            self._after_fork()
+
+        key = (name, self.version(name))
+        try:
+            chains = self._loop_chains.setdefault(asyncio.get_running_loop(), {})
+        except RuntimeError:
+            chains = self._chains
+
+        with self._lock:
+            chain = chains.get(key)
+            if chain is None:
+                # Drop the chains built from an older prompt.
+                for stale in [k for k in chains if k[0] == name]:
+                    del chains[stale]
+                chain = chains[key] = CHAIN_BUILDERS[name][0]()
+                logger.debug(f"[Chain] Cached chain '{name}' ({key[1]}, pid {self._pid}).")
+
+        return chain
+
+
+_registry: ChainRegistry | None = None
+
+
+def get_chain_registry() -> ChainRegistry:
+    """Return the process-wide chain registry."""
+
+    global _registry
+
+    if _registry is None:
+        _registry = ChainRegistry()
+
+    return _registry
+
+
+def get_chain(name: str) -> Any:
+    """Return a chain from the process-wide registry."""
+
+    return get_chain_registry().get(name)
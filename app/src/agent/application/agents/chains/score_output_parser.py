@@ -0,0 +1,63 @@
+import math
+
+import orjson
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import BaseOutputParser
+
+from src.agent.domain.prompts import SCORE_OUTPUT_FORMAT
+
+
+# Key of the list of [id, score] pairs in the answer. The answer must be a JSON
+# object, as Groq's JSON mode requires.
+SCORES_KEY = "s"
+
+
+class ScoreOutputParser(BaseOutputParser[list[tuple[int, float]]]):
+    '''
+    Parses the `{"s": [[id, score], ...]}` answer of the connection finding
+    chains into (id, score) pairs.
+
+    The answer itself must be valid JSON of that shape, else the parser
+    raises OutputParserException. Malformed pairs (an id that is not an
+    integer, a score out of [0, max_score]) are dropped, so the candidates
+    they were meant for count as unscored and can be asked again. Ids are
+    not checked against the batch: see `LLMScorer.parse_result`.
+    '''
+    max_score: float = 5.0
+
+    def parse(self, text: str) -> list[tuple[int, float]]:
+        try:
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError as e:
+            raise OutputParserException(
+                f"Invalid JSON in the scores: {e}", llm_output=text
+            ) from e
+
+        if isinstance(data, dict):
+            data = data.get(SCORES_KEY)
+        if not isinstance(data, list):
+            raise OutputParserException(
+                f'Expected {{"{SCORES_KEY}": [[id, score], ...]}}', llm_output=text
+            )
+
+        pairs = []
+        for pair in data:
+            if not isinstance(pair, list) or len(pair) != 2:
+                continue
+            id, score = pair
+            if isinstance(id, str) and id.isdigit():
+                id = int(id)
+            if (
+                isinstance(id, int) and not isinstance(id, bool)
+                and isinstance(score, (int, float)) and not isinstance(score, bool)
+                and math.isfinite(score) and 0.0 <= score <= self.max_score
+            ):
+                pairs.append((id, float(score)))
+        return pairs
+
+    def get_format_instructions(self) -> str:
+        return SCORE_OUTPUT_FORMAT
+
+    @property
+    def _type(self) -> str:
+        return "score_pairs"
@@ -1,36 +1,75 @@
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph
 from langsmith import Client
 from langchain.callbacks.tracers import LangChainTracer
 
 from src.agent.domain.match_state import Match_State
 from src.agent.domain.fyp_data import Fyp_data
+from src.agent.domain.match_constraints import Match_constraints
+from src.agent.domain.top_k import Top_k
 
 from src.agent.config import settings
-from src.agent.application.agents.chains.connection_finding_chain import (
-    connection_finding_chain
+from src.agent.application.scoring import Scoring_mode
+from src.agent.application.agents.graphs.nodes.load_match_result_node import (
+    load_match_result_node,
+    aload_match_result_node,
+)
+from src.agent.application.agents.graphs.nodes.fetch_data_node import (
+    fetch_data_node,
+    afetch_data_node,
+)
+from src.agent.application.agents.graphs.nodes.find_connection_node import (
+    find_connection_node,
+    afind_connection_node,
 )
-from src.agent.application.agents.graphs.nodes.fetch_data_node import fetch_data_node
-from src.agent.application.agents.graphs.nodes.find_connection_node import find_connection_node
 from src.agent.application.agents.graphs.nodes.should_fetch_more import should_fetch_more
-from src.agent.application.agents.graphs.nodes.extract_top_five_node import extract_top_five_node
+from src.agent.application.agents.graphs.nodes.extract_top_five_node import (
+    extract_top_five_node,
+    aextract_top_five_node,
+)
+from src.agent.application.agents.graphs.nodes.save_match_result_node import (
+    save_match_result_node,
+    asave_match_result_node,
+)
 
 from loguru import logger
 
 
 class MatcherGraphRunner:
-    def __init__(self) -> None:
-        self.graph = self.build_graph()
+    def __init__(self, checkpointer: BaseCheckpointSaver | None = None) -> None:
+        self.graph = self.build_graph(checkpointer)
 
-    def build_graph(self) -> StateGraph:
+    def build_graph(self, checkpointer: BaseCheckpointSaver | None = None) -> StateGraph:
         logger.info("[Graph] Building match finding graph...")
 
         builder = StateGraph(Match_State)
 
-        builder.add_node("fetch_data_node", fetch_data_node)
-        builder.add_node("find_connection_node", find_connection_node)
-        builder.add_node("extract_top_five_node", extract_top_five_node)
+        # I/O bound nodes have an async variant, used when the graph runs
+        # with `ainvoke`; `invoke` keeps using the sync one.
+        builder.add_node(
+            "load_match_result_node",
+            RunnableLambda(load_match_result_node, afunc=aload_match_result_node)
+        )
+        builder.add_node(
+            "fetch_data_node",
+            RunnableLambda(fetch_data_node, afunc=afetch_data_node)
+        )
+        builder.add_node(
+            "find_connection_node",
+            RunnableLambda(find_connection_node, afunc=afind_connection_node)
+        )
+        builder.add_node(
+            "extract_top_five_node",
+            RunnableLambda(extract_top_five_node, afunc=aextract_top_five_node)
+        )
+        builder.add_node(
+            "save_match_result_node",
+            RunnableLambda(save_match_result_node, afunc=asave_match_result_node)
+        )
 
-        builder.set_entry_point("fetch_data_node")
+        builder.set_entry_point("load_match_result_node")
+        builder.add_edge("load_match_result_node", "fetch_data_node")
         builder.add_edge("fetch_data_node", "find_connection_node")
         builder.add_conditional_edges(
             "find_connection_node",
@@ -41,13 +80,23 @@ class MatcherGraphRunner:
             },
         )
 
-        builder.set_finish_point("extract_top_five_node")
+        builder.add_edge("extract_top_five_node", "save_match_result_node")
+        builder.set_finish_point("save_match_result_node")
 
-        graph = builder.compile()
+        # With a checkpointer, every step is saved under the thread_id of
+        # the run's config, and a run invoked with no input resumes from it.
+        graph = builder.compile(checkpointer=checkpointer)
 
         return graph
 
-    async def find_matches(self, query: Fyp_data) -> Match_State:
+    async def find_matches(
+        self,
+        query: Fyp_data,
+        scoring_mode: Scoring_mode = settings.MATCH_SCORING_MODE,
+        constraints: Match_constraints | None = None,
+        incremental: bool = False,
+        top_k: int = settings.MATCH_TOP_K
+    ) -> Match_State:
         tracer = LangChainTracer(
             project_name=settings.LANGSMITH_PROJECT,
             client=Client(api_key=settings.LANGSMITH_API_KEY),
@@ -58,9 +107,17 @@ class MatcherGraphRunner:
             query=query,
             done=False,
             offset=0,
-            limit=25,
-            results={},
-            chain=connection_finding_chain()
+            limit=(
+                settings.MATCH_HEURISTIC_BATCH_SIZE if scoring_mode == "heuristic"
+                else settings.MATCH_LLM_BATCH_SIZE
+            ),
+            batch_token_budget=settings.MATCH_BATCH_TOKEN_BUDGET,
+            results=Top_k(k=top_k),
+            max_in_flight=settings.MATCH_MAX_IN_FLIGHT,
+            prefilter_top_n=settings.MATCH_PREFILTER_TOP_N,
+            scoring_mode=scoring_mode,
+            constraints=constraints,
+            incremental=incremental,
         )
 
         logger.info("[Graph] Invoking graph...")
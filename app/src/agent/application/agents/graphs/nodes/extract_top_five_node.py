@@ -1,42 +1,87 @@
-from bson import ObjectId
-from src.agent.domain.match_state import Match_State
+from src.agent.config import settings
 from src.agent.domain.fyp_data import Fyp_data
+from src.agent.domain.match_state import Match_State
+from src.agent.domain.top_k import Profile
 from src.agent.infrastructure.mongo.service import MongoDBService
+from src.agent.infrastructure.mongo.async_service import AsyncMongoDBService
+from src.agent.infrastructure.mongo.filters import object_ids
 
 from loguru import logger
 
 
+def winners_query(winners: list[Profile]) -> dict:
+    '''
+    Query of the full profiles of the winners.
+    '''
+    return {"_id": {"$in": object_ids([data.id for data in winners])}}
+
+
+def merge_winners(
+    winners: list[Profile],
+    profiles: list[Fyp_data]
+) -> list[Fyp_data]:
+    '''
+    Replace the winners by their full profiles, keeping their scores and
+    order. A winner whose profile was deleted meanwhile is dropped, as it
+    can no longer be matched.
+    '''
+    by_id = {profile.id: profile for profile in profiles}
+
+    deleted = [data.id for data in winners if data.id not in by_id]
+    if deleted:
+        logger.warning(
+            f"Dropped {len(deleted)} matches whose profile was deleted: {deleted}"
+        )
+
+    return [
+        by_id[data.id].model_copy(update={"score": data.score})
+        for data in winners
+        if data.id in by_id
+    ]
+
+
 def extract_top_five_node(state: Match_State) -> Match_State:
     """
-    Extracts the top five matches from the Match_State based on their scores.
+    Extracts the top k matches kept in `state.results`, best first.
     """
-    # Get top 5 results by score
-    top_5 = dict(
-        sorted(
-            state.results.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-    )
-
-    logger.info("Extracting top 5 matches...")
-
-    # Convert string IDs to ObjectId
-    ids_to_fetch = [ObjectId(i) for i in top_5.keys()]
-
-    with MongoDBService(
-        model=Fyp_data,
-        collection_name="std_profiles"
-    ) as service:
-        all_data = service.fetch_documents(
-            limit=5,
-            offset=0,
-            query={"_id": {"$in": ids_to_fetch}}
-        )
+    logger.info(f"Extracting top {state.results.k} matches...")
+
+    # The winning profiles are kept with their scores while scoring, so only
+    # the k winners are read again when they were fetched lean. A failed
+    # read fails the node: scoring views are not match results.
+    state.all_data = state.results.best()
+
+    if settings.MATCH_LEAN_FETCH and state.all_data:
+        with MongoDBService(
+            model=Fyp_data,
+            collection_name="std_profiles"
+        ) as service:
+            profiles = service.fetch_documents(
+                limit=len(state.all_data),
+                query=winners_query(state.all_data)
+            )
+        state.all_data = merge_winners(state.all_data, profiles)
+
+    return state
+
+
+async def aextract_top_five_node(state: Match_State) -> Match_State:
+    """
+    Async variant of `extract_top_five_node`.
+    """
+    logger.info(f"Extracting top {state.results.k} matches...")
+
+    state.all_data = state.results.best()
 
-    # Attach score from top_5 to each fetched record
-    for data in all_data:
-        data.score = top_5.get(str(data.id), 0)  # Convert back to string for lookup
+    if settings.MATCH_LEAN_FETCH and state.all_data:
+        async with AsyncMongoDBService(
+            model=Fyp_data,
+            collection_name="std_profiles"
+        ) as service:
+            profiles = await service.fetch_documents(
+                limit=len(state.all_data),
+                query=winners_query(state.all_data)
+            )
+        state.all_data = merge_winners(state.all_data, profiles)
 
-    state.all_data = all_data
     return state
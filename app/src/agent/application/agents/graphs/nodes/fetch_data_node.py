@@ -1,26 +1,99 @@
+import asyncio
+
 from loguru import logger
 
+from src.agent.config import settings
 from src.agent.domain.fyp_data import Fyp_data
+from src.agent.domain.fyp_scoring_view import Fyp_scoring_view
 from src.agent.domain.match_state import Match_State
+from src.agent.domain.top_k import Profile
 from src.agent.infrastructure.mongo.service import MongoDBService
+from src.agent.infrastructure.mongo.async_service import AsyncMongoDBService
+from src.agent.infrastructure.mongo.documents import keyset_filter
+from src.agent.infrastructure.mongo.filters import (
+    SCORING_PROJECTION,
+    build_candidate_filter,
+)
+from src.agent.infrastructure.vector_index import get_vector_index
 
 
-def fetch_data_node(state: Match_State) -> Match_State:
+def own_profile_query(state: Match_State) -> dict:
     '''
-    Fetch fyp data from mongoDB.
+    Filter of the stored profile of the query student. The query carries
+    the student id, the vector index knows profiles by their `_id`.
     '''
-    logger.info("Fetching data from mongoDB collection...")
+    return {"metadata.id": state.query.metadata.id}
 
-    with MongoDBService(
-        model=Fyp_data,
-        collection_name="std_profiles"
-    ) as service:
-        data = service.fetch_documents(
-            limit=state.limit,
-            offset=state.offset,
-            query={}
-        )
 
+def prefilter_candidates(
+    state: Match_State,
+    own_ids: set[str] | None = None
+) -> list[str] | None:
+    '''
+    Pre-select the candidates closest to the query with the vector index,
+    leaving out `own_ids`, the `_id` of the query student's own profile.
+
+    Returns None when the index is unavailable or empty, in which case the
+    whole collection is scanned.
+    '''
+    try:
+        index = get_vector_index()
+    except Exception as e:
+        logger.warning(f"Vector index unavailable, scanning all profiles: {e}")
+        return None
+
+    if not len(index):
+        logger.debug("Vector index is empty, scanning all profiles.")
+        return None
+
+    exclude_ids = set(own_ids or ())
+    if state.constraints is not None:
+        exclude_ids.update(state.constraints.exclude_ids)
+
+    neighbours = index.search(
+        state.query,
+        top_n=state.prefilter_top_n,
+        exclude_ids=exclude_ids
+    )
+    logger.info(f"Vector index pre-selected {len(neighbours)} candidates.")
+
+    return [profile_id for profile_id, _ in neighbours]
+
+
+def needs_prefilter(state: Match_State) -> bool:
+    '''
+    Whether the candidates are still to be pre-selected: on the first round
+    of a job with MATCH_PREFILTER_TOP_N.
+    '''
+    return bool(state.prefilter_top_n) and state.candidate_ids is None
+
+
+def candidate_filter(state: Match_State) -> dict:
+    '''
+    Filter of the profiles eligible as matches.
+    '''
+    return build_candidate_filter(
+        state.query,
+        constraints=state.constraints,
+        candidate_ids=state.candidate_ids
+    )
+
+
+def fetch_model() -> tuple[type[Profile], dict | None]:
+    '''
+    Model and projection of the fetched profiles. With MATCH_LEAN_FETCH,
+    only the scored fields are loaded and validated; the winners are
+    reloaded in full by `extract_top_five_node`.
+    '''
+    if settings.MATCH_LEAN_FETCH:
+        return Fyp_scoring_view, SCORING_PROJECTION
+    return Fyp_data, None
+
+
+def apply_fetched(state: Match_State, data: list[Profile]) -> Match_State:
+    '''
+    Record a fetched page in the state.
+    '''
     logger.info("Data fetched.")
 
     if data:
@@ -28,10 +101,85 @@ def fetch_data_node(state: Match_State) -> Match_State:
 
         state.all_data = data
         state.offset += len(data)
+        state.last_id = data[-1].id
         state.done = False
     else:
         logger.debug("No prfiles fetched.")
 
+        state.all_data = []
         state.done = True
 
     return state
+
+
+def fetch_data_node(state: Match_State) -> Match_State:
+    '''
+    Fetch fyp data from mongoDB.
+    '''
+    logger.info("Fetching data from mongoDB collection...")
+
+    model, projection = fetch_model()
+
+    with MongoDBService(
+        model=model,
+        collection_name="std_profiles"
+    ) as service:
+        if needs_prefilter(state):
+            own = service.fetch_documents(
+                limit=1, query=own_profile_query(state), projection=projection
+            )
+            state.candidate_ids = prefilter_candidates(state, {data.id for data in own})
+
+        query = candidate_filter(state)
+        if state.job_id and state.total is None:
+            # Only needed to report progress to streaming clients.
+            state.total = service.get_collection_count(
+                keyset_filter(query, state.last_id)
+            )
+
+        # One round fetches enough profiles for every concurrent batch.
+        data = service.fetch_documents_after(
+            limit=state.limit * state.max_in_flight,
+            last_id=state.last_id,
+            query=query,
+            projection=projection
+        )
+
+    return apply_fetched(state, data)
+
+
+async def afetch_data_node(state: Match_State) -> Match_State:
+    '''
+    Fetch fyp data from mongoDB without blocking the event loop.
+    '''
+    logger.info("Fetching data from mongoDB collection...")
+
+    model, projection = fetch_model()
+
+    async with AsyncMongoDBService(
+        model=model,
+        collection_name="std_profiles"
+    ) as service:
+        if needs_prefilter(state):
+            own = await service.fetch_documents(
+                limit=1, query=own_profile_query(state), projection=projection
+            )
+            # The vector index search is CPU bound and may reload the index file.
+            state.candidate_ids = await asyncio.to_thread(
+                prefilter_candidates, state, {data.id for data in own}
+            )
+
+        query = candidate_filter(state)
+        if state.job_id and state.total is None:
+            state.total = await service.get_collection_count(
+                keyset_filter(query, state.last_id)
+            )
+
+        data = await service.fetch_documents_after(
+            limit=state.limit * state.max_in_flight,
+            last_id=state.last_id,
+            query=query,
+            projection=projection
+        )
+
+    return apply_fetched(state, data)
@@ -1,40 +1,213 @@
-from src.agent.domain.match_state import Match_State
+import asyncio
 
-import time
-import random
+from src.agent.config import settings
+from src.agent.domain.fyp_data import Fyp_data
+from src.agent.domain.match_dead_letter import Match_dead_letter
+from src.agent.domain.match_state import Match_State
+from src.agent.application.scoring import (
+    Scorer,
+    adapt_token_budget,
+    get_scorer,
+    plan_token_batches,
+    scoring_version,
+)
+from src.agent.infrastructure.redis import ScoreCache, publish_progress
+from src.agent.utils import profile_content_hash
 
 from loguru import logger
 
-import groq
 
+def lookup_cached_scores(
+    state: Match_State,
+    cache: ScoreCache
+) -> tuple[dict[str, float], dict[str, str]]:
+    '''
+    Look up the cached scores of the fetched profiles.
 
-def find_connection_node(state: Match_State) -> Match_State:
-    chain = state.chain
-
-    input_to_llm = [
-        {
-            "id": data.id,
-            "idea": data.idea,
-            "interests": data.interests,
-            "tech_stack": data.tech_stack,
-            "skills": data.metadata.skills
-        }
+    Returns the scores found by profile id, and the cache key of every
+    fetched profile.
+    '''
+    query_hash = profile_content_hash(state.query)
+    keys = {
+        data.id: cache.key(query_hash, profile_content_hash(data))
         for data in state.all_data
-    ]
-    
-    result = {}
-    try:
-        result = chain.invoke({"input": input_to_llm})
-    except groq.InternalServerError as e:
-        print("Groq failed:", e)
-
-    logger.debug(f"[Node] Connection finding result: {result}")
-
-    id_score = dict(zip(result['id'], result['score']))
-    state.results.update(id_score)
-
-    logger.debug(f"[Node] Results updated with scores: {state.results}")
-    
-    time.sleep(random.randint(15, 30))  # throttling requests
+    }
+
+    cached = cache.get_many(list(set(keys.values())))
+    hits = {id: cached[key] for id, key in keys.items() if key in cached}
+
+    return hits, keys
+
+
+def plan_batches(
+    state: Match_State,
+    scorer: Scorer,
+    cache: ScoreCache | None,
+    hits: dict[str, float]
+) -> tuple[list[Fyp_data], list[list[Fyp_data]]]:
+    '''
+    Record the cached scores and split the other fetched profiles into
+    batches of at most `limit`. LLM batches are also kept within the
+    job's `batch_token_budget`.
+    '''
+    candidates: list[Fyp_data] = state.all_data
+    if cache is not None:
+        state.results.push_many(state.all_data, hits)
+        state.stats.cache_hits += len(hits)
+        state.stats.cache_misses += len(state.all_data) - len(hits)
+        candidates = [data for data in state.all_data if data.id not in hits]
+
+        logger.info(
+            f"[Node] {len(hits)}/{len(state.all_data)} scores served from cache."
+        )
+
+    token_budget = state.batch_token_budget if scorer.uses_llm else 0
+    batches = plan_token_batches(
+        state.query, candidates, token_budget, state.limit
+    )
+    logger.info(
+        f"[Node] Scoring {len(candidates)} profiles in {len(batches)} batches..."
+    )
+
+    if scorer.uses_llm:
+        state.stats.llm_calls += len(batches)
+        if cache is not None:
+            state.stats.llm_calls_saved += len(plan_token_batches(
+                state.query, state.all_data, token_budget, state.limit
+            )) - len(batches)
+
+    return candidates, batches
+
+
+def adapt_batches(state: Match_State, scorer: Scorer) -> None:
+    '''
+    Count the candidates the LLM was asked to score again, and resize the
+    next LLM batches of the job to how completely it answered the last ones.
+    '''
+    if not scorer.uses_llm:
+        return
+
+    state.stats.llm_calls += len(scorer.rescored_batches)
+    state.stats.llm_rescored += sum(scorer.rescored_batches)
+    state.stats.llm_missing_scores += scorer.unparsed_candidates + sum(
+        sent - returned for returned, sent in scorer.batch_coverage
+    )
+    budget = adapt_token_budget(state.batch_token_budget, scorer.batch_coverage)
+    if budget < state.batch_token_budget:
+        logger.warning(
+            f"[Node] LLM left candidates unscored, batch token budget "
+            f"lowered to {budget}."
+        )
+    state.batch_token_budget = budget
+
+
+def record_failures(state: Match_State, scorer: Scorer) -> None:
+    '''
+    Count the retried LLM batches, and keep the batches that failed for
+    good as dead letters of the job: the job goes on without their scores.
+    '''
+    if not scorer.uses_llm:
+        return
+
+    state.stats.llm_retries += scorer.retries
+    state.stats.llm_failed_batches += len(scorer.failed_batches)
+    for batch, error, attempts in scorer.failed_batches:
+        logger.error(
+            f"[Node] Batch of {len(batch)} profiles failed after {attempts} "
+            f"attempts, left unscored: {error!r}"
+        )
+        state.dead_letters.append(Match_dead_letter(
+            candidate_ids=[data.id for data in batch],
+            error=f"{type(error).__name__}: {error}",
+            attempts=attempts,
+        ))
+
+
+def record_scores(
+    state: Match_State,
+    candidates: list[Fyp_data],
+    id_score: dict[str, float],
+    cache: ScoreCache | None,
+    keys: dict[str, str]
+) -> None:
+    '''
+    Keep the new scores, cache them and publish the job's progress.
+    '''
+    state.results.push_many(candidates, id_score)
+
+    if cache is not None:
+        cache.set_many({
+            keys[id]: score for id, score in id_score.items() if id in keys
+        })
+
+    logger.debug(f"[Node] Best matches so far: {state.results.scores()}")
+
+    if state.job_id and state.all_data:
+        publish_progress(state.job_id, {
+            "status": "processing",
+            "scored": state.offset,
+            "total": state.total,
+            "top_k": [data.model_dump(mode="json") for data in state.results.best()],
+            "stats": state.stats.model_dump(mode="json")
+        })
+
+
+def score_cache(state: Match_State, scorer: Scorer) -> ScoreCache | None:
+    '''
+    Cache of the scores of this match, None if they are not cached.
+    '''
+    if scorer.uses_llm and settings.MATCH_SCORE_CACHE_ENABLED:
+        return ScoreCache(scoring_version(state.scoring_mode, state.chain))
+    return None
+
+
+def find_connection_node(state: Match_State) -> Match_State:
+    '''
+    Score the fetched profiles in batches of at most `limit`, with up to
+    `max_in_flight` batches sent to the LLM concurrently. Profiles whose
+    score against the query is cached are not sent to the LLM again.
+    '''
+    scorer = get_scorer(state.scoring_mode, state.chain)
+
+    cache = score_cache(state, scorer)
+    hits, keys = lookup_cached_scores(state, cache) if cache else ({}, {})
+    candidates, batches = plan_batches(state, scorer, cache, hits)
+
+    id_score = scorer.score_batches(
+        state.query,
+        batches,
+        max_concurrency=state.max_in_flight
+    )
+    adapt_batches(state, scorer)
+    record_failures(state, scorer)
+    record_scores(state, candidates, id_score, cache, keys)
+
+    return state
+
+
+async def afind_connection_node(state: Match_State) -> Match_State:
+    '''
+    Async variant of `find_connection_node`: the LLM batches are awaited on
+    the event loop, and the blocking Redis calls run in worker threads.
+    '''
+    scorer = get_scorer(state.scoring_mode, state.chain)
+
+    cache = score_cache(state, scorer)
+    hits, keys = (
+        await asyncio.to_thread(lookup_cached_scores, state, cache) if cache
+        else ({}, {})
+    )
+    candidates, batches = plan_batches(state, scorer, cache, hits)
+
+    id_score = await scorer.ascore_batches(
+        state.query,
+        batches,
+        max_concurrency=state.max_in_flight
+    )
+    adapt_batches(state, scorer)
+    record_failures(state, scorer)
+    await asyncio.to_thread(
+        record_scores, state, candidates, id_score, cache, keys
+    )
 
     return state
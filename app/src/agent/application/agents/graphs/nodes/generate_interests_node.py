@@ -1,14 +1,9 @@
 from src.agent.utils import generate_random_hex
 from src.agent.domain.gen_state import Gen_State
-from src.agent.application.agents.chains.interest_generation_chain import (
-    build_interest_generation_chain,
-)
+from src.agent.application.agents.chains.registry import get_chain
 
 from loguru import logger
 
-import time
-import random
-
 
 def generate_interests_node(state: Gen_State) -> Gen_State:
     '''
@@ -16,7 +11,7 @@ def generate_interests_node(state: Gen_State) -> Gen_State:
     '''
     logger.info("[Node] Generating interests...")
 
-    chain = build_interest_generation_chain()
+    chain = get_chain("interest_generation")
 
     for i in range(5):  
         logger.debug(f"[Node] Generating batch {i+1}/5")
@@ -35,8 +30,6 @@ def generate_interests_node(state: Gen_State) -> Gen_State:
 
         state.all_data.extend(result["all_data"])
 
-        time.sleep(random.randint(30, 60))  # throttle requests
-
     logger.info("[Node] Finished generating all interests.")
 
     return state
@@ -0,0 +1,109 @@
+import hashlib
+from datetime import timedelta
+
+from bson import ObjectId
+from loguru import logger
+
+from src.agent.domain.match_result import Match_result
+from src.agent.domain.match_state import Match_State
+from src.agent.application.scoring import scoring_version
+from src.agent.infrastructure.mongo.service import MongoDBService
+from src.agent.infrastructure.mongo.async_service import AsyncMongoDBService
+from src.agent.utils import profile_content_hash
+
+
+# ObjectIds only increase with their creation second across processes, so
+# profiles created just before the watermark may still be missing from the
+# stored result. They are rescored (cheaply, from the score cache).
+WATERMARK_SLACK = timedelta(seconds=5)
+
+
+def match_result_key(state: Match_State) -> str:
+    '''
+    Key of the stored result of a match: the query id plus a hash of
+    everything its scores depend on.
+    '''
+    signature = "\n".join([
+        profile_content_hash(state.query),
+        scoring_version(state.scoring_mode, state.chain),
+        state.constraints.model_dump_json() if state.constraints else "",
+        str(state.prefilter_top_n),
+        str(state.results.k),
+    ])
+    digest = hashlib.blake2b(signature.encode(), digest_size=8).hexdigest()
+
+    return f"{state.query.id}:{digest}"
+
+
+def resume_from(state: Match_State, stored: list[Match_result]) -> Match_State:
+    '''
+    Keep the best scores of the stored result and fetch only profiles added
+    after its watermark.
+    '''
+    if not stored:
+        logger.info("[Node] No stored match result, matching from scratch.")
+        return state
+
+    result = stored[0]
+    state.results.push_many(
+        result.top, {data.id: data.score for data in result.top}
+    )
+    state.watermark = result.watermark
+
+    if result.watermark is not None:
+        resume_time = ObjectId(result.watermark).generation_time - WATERMARK_SLACK
+        state.last_id = str(ObjectId.from_datetime(resume_time))
+
+    logger.info(
+        f"[Node] Refreshing stored match result from watermark {result.watermark}."
+    )
+
+    return state
+
+
+def load_match_result_node(state: Match_State) -> Match_State:
+    '''
+    In incremental mode, resume from the stored result of the same match:
+    its best scores are kept and only profiles added after its watermark
+    are fetched.
+    '''
+    if not state.incremental:
+        return state
+
+    try:
+        with MongoDBService(
+            model=Match_result,
+            collection_name="match_results"
+        ) as service:
+            stored = service.fetch_documents(
+                limit=1,
+                query={"_id": match_result_key(state)}
+            )
+    except Exception as e:
+        logger.warning(f"Could not load stored match result, matching from scratch: {e}")
+        return state
+
+    return resume_from(state, stored)
+
+
+async def aload_match_result_node(state: Match_State) -> Match_State:
+    '''
+    Async variant of `load_match_result_node`.
+    '''
+    if not state.incremental:
+        return state
+
+    try:
+        async with AsyncMongoDBService(
+            model=Match_result,
+            collection_name="match_results"
+        ) as service:
+            stored = await service.fetch_documents(
+                limit=1,
+                query={"_id": match_result_key(state)}
+            )
+    except Exception as e:
+        logger.warning(f"Could not load stored match result, matching from scratch: {e}")
+        return state
+
+    return resume_from(state, stored)
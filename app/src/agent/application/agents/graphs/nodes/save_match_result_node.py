@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from loguru import logger
+
+from src.agent.domain.match_result import Match_result
+from src.agent.domain.match_state import Match_State
+from src.agent.infrastructure.mongo.service import MongoDBService
+from src.agent.infrastructure.mongo.async_service import AsyncMongoDBService
+from src.agent.application.agents.graphs.nodes.load_match_result_node import (
+    match_result_key
+)
+
+
+def build_match_result(state: Match_State) -> Match_result:
+    '''
+    Result to store: the best matches and the highest profile _id covered.
+    '''
+    ids = [id for id in (state.watermark, state.last_id) if id is not None]
+    watermark = str(max(map(ObjectId, ids))) if ids else None
+
+    return Match_result(
+        id=match_result_key(state),
+        query_id=state.query.id,
+        watermark=watermark,
+        top=state.all_data,
+        updated_at=datetime.now(timezone.utc)
+    )
+
+
+def save_match_result_node(state: Match_State) -> Match_State:
+    '''
+    Store the best matches and the highest profile _id covered, so the next
+    incremental run only scores profiles added after it.
+    '''
+    if state.dead_letters:
+        # Refreshes would never score the candidates of the failed batches,
+        # which are below the watermark.
+        logger.warning("[Node] Match result not stored: some batches failed.")
+        return state
+
+    result = build_match_result(state)
+
+    try:
+        with MongoDBService(
+            model=Match_result,
+            collection_name="match_results"
+        ) as service:
+            service.upsert_documents([result])
+        logger.info(f"[Node] Stored match result with watermark {result.watermark}.")
+    except Exception as e:
+        # The job result is still returned; the next refresh starts over.
+        logger.error(f"Failed to store match result: {e}")
+
+    return state
+
+
+async def asave_match_result_node(state: Match_State) -> Match_State:
+    '''
+    Async variant of `save_match_result_node`.
+    '''
+    if state.dead_letters:
+        logger.warning("[Node] Match result not stored: some batches failed.")
+        return state
+
+    result = build_match_result(state)
+
+    try:
+        async with AsyncMongoDBService(
+            model=Match_result,
+            collection_name="match_results"
+        ) as service:
+            await service.upsert_documents([result])
+        logger.info(f"[Node] Stored match result with watermark {result.watermark}.")
+    except Exception as e:
+        logger.error(f"Failed to store match result: {e}")
+
+    return state
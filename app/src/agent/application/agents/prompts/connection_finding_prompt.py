@@ -0,0 +1,18 @@
+from langchain.prompts import ChatPromptTemplate
+
+from src.agent.domain.prompts import (
+    CONNECTION_FINDING_SYSTEM_PROMPT,
+    CONNECTION_FINDING_USER_PROMPT,
+)
+
+
+def build_connection_finding_prompt() -> ChatPromptTemplate:
+    '''
+    Builds the prompt that scores all five criteria. It is defined in code,
+    not pulled from LangSmith, as it must match the encoding of the profiles
+    and the parser of the scores.
+    '''
+    return ChatPromptTemplate.from_messages([
+        ("system", CONNECTION_FINDING_SYSTEM_PROMPT),
+        ("user", CONNECTION_FINDING_USER_PROMPT),
+    ])
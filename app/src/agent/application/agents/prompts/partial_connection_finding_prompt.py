@@ -0,0 +1,17 @@
+from langchain.prompts import ChatPromptTemplate
+
+from src.agent.domain.prompts import (
+    PARTIAL_CONNECTION_FINDING_SYSTEM_PROMPT,
+    PARTIAL_CONNECTION_FINDING_USER_PROMPT,
+)
+
+
+def build_partial_connection_finding_prompt() -> ChatPromptTemplate:
+    '''
+    Builds the prompt that scores only the criteria the heuristic scorer
+    cannot answer (IDEA_SIMILARITY and OVERALL_COMPATIBILITY).
+    '''
+    return ChatPromptTemplate.from_messages([
+        ("system", PARTIAL_CONNECTION_FINDING_SYSTEM_PROMPT),
+        ("user", PARTIAL_CONNECTION_FINDING_USER_PROMPT),
+    ])
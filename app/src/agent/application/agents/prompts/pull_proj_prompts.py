@@ -1,24 +1,10 @@
-from loguru import logger
-
 from langchain.prompts import ChatPromptTemplate
 
-from langsmith import Client
-from langsmith.utils import LangSmithUserError
-
-from src.agent.config import settings
+from src.agent.application.agents.prompts.registry import get_prompt
 
 
 def pull_proj_gen_prompt() -> ChatPromptTemplate:
     '''
-    Pulls prompt from LangSmith.
+    Returns the LangSmith prompt from the local prompt registry.
     '''
-    try:
-        client = Client(api_key=settings.LANGSMITH_API_KEY)
-        prompt = client.pull_prompt("project_generation", include_model=True)
-
-        logger.info("Prompt successfully pulled.")
-    except LangSmithUserError as e:
-        logger.error(f"Failed to pull prompt: {e}")
-        raise
-
-    return prompt
+    return get_prompt("project_generation")
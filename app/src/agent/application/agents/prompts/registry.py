@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+import time
+import warnings
+from pathlib import Path
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.load import dumpd, loads
+from langchain_core.prompts import ChatPromptTemplate
+from langsmith import Client
+from loguru import logger
+
+from src.agent.config import settings
+from src.agent.domain.prompts import (
+    INTEREST_GENERATION_SYSTEM_PROMPT,
+    INTEREST_GENERATION_USER_PROMPT,
+    PROJECT_GENERATION_SYSTEM_PROMPT,
+    PROJECT_GENERATION_USER_PROMPT,
+)
+
+
+# Bump when the layout of cache files changes; older files are ignored.
+CACHE_FORMAT_VERSION = 1
+
+# Templates used until a prompt has been pulled from LangSmith once.
+FALLBACK_TEMPLATES = {
+    "project_generation": (
+        PROJECT_GENERATION_SYSTEM_PROMPT, PROJECT_GENERATION_USER_PROMPT
+    ),
+    "interest_generation": (
+        INTEREST_GENERATION_SYSTEM_PROMPT, INTEREST_GENERATION_USER_PROMPT
+    ),
+}
+
+
+class PromptRegistry:
+    """LangSmith prompts served from memory and a local cache.
+
+    `get` never waits on the network: it returns the prompt from memory,
+    else from the cache file, else the template of `domain/prompts.py`.
+    When the prompt is older than `ttl` seconds, a background thread
+    checks the latest commit on LangSmith and pulls the prompt only if the
+    commit hash changed.
+
+    Args:
+        cache_dir: Directory of the cache files, one JSON file per prompt.
+        ttl: Seconds before a prompt is checked against LangSmith again.
+        refresh: Whether to refresh prompts from LangSmith at all.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = settings.PROMPT_CACHE_DIR,
+        ttl: float = settings.PROMPT_CACHE_TTL,
+        refresh: bool = settings.PROMPT_REFRESH_ENABLED,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.refresh_enabled = refresh
+
+        self._prompts: dict[str, ChatPromptTemplate] = {}
+        # Commit hash and time of the last check, by prompt name.
+        self._entries: dict[str, dict] = {}
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # Refresh threads do not survive a fork.
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.json"
+
+    def get(self, name: str) -> ChatPromptTemplate:
+        """Return a prompt without network I/O.
+
+        Args:
+            name: LangSmith identifier of the prompt.
+
+        Returns:
+            The prompt.
+
+        Raises:
+            KeyError: If the prompt is neither cached nor has a fallback
+                template.
+        """
+
+        with self._lock:
+            prompt = self._prompts.get(name)
+            if prompt is None:
+                prompt = self._load(name) or self._fallback(name)
+                self._prompts[name] = prompt
+
+        self._refresh_if_stale(name)
+        return prompt
+
+    def version(self, name: str) -> str:
+        """Return the LangSmith commit hash of the prompt in use.
+
+        Args:
+            name: LangSmith identifier of the prompt.
+
+        Returns:
+            The commit hash, or "local" while the fallback template is used.
+        """
+
+        self.get(name)
+        return self._entries.get(name, {}).get("commit_hash", "local")
+
+    def _load(self, name: str) -> ChatPromptTemplate | None:
+        try:
+            entry = json.loads(self._path(name).read_text())
+            if entry.get("format") != CACHE_FORMAT_VERSION:
+                return None
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LangChainBetaWarning)
+                prompt = loads(
+                    json.dumps(entry["prompt"]),
+                    allowed_objects="core",
+                    secrets_from_env=False,
+                )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            # A corrupt or outdated file only; other errors are bugs.
+            logger.warning(f"Ignoring unreadable prompt cache for '{name}': {e}")
+            return None
+
+        self._entries[name] = entry
+        logger.debug(f"Loaded prompt '{name}' ({entry['commit_hash']}) from cache.")
+        return prompt
+
+    def _fallback(self, name: str) -> ChatPromptTemplate:
+        if name not in FALLBACK_TEMPLATES:
+            raise KeyError(f"No cached prompt or fallback template for '{name}'.")
+
+        system, user = FALLBACK_TEMPLATES[name]
+        logger.info(f"Using the local template of prompt '{name}'.")
+        return ChatPromptTemplate.from_messages([
+            ("system", system),
+            ("user", user),
+        ])
+
+    def _refresh_if_stale(self, name: str) -> None:
+        if not self.refresh_enabled:
+            return
+
+        with self._lock:
+            checked_at = self._entries.get(name, {}).get("checked_at", 0.0)
+            if time.time() - checked_at < self.ttl or name in self._refreshing:
+                return
+            self._refreshing.add(name)
+
+        threading.Thread(
+            target=self.refresh, args=(name,), daemon=True,
+            name=f"prompt-refresh-{name}"
+        ).start()
+
+    def refresh(self, name: str) -> None:
+        """Check LangSmith for a new commit of a prompt and cache it.
+
+        Failures are logged: the current prompt stays in use and is checked
+        again after `ttl` seconds.
+
+        Args:
+            name: LangSmith identifier of the prompt.
+        """
+
+        entry = dict(self._entries.get(name, {}))
+        try:
+            client = Client(api_key=settings.LANGSMITH_API_KEY)
+            commit = client.pull_prompt_commit(name)
+
+            if commit.commit_hash != entry.get("commit_hash"):
+                prompt = client.pull_prompt(name)
+                entry = {
+                    "format": CACHE_FORMAT_VERSION,
+                    "name": name,
+                    "commit_hash": commit.commit_hash,
+                    "prompt": dumpd(prompt),
+                }
+                with self._lock:
+                    self._prompts[name] = prompt
+                logger.info(f"Prompt '{name}' updated to commit {commit.commit_hash}.")
+        except Exception as e:
+            logger.warning(f"Failed to refresh prompt '{name}': {e}")
+        finally:
+            entry["checked_at"] = time.time()
+            with self._lock:
+                self._entries[name] = entry
+                self._refreshing.discard(name)
+
+        if "prompt" in entry:
+            self._save(name, entry)
+
+    def _save(self, name: str, entry: dict) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(name)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entry))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write prompt cache for '{name}': {e}")
+
+
+_registry: PromptRegistry | None = None
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Return the process-wide prompt registry."""
+
+    global _registry
+
+    if _registry is None:
+        _registry = PromptRegistry()
+
+    return _registry
+
+
+def get_prompt(name: str) -> ChatPromptTemplate:
+    """Return a LangSmith prompt from the process-wide registry."""
+
+    return get_prompt_registry().get(name)
@@ -0,0 +1,15 @@
+from .bulk import (
+    PROFILES_ADAPTER,
+    iter_records,
+    iter_ndjson,
+    validate_chunk,
+    ingest_profiles,
+)
+
+__all__ = [
+    "PROFILES_ADAPTER",
+    "iter_records",
+    "iter_ndjson",
+    "validate_chunk",
+    "ingest_profiles",
+]
@@ -0,0 +1,230 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterable, AsyncIterator, Iterable
+
+from loguru import logger
+from pydantic import TypeAdapter, ValidationError
+
+from src.agent.config import settings
+from src.agent.domain.fyp_data import Fyp_data
+from src.agent.domain.ingestion_report import Ingestion_failure, Ingestion_report
+from src.agent.domain.match_result import Match_result
+from src.agent.application.scoring import summarize_idea
+from src.agent.infrastructure.mongo.async_service import AsyncMongoDBService
+from src.agent.infrastructure.vector_index import get_vector_index
+
+
+PROFILES_ADAPTER = TypeAdapter(list[Fyp_data])
+
+
+class Invalid_line:
+    '''
+    An NDJSON line that is not valid JSON.
+    '''
+
+    def __init__(self, error: json.JSONDecodeError) -> None:
+        self.error = error
+
+
+async def iter_records(records: Iterable[Any]) -> AsyncIterator[Any]:
+    '''
+    Records of a parsed JSON array.
+    '''
+    for record in records:
+        yield record
+
+
+async def iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    '''
+    Records of an NDJSON stream, parsed as the lines arrive. Blank lines are
+    skipped; a line that is not valid JSON yields an `Invalid_line`.
+    '''
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield parse_line(line)
+
+    if buffer.strip():
+        yield parse_line(buffer)
+
+
+def parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return Invalid_line(e)
+
+
+def record_id(record: Any) -> str | None:
+    '''
+    Student id of a raw record, if it has a string one.
+    '''
+    if isinstance(record, dict) and isinstance(record.get("id"), str):
+        return record["id"]
+    return None
+
+
+def validate_chunk(
+    records: list[Any],
+    start: int
+) -> tuple[list[Fyp_data], list[int], list[Ingestion_failure]]:
+    '''
+    Validate a chunk of records in one pass.
+
+    Returns the valid profiles, their position in the request, and a
+    failure for every invalid record.
+    '''
+    errors: dict[int, list[str]] = defaultdict(list)
+    for i, record in enumerate(records):
+        if isinstance(record, Invalid_line):
+            errors[i].append(f"Invalid JSON: {record.error}")
+
+    valid = [i for i in range(len(records)) if i not in errors]
+    try:
+        profiles = PROFILES_ADAPTER.validate_python([records[i] for i in valid])
+    except ValidationError as e:
+        for error in e.errors(include_url=False, include_input=False):
+            position, *loc = error["loc"]
+            field = ".".join(map(str, loc)) or "record"
+            errors[valid[position]].append(f"{field}: {error['msg']}")
+
+        # Only the valid records are left: this pass cannot fail.
+        valid = [i for i in range(len(records)) if i not in errors]
+        profiles = PROFILES_ADAPTER.validate_python([records[i] for i in valid])
+
+    failures = [
+        Ingestion_failure(
+            index=start + i,
+            id=record_id(records[i]),
+            error="; ".join(messages)
+        )
+        for i, messages in sorted(errors.items())
+    ]
+
+    return profiles, [start + i for i in valid], failures
+
+
+# Field identifying the profile of a student across submissions.
+STUDENT_KEY = "metadata.id"
+
+
+async def ingest_chunk(
+    service: AsyncMongoDBService,
+    records: list[Any],
+    report: Ingestion_report
+) -> tuple[list[tuple[str, Fyp_data]], list[str]]:
+    '''
+    Validate and upsert a chunk of records, recording the outcome in the
+    report.
+
+    Returns the `_id` and profile of every inserted or updated record, and
+    the `_id` of the updated ones.
+    '''
+    profiles, positions, failures = validate_chunk(records, report.received)
+    report.received += len(records)
+
+    # Condensed once here rather than on every scoring of the profile.
+    for profile in profiles:
+        profile.idea_summary = summarize_idea(profile.idea)
+
+    written, updated = [], []
+    if profiles:
+        plan = await service.upsert_documents_by_key(profiles, STUDENT_KEY)
+        for i, error in plan.failed.items():
+            failures.append(Ingestion_failure(
+                index=positions[i], id=profiles[i].id, error=error
+            ))
+        for id, status, profile in zip(plan.ids, plan.statuses, profiles):
+            if status == "unchanged":
+                report.unchanged += 1
+            elif status in ("inserted", "updated"):
+                written.append((id, profile))
+                if status == "updated":
+                    updated.append(id)
+
+    report.inserted += len(written) - len(updated)
+    report.updated += len(updated)
+    report.failed.extend(sorted(failures, key=lambda failure: failure.index))
+
+    return written, updated
+
+
+async def invalidate_match_results() -> None:
+    '''
+    Drop every stored match result. An updated profile keeps its `_id`,
+    below the watermark of every stored result: incremental refreshes would
+    never rescore it, whether it is in a stored top-k or should now enter
+    one.
+    '''
+    try:
+        async with AsyncMongoDBService(
+            model=Match_result,
+            collection_name="match_results"
+        ) as service:
+            deleted = await service.delete_documents({})
+        logger.info(f"Invalidated {deleted} stored match results.")
+    except Exception as e:
+        logger.error(f"Failed to invalidate stored match results: {e}")
+
+
+async def ingest_profiles(
+    records: AsyncIterable[Any],
+    batch_size: int = settings.INGEST_BATCH_SIZE
+) -> Ingestion_report:
+    '''
+    Store student profiles in bulk, one profile per student.
+
+    Records are validated and upserted by student id in chunks of
+    `batch_size`, with unordered writes: an invalid or rejected record is
+    reported and the others are still stored. Resubmitted profiles replace
+    the stored one, or are skipped if identical. The vector index is
+    updated once, at the end.
+
+    Raises:
+        errors.PyMongoError: If MongoDB fails for another reason than
+            individual write errors; earlier chunks stay stored.
+    '''
+    report = Ingestion_report()
+    written: list[tuple[str, Fyp_data]] = []
+    updated: list[str] = []
+
+    async with AsyncMongoDBService(
+        model=Fyp_data,
+        collection_name="std_profiles"
+    ) as service:
+        chunk = []
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) == batch_size:
+                chunk_written, chunk_updated = await ingest_chunk(service, chunk, report)
+                written += chunk_written
+                updated += chunk_updated
+                chunk = []
+        if chunk:
+            chunk_written, chunk_updated = await ingest_chunk(service, chunk, report)
+            written += chunk_written
+            updated += chunk_updated
+
+    if updated:
+        await invalidate_match_results()
+
+    if written:
+        ids, profiles = map(list, zip(*written))
+        try:
+            # Saving the index writes to disk: keep it off the event loop.
+            await asyncio.to_thread(get_vector_index().add_and_save, ids, profiles)
+        except Exception as e:
+            # The profiles are stored; a later index rebuild will pick them up.
+            logger.error(f"Failed to index {len(ids)} ingested profiles: {e}")
+
+    logger.info(
+        f"Ingested {report.received} profiles: {report.inserted} inserted, "
+        f"{report.updated} updated, {report.unchanged} unchanged, "
+        f"{len(report.failed)} failed."
+    )
+
+    return report
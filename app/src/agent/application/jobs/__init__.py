@@ -0,0 +1,21 @@
+from .match_job import (
+    encode_match_job,
+    decode_match_job,
+    job_loop,
+    arun_match_agent,
+    warm_match_worker,
+    arun_match_job,
+    run_match_job,
+    on_match_job_failure,
+)
+
+__all__ = [
+    "encode_match_job",
+    "decode_match_job",
+    "job_loop",
+    "arun_match_agent",
+    "warm_match_worker",
+    "arun_match_job",
+    "run_match_job",
+    "on_match_job_failure",
+]
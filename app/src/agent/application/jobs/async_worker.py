@@ -0,0 +1,253 @@
+import asyncio
+import queue as thread_queue
+import sys
+import threading
+import time
+import traceback
+from typing import Any
+
+from loguru import logger
+from rq import SimpleWorker
+from rq.job import Job, JobStatus, Retry
+from rq.queue import Queue
+from rq.timeouts import JobTimeoutException
+from rq.utils import now
+from rq.worker import WorkerStatus
+
+from src.agent.config import settings
+from src.agent.application.jobs.match_job import (
+    arun_match_job,
+    job_loop,
+    run_match_job,
+    warm_match_worker,
+)
+
+
+# Coroutine awaited in place of each job function. Other functions run in a
+# thread of the loop, or on the loop if they are coroutine functions.
+ASYNC_JOB_FUNCTIONS = {
+    run_match_job: arun_match_job,
+}
+
+
+async def perform_async(job: Job, timeout: int) -> Any:
+    '''
+    Run a job on the running event loop, failing it with RQ's
+    JobTimeoutException after `timeout` seconds (-1 for no timeout).
+    '''
+    func = ASYNC_JOB_FUNCTIONS.get(job.func, job.func)
+    if asyncio.iscoroutinefunction(func):
+        call = func(*job.args, **job.kwargs)
+    else:
+        call = asyncio.to_thread(func, *job.args, **job.kwargs)
+
+    if timeout == -1:
+        return await call
+    try:
+        return await asyncio.wait_for(call, timeout)
+    except TimeoutError:
+        raise JobTimeoutException(
+            f"Task exceeded maximum timeout value ({timeout} seconds)"
+        ) from None
+
+
+class AsyncMatchWorker(SimpleWorker):
+    '''
+    RQ worker running up to `concurrency` match jobs at once on the job
+    loop of its process.
+
+    Match jobs mostly wait on Groq and MongoDB, so one process can run many
+    graphs concurrently. The loop runs in a background thread; the worker's
+    own thread keeps RQ's bookkeeping: it dequeues a job whenever a slot is
+    free, starts it on the loop, and records the jobs that finished (result,
+    failure or Retry, in the registries) while it waits for the next one.
+    LLM calls of all jobs share the Groq rate limiter, which lets the
+    requests of one loop wait for the quota in turn.
+
+    A warm shutdown finishes the jobs in flight; a cold shutdown abandons
+    them, and RQ fails them once their heartbeat expires.
+
+    It overrides internals of RQ's worker (execution handling, shutdown),
+    so rq is pinned to the version it was written against.
+
+    Args:
+        concurrency: Jobs run at once.
+    '''
+
+    def __init__(
+        self,
+        *args,
+        concurrency: int = settings.WORKER_JOB_CONCURRENCY,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.concurrency = concurrency
+
+        # Job, queue, execution and future of each job in flight, by job id.
+        self._in_flight: dict[str, tuple] = {}
+        # Ids of the jobs whose future is done, put by the loop thread.
+        self._done: thread_queue.SimpleQueue[str] = thread_queue.SimpleQueue()
+        self._loop_thread: threading.Thread | None = None
+        self._last_heartbeat = 0.0
+
+    def bootstrap(self, *args, **kwargs) -> None:
+        super().bootstrap(*args, **kwargs)
+        warm_match_worker()
+
+        self._loop_thread = threading.Thread(
+            target=job_loop().run_forever, name="match-job-loop", daemon=True
+        )
+        self._loop_thread.start()
+
+    def execute_job(self, job: Job, queue: Queue) -> None:
+        '''
+        Start a job on the loop and return once a slot is free for the next.
+        '''
+        execution = self.prepare_execution(job)
+        self.prepare_job_execution(job, remove_from_intermediate_queue=len(self.queues) == 1)
+        job.started_at = now()
+        # As Job.perform does: the job key must not expire while it runs.
+        self.connection.persist(job.key)
+
+        timeout = job.timeout or self.queue_class.DEFAULT_TIMEOUT
+        future = asyncio.run_coroutine_threadsafe(
+            perform_async(job, timeout), job_loop()
+        )
+        self._in_flight[job.id] = (job, queue, execution, future)
+        future.add_done_callback(lambda _: self._done.put(job.id))
+        logger.debug(f"[Worker] Started job {job.id} ({len(self._in_flight)} in flight).")
+
+        self.wait_for_jobs(self.concurrency - 1)
+
+    def wait_for_jobs(self, limit: int) -> None:
+        '''
+        Record the jobs that finished, blocking until at most `limit` jobs
+        are still in flight.
+        '''
+        while True:
+            self.maintain_in_flight_heartbeats()
+            block = len(self._in_flight) > limit
+            try:
+                job_id = self._done.get(timeout=1) if block else self._done.get_nowait()
+            except thread_queue.Empty:
+                if block:
+                    continue
+                return
+            self.finish_job(job_id)
+
+    def finish_job(self, job_id: str) -> None:
+        '''
+        Record the outcome of a finished job, as `perform_job` does for the
+        jobs of a synchronous worker.
+        '''
+        job, queue, execution, future = self._in_flight.pop(job_id)
+        # RQ's handlers read the execution of the job from the worker.
+        self.execution = execution
+        started_job_registry = queue.started_job_registry
+
+        try:
+            return_value = future.result()
+            self.handle_execution_ended(job, queue, job.success_callback_timeout)
+            job._result = return_value
+
+            if isinstance(return_value, Retry):
+                self.handle_job_retry(
+                    job=job,
+                    queue=queue,
+                    retry=return_value,
+                    started_job_registry=started_job_registry,
+                    execution=execution,
+                )
+            else:
+                job._status = JobStatus.FINISHED
+                job.execute_success_callback(self.death_penalty_class, return_value)
+                self.handle_job_success(
+                    job=job, queue=queue, started_job_registry=started_job_registry
+                )
+                job.send_webhooks(JobStatus.FINISHED)
+        except Exception:
+            job._status = JobStatus.FAILED
+            self.handle_execution_ended(job, queue, job.failure_callback_timeout)
+            exc_info = sys.exc_info()
+            exc_string = "".join(traceback.format_exception(*exc_info))
+
+            try:
+                job.execute_failure_callback(self.death_penalty_class, *exc_info)
+            except Exception:
+                exc_info = sys.exc_info()
+                exc_string = "".join(traceback.format_exception(*exc_info))
+
+            self.handle_exception(job, *exc_info)
+            self.handle_job_failure(
+                job=job, exc_string=exc_string, queue=queue,
+                started_job_registry=started_job_registry
+            )
+
+        if not self._in_flight:
+            self.set_state(WorkerStatus.IDLE)
+
+    def maintain_in_flight_heartbeats(self) -> None:
+        '''
+        Renew the heartbeats of the worker and of its jobs in flight every
+        `job_monitoring_interval` seconds.
+        '''
+        if time.monotonic() - self._last_heartbeat < self.job_monitoring_interval:
+            return
+        self._last_heartbeat = time.monotonic()
+
+        for job, _, execution, _ in list(self._in_flight.values()):
+            self.execution = execution
+            self.maintain_heartbeats(job)
+
+    def dequeue_job_and_maintain_ttl(
+        self, timeout: int | None, max_idle_time: int | None = None
+    ) -> tuple[Job, Queue] | None:
+        # With jobs in flight, poll the queues a second at a time so finished
+        # jobs are recorded while waiting for the next one.
+        while self._in_flight:
+            self.wait_for_jobs(self.concurrency - 1)
+            if self._stop_requested:
+                return None
+
+            result = super().dequeue_job_and_maintain_ttl(
+                None if timeout is None else 1, max_idle_time=1
+            )
+            if result is not None:
+                return result
+            if timeout is None:
+                # Burst mode and the queues are empty: wait for a job instead,
+                # unless the last one finished meanwhile.
+                self.wait_for_jobs(max(len(self._in_flight) - 1, 0))
+
+        return super().dequeue_job_and_maintain_ttl(timeout, max_idle_time)
+
+    def _shutdown(self) -> None:
+        if self._in_flight:
+            # Warm shutdown: the work loop stops and teardown waits for the
+            # jobs in flight.
+            self._stop_requested = True
+            self.set_shutdown_requested_date()
+            logger.info(
+                f"[Worker] Stopping after {len(self._in_flight)} jobs in flight."
+            )
+            return
+        super()._shutdown()
+
+    def request_force_stop(self, signum, frame) -> None:
+        try:
+            super().request_force_stop(signum, frame)
+        except SystemExit:
+            # Cold shutdown: the jobs in flight are abandoned.
+            self._in_flight.clear()
+            raise
+
+    def teardown(self) -> None:
+        self.wait_for_jobs(0)
+
+        if self._loop_thread is not None:
+            loop = job_loop()
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread.join(timeout=5)
+            self._loop_thread = None
+
+        super().teardown()
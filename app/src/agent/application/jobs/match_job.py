@@ -0,0 +1,218 @@
+import asyncio
+import os
+
+from loguru import logger
+from redis import RedisError
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+
+from src.agent.config import settings
+from src.agent.domain.match_state import Match_State
+from src.agent.application.agents.graphs.build_find_match_graph import (
+    MatcherGraphRunner,
+    match_agent,
+)
+from src.agent.application.scoring import get_scoring_chain
+from src.agent.infrastructure.redis import (
+    JobStore,
+    RedisCheckpointSaver,
+    decode_envelope,
+    encode_envelope,
+    get_shared_redis_connection,
+    publish_progress,
+)
+
+
+def encode_match_job(state: Match_State) -> bytes:
+    '''
+    Payload of a match job: the initial state as a versioned envelope.
+    Fields left to their default are omitted.
+    '''
+    return encode_envelope(
+        "match_job", state.model_dump(mode="json", exclude_defaults=True)
+    )
+
+
+def decode_match_job(payload: bytes) -> Match_State:
+    '''
+    Initial state of a match job from its payload.
+    '''
+    return Match_State.model_validate(decode_envelope(payload, "match_job"))
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+
+
+def job_loop() -> asyncio.AbstractEventLoop:
+    '''
+    Event loop running the match jobs of this process. It is kept between
+    jobs, so the chains and async clients bound to it stay warm in workers
+    that run several jobs. A forked child gets its own loop.
+    '''
+    global _loop, _loop_pid
+
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+
+    return _loop
+
+
+_checkpointer: RedisCheckpointSaver | None = None
+_checkpointed_agent = None
+
+
+def checkpointed_match_agent():
+    '''
+    Match graph saving a checkpoint in Redis after every step, built once
+    per process.
+    '''
+    global _checkpointer, _checkpointed_agent
+
+    if _checkpointed_agent is None:
+        _checkpointer = RedisCheckpointSaver()
+        _checkpointed_agent = MatcherGraphRunner(checkpointer=_checkpointer).graph
+    return _checkpointed_agent
+
+
+def job_thread(job_id: str) -> dict:
+    '''
+    Config of the checkpointed graph run of a job: its thread is the job id.
+    '''
+    return {"configurable": {"thread_id": job_id}}
+
+
+async def arun_match_agent(
+    initial_state: Match_State,
+    job_id: str | None = None
+) -> dict:
+    '''
+    Run the match graph on the job's event loop.
+
+    With JOB_CHECKPOINTS_ENABLED, the run is checkpointed under the job id
+    after every step, and a job that already has a checkpoint (a retried or
+    requeued job) resumes from it: from the last batch it finished scoring
+    rather than from the first profile.
+    '''
+    if job_id is None or not settings.JOB_CHECKPOINTS_ENABLED:
+        return await match_agent.ainvoke(initial_state)
+
+    agent = checkpointed_match_agent()
+    config = job_thread(job_id)
+
+    saved = await agent.aget_state(config)
+    if saved.next:
+        logger.info(
+            f"Resuming job {job_id} at step {saved.metadata.get('step')} "
+            f"({saved.values.get('offset', 0)} profiles fetched)."
+        )
+        return await agent.ainvoke(None, config, checkpoint_during=True)
+    if saved.values:
+        # The graph finished but the job stopped before storing its result.
+        return saved.values
+
+    return await agent.ainvoke(initial_state, config, checkpoint_during=True)
+
+
+async def aclear_checkpoint(job_id: str) -> None:
+    '''
+    Delete the checkpoint of a finished job.
+    '''
+    if not settings.JOB_CHECKPOINTS_ENABLED or _checkpointer is None:
+        return
+    try:
+        await _checkpointer.adelete_thread(job_id)
+    except RedisError as e:
+        logger.warning(f"Failed to delete the checkpoint of job {job_id}: {e}")
+
+
+def will_retry(job_id: str) -> bool:
+    '''
+    Whether RQ runs the job again if it fails now (see JOB_MAX_RETRIES).
+    '''
+    try:
+        job = Job.fetch(
+            job_id, connection=get_shared_redis_connection(decode_responses=False)
+        )
+    except (NoSuchJobError, RedisError):
+        return False
+    return bool(job.retries_left)
+
+
+def warm_match_worker() -> None:
+    '''
+    Build the default scoring chain on the job loop before the first job.
+    '''
+    async def warm():
+        get_scoring_chain(settings.MATCH_SCORING_MODE)
+
+    try:
+        job_loop().run_until_complete(warm())
+    except Exception as e:
+        logger.warning(f"Failed to warm the match worker: {e}")
+
+
+async def arun_match_job(job_id: str, payload: bytes) -> None:
+    '''
+    Run a match job on the running event loop: run the graph and store its
+    result (or error) in the job store, then publish it as the final
+    progress event. Redis writes run in a thread to keep the loop free for
+    the other jobs of an async worker.
+
+    A failed job that RQ will retry raises instead, so RQ queues it again;
+    the retry resumes from the job's checkpoint.
+    '''
+    logger.info(f"Running match agent for job {job_id}...")
+    store = JobStore()
+    try:
+        result = await arun_match_agent(decode_match_job(payload), job_id)
+        matches = result.get("all_data", [])
+        stats = result.get("stats")
+        dead_letters = result.get("dead_letters", [])
+
+        body = {
+            "result": [data.model_dump(mode="json") for data in matches],
+            "stats": stats.model_dump(mode="json") if stats else None,
+            "dead_letters": [letter.model_dump(mode="json") for letter in dead_letters],
+        }
+        await asyncio.to_thread(store.set_result, job_id, body)
+        await asyncio.to_thread(publish_progress, job_id, {"status": "done", **body})
+        logger.info(f"Job {job_id} completed with {len(matches)} matches")
+        await aclear_checkpoint(job_id)
+    except Exception as e:
+        if await asyncio.to_thread(will_retry, job_id):
+            logger.warning(f"Job {job_id} failed, retrying from its checkpoint: {e}")
+            raise
+        logger.error(f"Job {job_id} failed: {e}")
+        await asyncio.to_thread(store.set_error, job_id, str(e))
+        await asyncio.to_thread(
+            publish_progress, job_id, {"status": "error", "error": str(e)}
+        )
+
+
+def on_match_job_failure(job: Job, connection, type, value, traceback) -> None:
+    '''
+    RQ failure callback of match jobs. Failures the job body catches are
+    stored by `arun_match_job`; this records the others (a timeout, or a
+    job abandoned by a dead worker) once RQ will not run the job again, so
+    its status does not stay "processing".
+    '''
+    if job.retries_left:
+        return
+
+    error = str(value) or f"{type.__name__}: the job did not complete."
+    logger.error(f"Job {job.id} failed: {error}")
+    store = JobStore()
+    if (store.get_status(job.id) or {}).get("status") != "processing":
+        return
+    store.set_error(job.id, error)
+    publish_progress(job.id, {"status": "error", "error": error})
+
+
+def run_match_job(job_id: str, payload: bytes) -> None:
+    '''
+    RQ entry point of a match job, run on the job loop of this process.
+    Async workers await `arun_match_job` on their own loop instead.
+    '''
+    job_loop().run_until_complete(arun_match_job(job_id, payload))
@@ -0,0 +1,224 @@
+import math
+import os
+import socket
+import time
+from datetime import datetime, timezone
+
+from loguru import logger
+from redis import Redis, RedisError
+from rq import Queue, SimpleWorker
+from rq.job import Job
+from rq.worker_pool import WorkerPool
+
+from src.agent.config import settings
+from src.agent.application.jobs.async_worker import AsyncMatchWorker
+from src.agent.application.jobs.match_job import warm_match_worker
+from src.agent.infrastructure.redis import (
+    get_redis_connection,
+    publish_worker_pool_state,
+)
+
+
+MATCH_QUEUE = "matches"
+
+
+class MatchWorker(SimpleWorker):
+    '''
+    RQ worker running match jobs in its own process instead of a forked
+    work horse, so the job loop, chains and clients stay warm between jobs.
+    A worker that dies is replaced by the pool.
+    '''
+
+    def bootstrap(self, *args, **kwargs) -> None:
+        super().bootstrap(*args, **kwargs)
+        warm_match_worker()
+
+
+def desired_workers(
+    current: int,
+    queued: int,
+    started: int,
+    oldest_age: float,
+    minimum: int = settings.WORKER_MIN_PROCESSES,
+    maximum: int = settings.WORKER_MAX_PROCESSES,
+    scale_up_age: float = settings.WORKER_SCALE_UP_AGE,
+    concurrency: int = settings.WORKER_JOB_CONCURRENCY,
+) -> int:
+    '''
+    Number of workers the pool should run: one per `concurrency` started or
+    queued jobs, within [minimum, maximum]. The pool only grows once the
+    oldest queued job has waited `scale_up_age` seconds, so short bursts
+    are absorbed by the running workers.
+    '''
+    target = min(max(math.ceil((started + queued) / concurrency), minimum), maximum)
+    if target > current and oldest_age < scale_up_age:
+        return max(current, minimum)
+    return target
+
+
+class MatchWorkerPool(WorkerPool):
+    '''
+    Pre-forked pool of match workers on the matches queue, scaled between
+    WORKER_MIN_PROCESSES and WORKER_MAX_PROCESSES. Each worker runs
+    WORKER_JOB_CONCURRENCY jobs at once (AsyncMatchWorker), or one at a
+    time (MatchWorker) when it is 1.
+
+    Modules, graphs and prompts are loaded once by the supervisor and
+    shared with every forked worker. Every WORKER_SCALE_INTERVAL seconds
+    the supervisor compares the queue depth and the age of its oldest job
+    to the number of workers: it starts workers at once, and stops one
+    (after its current job) once workers have been spare for
+    WORKER_SCALE_DOWN_DELAY seconds. The state of the pool is published to
+    Redis for the /workers endpoint.
+
+    Args:
+        connection: Redis client returning bytes, as RQ requires.
+        minimum: Workers always kept.
+        maximum: Workers the pool scales up to.
+    '''
+
+    def __init__(
+        self,
+        connection: Redis | None = None,
+        minimum: int = settings.WORKER_MIN_PROCESSES,
+        maximum: int = settings.WORKER_MAX_PROCESSES,
+    ) -> None:
+        super().__init__(
+            [MATCH_QUEUE],
+            connection=connection or get_redis_connection(decode_responses=False),
+            num_workers=minimum,
+            worker_class=(
+                AsyncMatchWorker if settings.WORKER_JOB_CONCURRENCY > 1 else MatchWorker
+            ),
+        )
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.queue = Queue(MATCH_QUEUE, connection=self.connection)
+
+        self._last_scaled = 0.0
+        self._spare_since: float | None = None
+        self._state: dict = {}
+        # Workers stopped by scaling down, finishing their current job.
+        self._stopping: list = []
+
+    def oldest_job_age(self) -> float:
+        '''
+        Seconds the oldest queued job has waited, 0 if the queue is empty.
+        '''
+        job_ids = self.queue.get_job_ids(0, 1)
+        if not job_ids:
+            return 0.0
+
+        job = Job.fetch(job_ids[0], connection=self.connection)
+        if job.enqueued_at is None:
+            return 0.0
+
+        enqueued_at = job.enqueued_at
+        if enqueued_at.tzinfo is None:
+            enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - enqueued_at).total_seconds()
+
+    def scale(self) -> None:
+        '''
+        Adjust `num_workers` to the load of the queue.
+        '''
+        current = self.num_workers
+        queued = self.queue.count
+        started = self.queue.started_job_registry.count
+        oldest_age = self.oldest_job_age()
+
+        target = desired_workers(
+            current, queued, started, oldest_age, self.minimum, self.maximum,
+            concurrency=settings.WORKER_JOB_CONCURRENCY,
+        )
+
+        now = time.monotonic()
+        if target > current:
+            logger.info(
+                f"[Pool] Scaling up to {target} workers "
+                f"({queued} queued, oldest {oldest_age:.0f}s)."
+            )
+            self.num_workers = target
+            self._spare_since = None
+        elif target < current:
+            self._spare_since = self._spare_since or now
+            if now - self._spare_since >= settings.WORKER_SCALE_DOWN_DELAY:
+                self.scale_down()
+                self._spare_since = now
+        else:
+            self._spare_since = None
+
+        self._state = {
+            "queue": MATCH_QUEUE,
+            "queued": queued,
+            "started": started,
+            "oldest_job_age": round(oldest_age, 1),
+            "target": target,
+        }
+
+    def scale_down(self) -> None:
+        '''
+        Stop the most recently started worker; a warm shutdown lets it
+        finish its current job first.
+        '''
+        if not self.worker_dict:
+            return
+
+        self.num_workers -= 1
+        worker_data = list(self.worker_dict.values())[-1]
+        logger.info(
+            f"[Pool] Scaling down to {self.num_workers} workers "
+            f"(stopping pid {worker_data.pid})."
+        )
+        self.stop_worker(worker_data)
+        # Not respawned while it finishes its job.
+        self.worker_dict.pop(worker_data.name)
+        self._stopping.append(worker_data)
+
+    def publish_state(self) -> None:
+        '''
+        Publish the state of the pool for the /workers endpoint.
+        '''
+        publish_worker_pool_state(self.name, {
+            "name": self.name,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "status": self.status.name.lower(),
+            "workers": self.number_of_active_workers,
+            "stopping": len(self._stopping),
+            "min_workers": self.minimum,
+            "max_workers": self.maximum,
+            "job_concurrency": settings.WORKER_JOB_CONCURRENCY,
+            "worker_pids": [data.pid for data in self.worker_dict.values()],
+            **self._state,
+        }, self.connection)
+
+    def check_workers(self, respawn: bool = True) -> None:
+        # Called about every second by WorkerPool.start.
+        self._stopping = [data for data in self._stopping if data.process.is_alive()]
+
+        if (
+            self.status != self.Status.STOPPED
+            and time.monotonic() - self._last_scaled >= settings.WORKER_SCALE_INTERVAL
+        ):
+            self._last_scaled = time.monotonic()
+            try:
+                self.scale()
+                self.publish_state()
+            except RedisError as e:
+                logger.warning(f"[Pool] Failed to read the queue: {e}")
+
+        super().check_workers(respawn=respawn)
+
+    def all_workers_have_stopped(self) -> bool:
+        self._stopping = [d for d in self._stopping if d.process.is_alive()]
+        return super().all_workers_have_stopped() and not self._stopping
+
+
+def run_worker_pool(burst: bool = False) -> None:
+    '''
+    Start the match worker pool and block until it is stopped (SIGINT or
+    SIGTERM).
+    '''
+    pool = MatchWorkerPool()
+    pool.start(burst=burst)
@@ -0,0 +1,66 @@
+from .heuristic import HEURISTIC_CRITERIA, compute_criteria
+from .encoding import (
+    ENCODING_VERSION,
+    canonical_term,
+    canonical_terms,
+    summarize_idea,
+    to_llm_input,
+    encode_batch,
+    decode_alias,
+)
+from .retry import (
+    TRANSIENT_ERRORS,
+    PROGRAMMING_ERRORS,
+    is_transient,
+    is_batch_failure,
+    retry_after,
+    backoff_delay,
+)
+from .batching import (
+    MIN_BATCH_TOKEN_BUDGET,
+    profile_tokens,
+    plan_token_batches,
+    adapt_token_budget,
+)
+from .scorers import (
+    Scoring_mode,
+    Scorer,
+    LLMScorer,
+    HeuristicScorer,
+    HybridScorer,
+    build_scoring_chain,
+    get_scoring_chain,
+    scoring_version,
+    get_scorer,
+)
+
+__all__ = [
+    "HEURISTIC_CRITERIA",
+    "compute_criteria",
+    "Scoring_mode",
+    "Scorer",
+    "LLMScorer",
+    "HeuristicScorer",
+    "HybridScorer",
+    "build_scoring_chain",
+    "get_scoring_chain",
+    "scoring_version",
+    "get_scorer",
+    "ENCODING_VERSION",
+    "canonical_term",
+    "canonical_terms",
+    "summarize_idea",
+    "to_llm_input",
+    "encode_batch",
+    "decode_alias",
+    "TRANSIENT_ERRORS",
+    "PROGRAMMING_ERRORS",
+    "is_transient",
+    "is_batch_failure",
+    "retry_after",
+    "backoff_delay",
+    "MIN_BATCH_TOKEN_BUDGET",
+    "profile_tokens",
+    "plan_token_batches",
+    "adapt_token_budget",
+]
@@ -0,0 +1,76 @@
+import json
+
+from src.agent.domain.fyp_data import Fyp_data
+from src.agent.infrastructure.redis import estimate_tokens
+from src.agent.application.scoring.encoding import to_llm_input
+
+
+# Lowest prompt-token budget batches shrink to after incomplete answers.
+MIN_BATCH_TOKEN_BUDGET = 256
+
+
+def profile_tokens(profile: Fyp_data) -> int:
+    '''
+    Estimated tokens of a profile in the `input` of the connection finding
+    prompt.
+    '''
+    return estimate_tokens(json.dumps(to_llm_input(profile, alias=0)))
+
+
+def plan_token_batches(
+    query: Fyp_data,
+    candidates: list[Fyp_data],
+    token_budget: int,
+    max_size: int
+) -> list[list[Fyp_data]]:
+    '''
+    Split candidates into batches whose prompt input, the query and the
+    candidates, stays within `token_budget` estimated tokens, with at most
+    `max_size` candidates per batch. A candidate larger than the budget is
+    scored alone. A budget of 0 only caps the size.
+    '''
+    if token_budget <= 0:
+        return [
+            candidates[i:i + max_size]
+            for i in range(0, len(candidates), max_size)
+        ]
+
+    budget = token_budget - profile_tokens(query)
+    batches: list[list[Fyp_data]] = []
+    batch: list[Fyp_data] = []
+    used = 0
+
+    for profile in candidates:
+        tokens = profile_tokens(profile)
+        if batch and (used + tokens > budget or len(batch) >= max_size):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(profile)
+        used += tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def adapt_token_budget(
+    token_budget: int,
+    coverage: list[tuple[int, int]]
+) -> int:
+    '''
+    Adjust the prompt-token budget of the next batches to the last answers
+    of the LLM, given as (scores returned, candidates sent) per batch whose
+    answer parsed.
+
+    When a batch came back with ids missing, the model lost track of a too
+    long input: the budget shrinks in proportion to the worst batch, by
+    half at most. It is not raised again within the job, as probing a
+    larger size would leave more candidates unscored.
+    '''
+    if token_budget <= 0:
+        return token_budget
+
+    ratio = min((returned / sent for returned, sent in coverage if sent), default=1.0)
+    if ratio < 1.0:
+        return max(MIN_BATCH_TOKEN_BUDGET, int(token_budget * max(ratio, 0.5)))
+    return token_budget
@@ -0,0 +1,145 @@
+import re
+from functools import lru_cache
+
+from src.agent.config import settings
+from src.agent.domain.fyp_data import Fyp_data
+from src.agent.application.scoring.heuristic import canonical_words, phrases_match
+
+
+# Bump when the encoding of profiles sent to the LLM changes: scores of
+# different encodings are not comparable (see `scoring_version`).
+ENCODING_VERSION = 2
+
+# Alias of the query profile in a batch; candidates are numbered from 1.
+QUERY_ALIAS = 0
+
+# Spellings of the same skill or interest, mapped to one canonical term.
+TERM_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "ml": "machine learning",
+    "artificial intelligence": "ai",
+    "natural language processing": "nlp",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "golang": "go",
+    "cpp": "c++",
+    "c plus plus": "c++",
+    "c sharp": "c#",
+    "k8s": "kubernetes",
+}
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Openings that restate that the idea is a project.
+IDEA_FILLER = re.compile(
+    r"^(?:this|the|our|my)\s+(?:final year\s+)?(?:project|system|application|app|idea)\s+"
+    r"(?:aims|is designed|seeks|intends|proposes|will|is)\s+(?:to\s+)?",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=65536)
+def canonical_term(term: str) -> str:
+    '''
+    Canonical form of a skill or interest: lowercase, single spaces, no
+    surrounding punctuation, with TERM_ALIASES applied.
+    '''
+    term = " ".join(term.lower().split()).strip(" .,;:-")
+    return TERM_ALIASES.get(term, term)
+
+
+def canonical_terms(terms: list[str], known: list[str] | None = None) -> list[str]:
+    '''
+    Canonical terms of a list, in order, dropping the ones that repeat an
+    earlier term or one of `known`, e.g. "Python programming" after
+    "Python" (see `phrases_match`).
+    '''
+    kept: list[str] = []
+    seen = {canonical_term(term) for term in known or []}
+    seen_words = [canonical_words(term) for term in seen]
+
+    for term in map(canonical_term, terms):
+        words = canonical_words(term)
+        if not term or term in seen or any(phrases_match(words, other) for other in seen_words):
+            continue
+        kept.append(term)
+        seen.add(term)
+        seen_words.append(words)
+
+    return kept
+
+
+def summarize_idea(idea: str, max_words: int = settings.MATCH_IDEA_SUMMARY_WORDS) -> str:
+    '''
+    Bounded summary of a project idea sent to the LLM instead of the full
+    text: its leading sentences, up to `max_words` words, without the
+    "This project aims to" opening. Ideas state their subject first, so
+    the later sentences are the ones dropped.
+    '''
+    idea = IDEA_FILLER.sub("", " ".join(idea.split()))
+    if len(idea.split()) <= max_words:
+        return idea
+
+    summary: list[str] = []
+    count = 0
+    for sentence in SENTENCE_END.split(idea):
+        words = len(sentence.split())
+        if count + words > max_words:
+            break
+        summary.append(sentence)
+        count += words
+
+    if not summary:
+        # The first sentence alone is too long: cut it.
+        return " ".join(idea.split()[:max_words])
+    return " ".join(summary)
+
+
+def to_llm_input(profile: Fyp_data, alias: int) -> dict:
+    '''
+    Compact encoding of a profile in the `input` of the connection finding
+    prompt: a short integer alias instead of its id, the idea summary
+    stored at ingest, and canonical skill and interest terms. Skills
+    already in the tech stack are not repeated.
+    '''
+    tech_stack = canonical_terms(profile.tech_stack)
+    return {
+        "id": alias,
+        "idea": profile.idea_summary or summarize_idea(profile.idea),
+        "interests": canonical_terms(profile.interests),
+        "tech_stack": tech_stack,
+        "skills": canonical_terms(profile.metadata.skills, known=tech_stack),
+    }
+
+
+def encode_batch(query: Fyp_data, candidates: list[Fyp_data]) -> dict:
+    '''
+    Input of the connection finding chain for a batch: the query first
+    (alias QUERY_ALIAS), then the candidates numbered from 1.
+    '''
+    return {
+        "input": [to_llm_input(query, QUERY_ALIAS)] + [
+            to_llm_input(data, alias)
+            for alias, data in enumerate(candidates, start=1)
+        ]
+    }
+
+
+def decode_alias(alias, candidates: list[Fyp_data]) -> str | None:
+    '''
+    Id of the candidate a batch alias refers to, None for the query or an
+    alias that is not in the batch.
+    '''
+    try:
+        position = int(alias)
+    except (TypeError, ValueError):
+        return None
+
+    if 1 <= position <= len(candidates):
+        return candidates[position - 1].id
+    return None
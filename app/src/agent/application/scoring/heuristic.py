@@ -0,0 +1,181 @@
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+
+from src.agent.domain.fyp_data import Fyp_data
+from src.agent.infrastructure.vector_index.vectorizer import ProfileVectorizer
+
+
+# Criteria of CONNECTION_FINDING_SYSTEM_PROMPT that are set-overlap questions
+# and can be answered without the LLM, in column order.
+HEURISTIC_CRITERIA = ("SHARED_INTERESTS", "SKILL_MATCH", "IDEA_INTEREST_MATCH")
+
+# Query phrases are tracked as bits of an int64 mask.
+MAX_QUERY_PHRASES = 63
+
+
+@lru_cache(maxsize=65536)
+def canonical_words(value: str) -> frozenset[str]:
+    '''
+    Canonical word set of a skill, interest or idea string.
+    '''
+    return frozenset(ProfileVectorizer.tokenize(value))
+
+
+def phrases_match(a: frozenset[str], b: frozenset[str]) -> bool:
+    '''
+    Whether two phrases mean roughly the same thing, e.g. "Python" and
+    "Python programming", but not "Machine Learning" and "Deep Learning".
+    '''
+    if not a or not b:
+        return False
+    return len(a & b) / len(a | b) >= 0.5
+
+
+class PhraseMatrix:
+    '''
+    Candidate phrase lists flattened into one array of phrase ids.
+
+    Every distinct phrase is canonicalized and compared against the query
+    once; the per-candidate results are then reduced with NumPy over the
+    flattened array, so no Python code runs per candidate phrase.
+
+    Args:
+        phrase_lists: One list of phrases (skills, interests...) per candidate.
+    '''
+
+    def __init__(self, phrase_lists: list[list[str]]) -> None:
+        n = len(phrase_lists)
+        self.lengths = np.fromiter(map(len, phrase_lists), dtype=np.int64, count=n)
+        self.starts = np.cumsum(self.lengths) - self.lengths
+
+        flat = list(chain.from_iterable(phrase_lists))
+        self.vocabulary = {phrase: i for i, phrase in enumerate(dict.fromkeys(flat))}
+        self.ids = np.fromiter(
+            map(self.vocabulary.__getitem__, flat), dtype=np.int64, count=len(flat)
+        )
+        self.words = [canonical_words(phrase) for phrase in self.vocabulary]
+
+    def query_bitmasks(self, query_phrases: list[frozenset[str]]) -> np.ndarray:
+        '''
+        Per-candidate bitmask of the query phrases matched by any candidate
+        phrase (bit i set = query phrase i is covered).
+        '''
+        phrase_masks = np.zeros(len(self.words), dtype=np.int64)
+        for i, words in enumerate(self.words):
+            for bit, query_words in enumerate(query_phrases):
+                if phrases_match(words, query_words):
+                    phrase_masks[i] |= 1 << bit
+
+        # Sentinel keeps reduceat in bounds for trailing empty candidates.
+        values = np.append(phrase_masks[self.ids], 0)
+        masks = np.bitwise_or.reduceat(values, self.starts)
+        masks[self.lengths == 0] = 0
+
+        return masks
+
+    def count_matching(self, predicate) -> np.ndarray:
+        '''
+        Per-candidate number of phrases whose canonical words satisfy the
+        predicate.
+        '''
+        phrase_hits = np.fromiter(
+            map(predicate, self.words), dtype=np.float64, count=len(self.words)
+        )
+        rows = np.repeat(np.arange(len(self.lengths)), self.lengths)
+
+        return np.bincount(
+            rows, weights=phrase_hits[self.ids], minlength=len(self.lengths)
+        )
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    '''
+    Number of set bits of each int64 mask.
+    '''
+    return np.bitwise_count(masks.astype(np.uint64)).astype(np.float64)
+
+
+def query_phrases(values: list[str] | None) -> list[frozenset[str]]:
+    '''
+    Distinct, non-empty canonical phrases of a query field.
+    '''
+    phrases = dict.fromkeys(canonical_words(value) for value in values or [])
+    return [phrase for phrase in phrases if phrase][:MAX_QUERY_PHRASES]
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(
+        numerator, denominator,
+        out=np.zeros_like(numerator, dtype=np.float64),
+        where=denominator > 0
+    )
+
+
+def compute_criteria(query: Fyp_data, candidates: list[Fyp_data]) -> np.ndarray:
+    '''
+    Score the set-overlap criteria for a batch of candidates.
+
+    Follows the scoring scale and missing data rules of
+    CONNECTION_FINDING_SYSTEM_PROMPT:
+
+    - SHARED_INTERESTS: Dice overlap of the two interest lists.
+    - SKILL_MATCH: share of the query's tech stack covered by the
+      candidate's skills and tech stack; when the query has no tech stack,
+      overlap of general skills capped at 0.5.
+    - IDEA_INTEREST_MATCH: share of the candidate's interests that appear
+      in the query's idea.
+
+    Returns:
+        Array of shape (len(candidates), 3), columns in HEURISTIC_CRITERIA
+        order, each value in [0.0, 1.0] rounded to one decimal.
+    '''
+    n = len(candidates)
+    if n == 0:
+        return np.zeros((0, len(HEURISTIC_CRITERIA)))
+
+    query_interests = query_phrases(query.interests)
+    query_stack = query_phrases(query.tech_stack)
+    query_skills = query_phrases(query.metadata.skills)
+    query_idea = canonical_words(query.idea or "")
+
+    interests = PhraseMatrix([c.interests or [] for c in candidates])
+    skills = PhraseMatrix([
+        (c.metadata.skills or []) + (c.tech_stack or []) for c in candidates
+    ])
+
+    # SHARED_INTERESTS
+    covered = popcount(interests.query_bitmasks(query_interests))
+    matched = interests.count_matching(
+        lambda words: any(phrases_match(words, q) for q in query_interests)
+    )
+    shared_interests = _safe_divide(
+        covered + matched, interests.lengths + len(query_interests)
+    )
+
+    # SKILL_MATCH
+    if query_stack:
+        covered = popcount(skills.query_bitmasks(query_stack))
+        skill_match = covered / len(query_stack)
+    else:
+        covered = popcount(skills.query_bitmasks(query_skills))
+        skill_match = np.minimum(
+            0.5, _safe_divide(covered, np.full(n, float(len(query_skills))))
+        )
+
+    # IDEA_INTEREST_MATCH
+    in_idea = interests.count_matching(
+        lambda words: bool(words) and len(words & query_idea) / len(words) >= 0.5
+    )
+    idea_interest_match = _safe_divide(in_idea, interests.lengths)
+
+    # Missing data rule: without query interests there is nothing to share.
+    if not query_interests:
+        shared_interests[:] = 0.0
+
+    criteria = np.column_stack(
+        [shared_interests, skill_match, idea_interest_match]
+    )
+
+    return np.round(np.clip(criteria, 0.0, 1.0), 1)
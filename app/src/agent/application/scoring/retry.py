@@ -0,0 +1,90 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import groq
+from langchain_core.exceptions import OutputParserException
+
+from src.agent.config import settings
+
+
+# Errors worth sending the same batch again for: the request may succeed
+# once the quota is refilled, the server recovered or the network is back.
+# APITimeoutError is an APIConnectionError.
+TRANSIENT_ERRORS = (
+    groq.RateLimitError,
+    groq.InternalServerError,
+    groq.APIConnectionError,
+)
+
+
+# Errors of a batch that are bugs rather than failures of the request: they
+# fail the job instead of leaving the batch unscored.
+PROGRAMMING_ERRORS = (
+    AssertionError,
+    AttributeError,
+    ImportError,
+    LookupError,
+    NameError,
+    NotImplementedError,
+    TypeError,
+)
+
+
+def is_transient(error: object) -> bool:
+    '''
+    Whether a batch that failed with `error` may succeed if sent again.
+    '''
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def is_batch_failure(result: object) -> bool:
+    '''
+    Whether a batch result is a failed request (a Groq, network or other
+    runtime error), rather than an answer, an unparsable answer or a bug.
+    '''
+    return isinstance(result, Exception) and not isinstance(
+        result, (OutputParserException, *PROGRAMMING_ERRORS)
+    )
+
+
+def retry_after(error: Exception) -> float | None:
+    '''
+    Seconds the `retry-after` header of an error response asks to wait
+    (given in seconds or as an HTTP date), None without one.
+    '''
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    error: Exception | None = None,
+    base_delay: float = settings.GROQ_RETRY_BASE_DELAY,
+    max_delay: float = settings.GROQ_RETRY_MAX_DELAY,
+) -> float:
+    '''
+    Seconds to wait before retry `attempt` (1 for the first retry): a random
+    delay up to `base_delay * 2 ** (attempt - 1)`, capped at `max_delay`, so
+    batches that failed together are not sent again together.
+
+    A `retry-after` of the error is honored, with up to `base_delay` of
+    jitter on top. The jitter never takes a `retry-after` within
+    `max_delay` over it: only a longer `retry-after` exceeds `max_delay`.
+    '''
+    wait = retry_after(error) if error is not None else None
+    if wait is not None:
+        jittered = wait + random.uniform(0, base_delay)
+        return jittered if wait > max_delay else min(jittered, max_delay)
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
@@ -0,0 +1,569 @@
+import asyncio
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Literal
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import BasePromptTemplate
+from loguru import logger
+
+from src.agent.config import settings
+
+from src.agent.domain.fyp_data import Fyp_data
+from src.agent.application.agents.chains.connection_finding_chain import (
+    connection_finding_chain,
+    partial_connection_finding_chain,
+)
+from src.agent.application.agents.chains.registry import get_chain
+from src.agent.application.scoring.encoding import (
+    ENCODING_VERSION,
+    decode_alias,
+    encode_batch,
+)
+from src.agent.application.scoring.retry import (
+    backoff_delay,
+    is_batch_failure,
+    is_transient,
+)
+from src.agent.application.scoring.heuristic import (
+    HEURISTIC_CRITERIA,
+    compute_criteria,
+)
+
+
+Scoring_mode = Literal["llm", "heuristic", "hybrid"]
+
+# Number of criteria in CONNECTION_FINDING_SYSTEM_PROMPT; the final score is
+# their sum.
+TOTAL_CRITERIA = 5
+
+
+class Scorer(ABC):
+    '''
+    Scores batches of candidates against the query profile.
+    '''
+    uses_llm: bool = False
+
+    @abstractmethod
+    def score(
+        self,
+        query: Fyp_data,
+        candidates: list[Fyp_data]
+    ) -> dict[str, float]:
+        '''
+        Returns a mapping of candidate id to compatibility score (0.0–5.0).
+        '''
+
+    def score_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        '''
+        Scores several batches, with at most `max_concurrency` in flight.
+        '''
+        scores = {}
+        for batch in batches:
+            scores.update(self.score(query, batch))
+        return scores
+
+    async def ascore_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        '''
+        Async variant of `score_batches`. Scorers that do not call the LLM
+        score in the calling thread: they are CPU bound and fast.
+        '''
+        return self.score_batches(query, batches, max_concurrency)
+
+
+class LLMScorer(Scorer):
+    '''
+    Scores all five criteria with the connection finding chain.
+    '''
+    uses_llm = True
+
+    def __init__(self, chain: Any) -> None:
+        self.chain = chain
+        # (scores returned, candidates sent) of each batch of the last call
+        # whose answer parsed, before any candidate was sent again.
+        self.batch_coverage: list[tuple[int, int]] = []
+        # Candidates of the batches of the last call whose answer could not
+        # be parsed.
+        self.unparsed_candidates = 0
+        # Sizes of the batches of candidates sent again in the last call.
+        self.rescored_batches: list[int] = []
+        # Batches of the last call sent again after a transient error.
+        self.retries = 0
+        # (candidates, last error, attempts) of the batches of the last call
+        # that failed for good.
+        self.failed_batches: list[tuple[list[Fyp_data], Exception, int]] = []
+
+    @staticmethod
+    def build_input(query: Fyp_data, candidates: list[Fyp_data]) -> dict:
+        # The prompt expects the query profile first in the list.
+        return encode_batch(query, candidates)
+
+    def plan_retry(
+        self,
+        results: list,
+        attempt: int,
+        given_up: set[int]
+    ) -> tuple[list[int], float] | None:
+        '''
+        Positions of the results to send again for retry `attempt`, and the
+        seconds to wait first; None if no batch is to be retried.
+
+        A batch whose error asks to wait longer than GROQ_RETRY_MAX_DELAY is
+        added to `given_up` and not retried again; the other failed batches
+        still are.
+        '''
+        if attempt > settings.GROQ_RETRY_ATTEMPTS:
+            return None
+
+        delays = {
+            i: backoff_delay(attempt, result)
+            for i, result in enumerate(results)
+            if i not in given_up and is_transient(result)
+        }
+        too_long = [i for i, delay in delays.items() if delay > settings.GROQ_RETRY_MAX_DELAY]
+        if too_long:
+            logger.error(
+                f"[Scorer] Groq asked to wait {max(delays[i] for i in too_long):.0f}s, "
+                f"not retrying {len(too_long)} batches."
+            )
+            given_up.update(too_long)
+
+        failed = [i for i in delays if i not in given_up]
+        if not failed:
+            return None
+
+        delay = max(delays[i] for i in failed)
+        logger.warning(
+            f"[Scorer] {len(failed)} batches failed ({results[failed[0]]!r}), "
+            f"retry {attempt} in {delay:.1f}s."
+        )
+        self.retries += len(failed)
+        return failed, delay
+
+    def record_failures(
+        self,
+        batches: list[list[Fyp_data]],
+        results: list,
+        attempts: list[int]
+    ) -> None:
+        '''
+        Record the batches whose last attempt failed: with a Groq error, or
+        any other error of the request.
+        '''
+        for batch, result, count in zip(batches, results, attempts):
+            if is_batch_failure(result):
+                self.failed_batches.append((batch, result, count))
+
+    def run_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> list:
+        '''
+        Runs the chain on all batches concurrently. Batches failing with a
+        transient Groq error are sent again after a jittered exponential
+        backoff, up to GROQ_RETRY_ATTEMPTS times; those that still fail are
+        recorded in `failed_batches`.
+        '''
+        inputs = [self.build_input(query, batch) for batch in batches]
+        attempts = [1] * len(batches)
+        results = self.chain.batch(
+            inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True
+        )
+
+        attempt = 1
+        given_up: set[int] = set()
+        while (retry := self.plan_retry(results, attempt, given_up)) is not None:
+            failed, delay = retry
+            time.sleep(delay)
+            retried = self.chain.batch(
+                [inputs[i] for i in failed],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+            for i, result in zip(failed, retried):
+                results[i] = result
+                attempts[i] += 1
+            attempt += 1
+
+        self.record_failures(batches, results, attempts)
+        return results
+
+    async def arun_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> list:
+        '''
+        Async variant of `run_batches`.
+        '''
+        inputs = [self.build_input(query, batch) for batch in batches]
+        attempts = [1] * len(batches)
+        results = await self.chain.abatch(
+            inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True
+        )
+
+        attempt = 1
+        given_up: set[int] = set()
+        while (retry := self.plan_retry(results, attempt, given_up)) is not None:
+            failed, delay = retry
+            await asyncio.sleep(delay)
+            retried = await self.chain.abatch(
+                [inputs[i] for i in failed],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+            for i, result in zip(failed, retried):
+                results[i] = result
+                attempts[i] += 1
+            attempt += 1
+
+        self.record_failures(batches, results, attempts)
+        return results
+
+    @staticmethod
+    def parse_result(
+        result: list[tuple[int, float]] | Exception,
+        candidates: list[Fyp_data]
+    ) -> tuple[dict[str, float], list[Fyp_data]]:
+        '''
+        Scores of a batch by candidate id, and the candidates left to score
+        again: those the LLM did not score, or scored twice differently.
+        An answer that could not be parsed leaves the whole batch to score
+        again; a programming error is raised.
+        '''
+        if isinstance(result, OutputParserException):
+            logger.warning(f"[Scorer] Unparsable scores: {result}")
+            result = []
+        elif isinstance(result, Exception):
+            raise result
+
+        logger.debug(f"[Scorer] Connection finding result: {result}")
+
+        # Candidates are sent under their alias in the batch.
+        scores: dict[str, float] = {}
+        conflicting: set[str] = set()
+        for alias, score in result:
+            id = decode_alias(alias, candidates)
+            if id is None:
+                continue
+            if scores.get(id, score) != score:
+                conflicting.add(id)
+            scores[id] = score
+
+        for id in conflicting:
+            del scores[id]
+        return scores, [data for data in candidates if data.id not in scores]
+
+    def parse_batches(
+        self,
+        batches: list[list[Fyp_data]],
+        results: list[list[tuple[int, float]] | Exception]
+    ) -> tuple[dict[str, float], list[list[Fyp_data] | None]]:
+        '''
+        Scores of every batch, and the candidates of each batch left to score
+        again (None for the batches that failed, see `failed_batches`).
+        '''
+        scores = {}
+        missing = []
+        for batch, result in zip(batches, results):
+            if is_batch_failure(result):
+                missing.append(None)
+                continue
+            batch_scores, batch_missing = self.parse_result(result, batch)
+            scores.update(batch_scores)
+            missing.append(batch_missing)
+        return scores, missing
+
+    def merge_results(
+        self,
+        batches: list[list[Fyp_data]],
+        results: list[list[tuple[int, float]] | Exception]
+    ) -> tuple[dict[str, float], list[list[Fyp_data]]]:
+        '''
+        Merges the first answers for every batch, recording how many
+        candidates of each batch the LLM scored. Only answers that parsed
+        tell whether the prompt was too long: failed calls and unparsable
+        answers are left out of `batch_coverage`. Returns the scores and the
+        batches of candidates to score again.
+        '''
+        scores, missing = self.parse_batches(batches, results)
+        self.batch_coverage = [
+            (len(batch) - len(batch_missing), len(batch))
+            for batch, batch_missing, result in zip(batches, missing, results)
+            if batch_missing is not None and not isinstance(result, Exception)
+        ]
+        self.unparsed_candidates = sum(
+            len(batch)
+            for batch, result in zip(batches, results)
+            if isinstance(result, OutputParserException)
+        )
+        return scores, [batch for batch in missing if batch]
+
+    def reset(self) -> None:
+        '''
+        Clear what was recorded of the last call.
+        '''
+        self.batch_coverage = []
+        self.unparsed_candidates = 0
+        self.rescored_batches = []
+        self.retries = 0
+        self.failed_batches = []
+
+    def invoke_chain(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        '''
+        Runs the chain on all batches concurrently and merges the scores.
+        The candidates left unscored are sent again, on their own, up to
+        MATCH_LLM_RESCORE_ROUNDS times. Batches that fail for good are left
+        out of the scores.
+        '''
+        self.reset()
+        if not batches:
+            return {}
+
+        results = self.run_batches(query, batches, max_concurrency)
+        scores, unscored = self.merge_results(batches, results)
+
+        for _ in range(settings.MATCH_LLM_RESCORE_ROUNDS):
+            if not unscored:
+                break
+            self.rescored_batches.extend(map(len, unscored))
+            results = self.run_batches(query, unscored, max_concurrency)
+            rescored, missing = self.parse_batches(unscored, results)
+            scores.update(rescored)
+            unscored = [batch for batch in missing if batch]
+
+        return scores
+
+    async def ainvoke_chain(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        '''
+        Async variant of `invoke_chain`, awaiting the LLM calls on the event
+        loop instead of a thread pool.
+        '''
+        self.reset()
+        if not batches:
+            return {}
+
+        results = await self.arun_batches(query, batches, max_concurrency)
+        scores, unscored = self.merge_results(batches, results)
+
+        for _ in range(settings.MATCH_LLM_RESCORE_ROUNDS):
+            if not unscored:
+                break
+            self.rescored_batches.extend(map(len, unscored))
+            results = await self.arun_batches(query, unscored, max_concurrency)
+            rescored, missing = self.parse_batches(unscored, results)
+            scores.update(rescored)
+            unscored = [batch for batch in missing if batch]
+
+        return scores
+
+    def score(
+        self,
+        query: Fyp_data,
+        candidates: list[Fyp_data]
+    ) -> dict[str, float]:
+        return self.invoke_chain(query, [candidates])
+
+    def score_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        return self.invoke_chain(query, batches, max_concurrency)
+
+    async def ascore_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        return await self.ainvoke_chain(query, batches, max_concurrency)
+
+
+class HeuristicScorer(Scorer):
+    '''
+    Scores the set-overlap criteria without calling the LLM.
+
+    The three heuristic criteria are scaled to the 0.0–5.0 range of the LLM
+    score so results of both modes are comparable.
+    '''
+
+    def score(
+        self,
+        query: Fyp_data,
+        candidates: list[Fyp_data]
+    ) -> dict[str, float]:
+        criteria = compute_criteria(query, candidates)
+        totals = criteria.sum(axis=1) * TOTAL_CRITERIA / len(HEURISTIC_CRITERIA)
+
+        return {
+            data.id: round(float(total), 1)
+            for data, total in zip(candidates, totals)
+        }
+
+    def score_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        # Vectorized already: one pass over all batches is fastest.
+        return self.score(query, [data for batch in batches for data in batch])
+
+
+class HybridScorer(LLMScorer):
+    '''
+    Scores the set-overlap criteria heuristically and asks the LLM only for
+    IDEA_SIMILARITY and OVERALL_COMPATIBILITY.
+    '''
+
+    @staticmethod
+    def combine(
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        llm_scores: dict[str, float]
+    ) -> dict[str, float]:
+        candidates = [data for batch in batches for data in batch]
+        criteria = compute_criteria(query, candidates)
+
+        return {
+            data.id: round(float(heuristic) + llm_scores[data.id], 1)
+            for data, heuristic in zip(candidates, criteria.sum(axis=1))
+        }
+
+    @staticmethod
+    def without_unscored(
+        batches: list[list[Fyp_data]],
+        llm_scores: dict[str, float]
+    ) -> list[list[Fyp_data]]:
+        '''
+        Batches without the candidates the LLM did not score, because their
+        batch failed or they were still unscored after the rescore rounds: a
+        heuristic score alone would rank them below comparable candidates.
+        '''
+        return [[data for data in batch if data.id in llm_scores] for batch in batches]
+
+    def score_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        llm_scores = self.invoke_chain(query, batches, max_concurrency)
+        return self.combine(query, self.without_unscored(batches, llm_scores), llm_scores)
+
+    async def ascore_batches(
+        self,
+        query: Fyp_data,
+        batches: list[list[Fyp_data]],
+        max_concurrency: int = 1
+    ) -> dict[str, float]:
+        llm_scores = await self.ainvoke_chain(query, batches, max_concurrency)
+        return self.combine(query, self.without_unscored(batches, llm_scores), llm_scores)
+
+    def score(
+        self,
+        query: Fyp_data,
+        candidates: list[Fyp_data]
+    ) -> dict[str, float]:
+        return self.score_batches(query, [candidates])
+
+
+def build_scoring_chain(mode: Scoring_mode) -> Any:
+    '''
+    Builds the chain required by a scoring mode, None if it needs no LLM.
+    '''
+    if mode == "llm":
+        return connection_finding_chain()
+    if mode == "hybrid":
+        return partial_connection_finding_chain()
+    return None
+
+
+# Chain of the process-wide chain registry used by each scoring mode.
+SCORING_CHAINS = {
+    "llm": "connection_finding",
+    "hybrid": "partial_connection_finding",
+}
+
+
+def get_scoring_chain(mode: Scoring_mode) -> Any:
+    '''
+    Returns the process' shared chain of a scoring mode, None if it needs no
+    LLM. Unlike `build_scoring_chain`, the chain is built once per process.
+    '''
+    name = SCORING_CHAINS.get(mode)
+    return get_chain(name) if name else None
+
+
+def scoring_version(mode: Scoring_mode, chain: Any = None) -> str:
+    '''
+    Identifies how scores are produced: the mode, the encoding of profiles,
+    the prompt and model of the chain, and MATCH_SCORE_CACHE_VERSION. Scores from different versions are
+    not comparable and must not be reused for each other.
+
+    The shared chain of the mode is used when no chain is given.
+    '''
+    if chain is None:
+        chain = get_scoring_chain(mode)
+
+    parts = [mode, settings.MATCH_SCORE_CACHE_VERSION, f"encoding:{ENCODING_VERSION}"]
+    steps = list(getattr(chain, "steps", []))
+    while steps:
+        step = steps.pop(0)
+        if isinstance(step, BasePromptTemplate):
+            parts.append(step.pretty_repr())
+        elif isinstance(step, BaseChatModel):
+            parts.append(
+                f"{getattr(step, 'model_name', '')}:{getattr(step, 'temperature', '')}"
+            )
+        else:
+            # Prompts pulled with their model are sequences themselves.
+            steps[:0] = getattr(step, "steps", [])
+
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=8)
+    return f"{mode}:{digest.hexdigest()}"
+
+
+def get_scorer(mode: Scoring_mode, chain: Any = None) -> Scorer:
+    '''
+    Returns the scorer for a scoring mode, using the shared chain of the
+    mode when no chain is given.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    '''
+    if mode == "heuristic":
+        return HeuristicScorer()
+    if mode not in ("llm", "hybrid"):
+        raise ValueError(f"Unknown scoring mode: {mode}")
+    if chain is None:
+        chain = get_scoring_chain(mode)
+
+    return LLMScorer(chain) if mode == "llm" else HybridScorer(chain)
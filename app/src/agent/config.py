@@ -1,6 +1,7 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Literal
 from loguru import logger
 
 
@@ -35,12 +36,60 @@ class Settings(BaseSettings):
         description="Project name for tracing",
         alias="langsmith_project"
     )
+    PROMPT_CACHE_DIR: str = Field(
+        default=str(Path(__file__).resolve().parents[2] / "data" / "prompts"),
+        description="Directory of the local cache of LangSmith prompts",
+        alias="prompt_cache_dir"
+    )
+    PROMPT_CACHE_TTL: float = Field(
+        default=3600.0,
+        description="Seconds before a cached prompt is checked against LangSmith again",
+        alias="prompt_cache_ttl"
+    )
+    PROMPT_REFRESH_ENABLED: bool = Field(
+        default=True,
+        description="Refresh cached prompts from LangSmith in the background",
+        alias="prompt_refresh_enabled"
+    )
 
     # --- Groq Configuration ---
     GROQ_API_KEY: str = Field(
         description="API key for Groq services", 
         alias="groq_api_key"
     )
+    GROQ_REQUESTS_PER_MINUTE: int = Field(
+        default=30,
+        description="Groq requests per minute shared by all processes",
+        alias="groq_requests_per_minute"
+    )
+    GROQ_TOKENS_PER_MINUTE: int = Field(
+        default=6000,
+        description="Groq tokens per minute shared by all processes",
+        alias="groq_tokens_per_minute"
+    )
+    GROQ_COMPLETION_TOKENS_ESTIMATE: int = Field(
+        default=512,
+        description="Completion tokens reserved per request by the rate limiter",
+        alias="groq_completion_tokens_estimate"
+    )
+    GROQ_RETRY_ATTEMPTS: int = Field(
+        default=3,
+        ge=0,
+        description="Retries of an LLM scoring batch failing with a rate limit, server or connection error",
+        alias="groq_retry_attempts"
+    )
+    GROQ_RETRY_BASE_DELAY: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds of the first retry backoff, doubled on each retry (with full jitter)",
+        alias="groq_retry_base_delay"
+    )
+    GROQ_RETRY_MAX_DELAY: float = Field(
+        default=60.0,
+        gt=0,
+        description="Longest wait before a retry; a batch asked to wait longer (retry-after) is not retried",
+        alias="groq_retry_max_delay"
+    )
 
     # --- MongoDB Atlas Configuration ---
     MONGODB_DATABASE_NAME: str = Field(
@@ -53,6 +102,26 @@ class Settings(BaseSettings):
         description="Connection URI for MongoDB Atlas", 
         alias="mongodb_uri"
     )
+    MONGODB_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description="Maximum connections in the per-process MongoDB pool",
+        alias="mongodb_max_pool_size"
+    )
+    MONGODB_MIN_POOL_SIZE: int = Field(
+        default=0,
+        description="Connections kept open in the per-process MongoDB pool",
+        alias="mongodb_min_pool_size"
+    )
+    MONGODB_MAX_IDLE_TIME_MS: int = Field(
+        default=300000,
+        description="Milliseconds an idle pooled connection is kept",
+        alias="mongodb_max_idle_time_ms"
+    )
+    MONGODB_HEALTH_CHECK_INTERVAL: float = Field(
+        default=30.0,
+        description="Seconds between pings of the shared MongoDB client",
+        alias="mongodb_health_check_interval"
+    )
 
     # --- Redis Configuration ---
     REDIS_HOST: str = Field(
@@ -71,6 +140,174 @@ class Settings(BaseSettings):
         description="Full Redis URL",
         alias="redis_url"
     )
+    JOB_RESULT_TTL: int = Field(
+        default=86400,
+        description="Seconds the status and result of a match job are kept",
+        alias="job_result_ttl"
+    )
+    JOB_COMPRESS_MIN_BYTES: int = Field(
+        default=4096,
+        description="Job payloads and results at least this large are zlib compressed",
+        alias="job_compress_min_bytes"
+    )
+    JOB_CHECKPOINTS_ENABLED: bool = Field(
+        default=True,
+        description="Checkpoint match jobs in Redis after every graph step, so a retried job resumes where it stopped",
+        alias="job_checkpoints_enabled"
+    )
+    JOB_MAX_RETRIES: int = Field(
+        default=2,
+        ge=0,
+        description="Times a failed or abandoned match job is queued again",
+        alias="job_max_retries"
+    )
+
+    # --- Vector Index Configuration ---
+    VECTOR_INDEX_PATH: str = Field(
+        default=str(Path(__file__).resolve().parents[2] / "data" / "vector_index.npz"),
+        description="Path of the persisted profile vector index",
+        alias="vector_index_path"
+    )
+    VECTOR_INDEX_DIM: int = Field(
+        default=1024,
+        description="Number of hash buckets used to vectorize profiles",
+        alias="vector_index_dim"
+    )
+    VECTOR_INDEX_NUM_TABLES: int = Field(
+        default=8,
+        description="Number of LSH hash tables",
+        alias="vector_index_num_tables"
+    )
+    VECTOR_INDEX_NUM_BITS: int = Field(
+        default=12,
+        description="Number of hyperplanes per LSH hash table",
+        alias="vector_index_num_bits"
+    )
+
+    # --- Matching Configuration ---
+    MATCH_PREFILTER_TOP_N: int = Field(
+        default=200,
+        description="Candidates pre-selected by the vector index for LLM scoring (0 disables)",
+        alias="match_prefilter_top_n"
+    )
+    MATCH_TOP_K: int = Field(
+        default=5,
+        description="Default number of matches returned per job",
+        alias="match_top_k"
+    )
+    MATCH_SCORING_MODE: Literal["llm", "heuristic", "hybrid"] = Field(
+        default="llm",
+        description="Default scoring mode: llm, heuristic or hybrid",
+        alias="match_scoring_mode"
+    )
+    MATCH_LLM_BATCH_SIZE: int = Field(
+        default=25,
+        ge=1,
+        description="Maximum profiles per LLM scoring batch",
+        alias="match_llm_batch_size"
+    )
+    MATCH_BATCH_TOKEN_BUDGET: int = Field(
+        default=3000,
+        ge=0,
+        description="Estimated prompt tokens of the profiles of an LLM scoring batch, which sizes the batches (0 disables)",
+        alias="match_batch_token_budget"
+    )
+    MATCH_LLM_RESCORE_ROUNDS: int = Field(
+        default=1,
+        ge=0,
+        description="Times the candidates the LLM left unscored or scored twice are sent again, in batches of their own",
+        alias="match_llm_rescore_rounds"
+    )
+    MATCH_IDEA_SUMMARY_WORDS: int = Field(
+        default=40,
+        ge=1,
+        description="Words of the idea summary stored at ingest and sent to the LLM instead of the idea",
+        alias="match_idea_summary_words"
+    )
+    MATCH_HEURISTIC_BATCH_SIZE: int = Field(
+        default=1000,
+        description="Profiles scored per batch in heuristic-only mode",
+        alias="match_heuristic_batch_size"
+    )
+    MATCH_MAX_IN_FLIGHT: int = Field(
+        default=4,
+        description="Maximum number of scoring batches sent to the LLM concurrently",
+        alias="match_max_in_flight"
+    )
+    MATCH_LEAN_FETCH: bool = Field(
+        default=True,
+        description="Load and validate only the scored fields of candidates; winners are reloaded in full",
+        alias="match_lean_fetch"
+    )
+
+    # --- Score Cache Configuration ---
+    MATCH_SCORE_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Reuse LLM scores of unchanged profile pairs across jobs",
+        alias="match_score_cache_enabled"
+    )
+    MATCH_SCORE_CACHE_TTL: int = Field(
+        default=7 * 24 * 3600,
+        description="Seconds a cached score stays in Redis after its last use",
+        alias="match_score_cache_ttl"
+    )
+    MATCH_SCORE_CACHE_MONGO: bool = Field(
+        default=False,
+        description="Also keep cached scores in the Mongo match_scores collection",
+        alias="match_score_cache_mongo"
+    )
+    MATCH_SCORE_CACHE_MONGO_TTL: int = Field(
+        default=30 * 24 * 3600,
+        description="Seconds a cached score stays in Mongo",
+        alias="match_score_cache_mongo_ttl"
+    )
+    MATCH_SCORE_CACHE_VERSION: str = Field(
+        default="1",
+        description="Bump to invalidate every cached score",
+        alias="match_score_cache_version"
+    )
+
+    # --- Ingestion Configuration ---
+    INGEST_BATCH_SIZE: int = Field(
+        default=500,
+        description="Profiles validated and inserted per batch by /ingest_users",
+        alias="ingest_batch_size"
+    )
+
+    # --- Worker Configuration ---
+    WORKER_MIN_PROCESSES: int = Field(
+        default=1,
+        ge=1,
+        description="Worker processes the match worker pool always keeps",
+        alias="worker_min_processes"
+    )
+    WORKER_MAX_PROCESSES: int = Field(
+        default=4,
+        ge=1,
+        description="Worker processes the match worker pool scales up to",
+        alias="worker_max_processes"
+    )
+    WORKER_JOB_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        description="Match jobs each worker process runs concurrently on its event loop (1 runs them one at a time)",
+        alias="worker_job_concurrency"
+    )
+    WORKER_SCALE_INTERVAL: float = Field(
+        default=5.0,
+        description="Seconds between scaling decisions of the match worker pool",
+        alias="worker_scale_interval"
+    )
+    WORKER_SCALE_UP_AGE: float = Field(
+        default=5.0,
+        description="Seconds the oldest queued match job waits before a worker is added",
+        alias="worker_scale_up_age"
+    )
+    WORKER_SCALE_DOWN_DELAY: float = Field(
+        default=60.0,
+        description="Seconds the match worker pool has spare workers before stopping one",
+        alias="worker_scale_down_delay"
+    )
 
     # --- CORS Configuration ---
     CORS_ORIGINS: str = Field(
@@ -5,8 +5,15 @@ from .prompts import Prompt
 from .gen_state import Gen_State
 from .interests_list import Interests_list
 from .fyp_data import Fyp_data
+from .fyp_scoring_view import Skills_view, Fyp_scoring_view
+from .match_constraints import Match_constraints
+from .match_stats import Match_stats
+from .match_dead_letter import Match_dead_letter
+from .match_score import Match_score
+from .match_result import Match_result
+from .top_k import Top_k
 from .match_state import Match_State
-from .connection_llm_output import Connection_llm_output
+from .ingestion_report import Ingestion_failure, Ingestion_report
 
 __all__ = [
     "Interest_info",
@@ -16,6 +23,15 @@ __all__ = [
     "Gen_State",
     "Interests_list",
     "Fyp_data",
+    "Skills_view",
+    "Fyp_scoring_view",
+    "Match_constraints",
+    "Match_stats",
+    "Match_dead_letter",
+    "Match_score",
+    "Match_result",
+    "Top_k",
     "Match_State",
-    "Connection_llm_output"
+    "Ingestion_failure",
+    "Ingestion_report"
 ]
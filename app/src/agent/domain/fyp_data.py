@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List
+from pydantic.json_schema import SkipJsonSchema
+from typing import List, Optional
 
 from .metadata import Metadata
 
@@ -15,6 +16,11 @@ class Fyp_data(BaseModel):
     )
     domain: str = Field(..., description="Domain of the project")
     idea: str = Field(..., description="Project idea")
+    # Left out of the schema given to the generation chains.
+    idea_summary: SkipJsonSchema[Optional[str]] = Field(
+        default=None,
+        description="Bounded summary of the idea sent to the LLM, set at ingest."
+    )
     tech_stack: List[str] = Field(
         description="Technical stack required for the project"
     )
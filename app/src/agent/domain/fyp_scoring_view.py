@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class Skills_view(BaseModel):
+    '''
+    Part of the student metadata read while scoring.
+    '''
+    skills: List[str] = Field(
+        ...,
+        description="List of technical skills of the student"
+    )
+
+
+class Fyp_scoring_view(BaseModel):
+    '''
+    Fields of fyp data read while scoring a candidate: smaller to load and
+    cheaper to validate than the full profile.
+    '''
+    id: str = Field(..., description="Student id.")
+    idea: str = Field(..., description="Project idea")
+    idea_summary: Optional[str] = Field(
+        default=None,
+        description="Bounded summary of the idea sent to the LLM, set at ingest."
+    )
+    tech_stack: List[str] = Field(
+        description="Technical stack required for the project"
+    )
+    interests: List[str] = Field(
+        description=(
+            "Interests of the student, i.e types of projects "
+            "they are interested in."
+        )
+    )
+    score: float = Field(0.0, description="Score given by the LLM.")
+    metadata: Skills_view = Field(..., description="Metadata of the student")
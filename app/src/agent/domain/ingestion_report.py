@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class Ingestion_failure(BaseModel):
+    '''
+    A record of a bulk ingestion that was not stored.
+    '''
+    index: int = Field(..., description="Position of the record in the request.")
+    id: Optional[str] = Field(
+        default=None,
+        description="Student id of the record, if it has one."
+    )
+    error: str = Field(..., description="Why the record was rejected.")
+
+
+class Ingestion_report(BaseModel):
+    '''
+    Outcome of a bulk ingestion.
+    '''
+    received: int = Field(0, description="Records read from the request.")
+    inserted: int = Field(0, description="Profiles of new students stored.")
+    updated: int = Field(0, description="Stored profiles replaced by a changed one.")
+    unchanged: int = Field(
+        0,
+        description="Resubmitted profiles identical to the stored one."
+    )
+    failed: List[Ingestion_failure] = Field(
+        default_factory=list,
+        description="Records that were not stored, in request order."
+    )
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional
+
+
+# Id of a stored profile: its Mongo `_id`, not the student id.
+Profile_id = Annotated[str, Field(pattern=r"^[0-9a-fA-F]{24}$")]
+
+
+class Match_constraints(BaseModel):
+    '''
+    Optional restrictions on which profiles are eligible as matches.
+    '''
+    same_year: bool = Field(
+        False,
+        description="Only match students from the query student's year."
+    )
+    departments: Optional[List[str]] = Field(
+        None,
+        description="Only match students from these departments."
+    )
+    min_skill_overlap: int = Field(
+        0,
+        ge=0,
+        description="Minimum number of skills shared with the query student."
+    )
+    exclude_ids: List[Profile_id] = Field(
+        default_factory=list,
+        description="Profile ids (Mongo `_id`) that must not be matched."
+    )
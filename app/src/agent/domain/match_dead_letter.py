@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class Match_dead_letter(BaseModel):
+    '''
+    LLM scoring batch of a match job that failed after all its retries.
+    Its candidates are left out of the result.
+    '''
+    candidate_ids: List[str] = Field(..., description="Ids of the candidates of the batch.")
+    error: str = Field(..., description="Last error of the batch.")
+    attempts: int = Field(..., description="Times the batch was sent to the LLM.")
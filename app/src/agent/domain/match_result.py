@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .fyp_data import Fyp_data
+
+
+class Match_result(BaseModel):
+    '''
+    Stored result of a match job, used to refresh it incrementally.
+    '''
+    id: str = Field(
+        ...,
+        description="Query profile id and a hash of everything the scores depend on."
+    )
+    query_id: str = Field(..., description="Id of the query profile.")
+    watermark: Optional[str] = Field(
+        default=None,
+        description="Highest profile _id covered by the result, None if none were fetched."
+    )
+    top: List[Fyp_data] = Field(
+        default_factory=list,
+        description="Best matches with their scores, best first."
+    )
+    updated_at: datetime = Field(..., description="When the result was stored.")
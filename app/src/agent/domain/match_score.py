@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class Match_score(BaseModel):
+    '''
+    Cached compatibility score of a (query, candidate) profile pair.
+    '''
+    id: str = Field(..., description="Score cache key.")
+    score: float = Field(..., description="Score given by the scorer.")
+    updated_at: datetime = Field(..., description="When the score was computed.")
@@ -4,8 +4,12 @@ from typing import List
 from langchain.schema.runnable import Runnable
 
 from .fyp_data import Fyp_data
+from .match_constraints import Match_constraints
+from .match_stats import Match_stats
+from .match_dead_letter import Match_dead_letter
+from .top_k import Profile, Top_k
 
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 class Match_State(BaseModel):
     '''
@@ -13,13 +17,72 @@ class Match_State(BaseModel):
     '''
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    all_data: List[Fyp_data] = Field(..., description="List fyp data")
+    all_data: List[Profile] = Field(..., description="List fyp data")
     query: Fyp_data = Field(..., description="Query input.")
     done: bool = Field(..., description="Indicator of all data procssed.")
-    offset: int = Field(0, description="Offset for pagination.")
-    limit: int = Field(20, description="Limit for pagination.")
-    results: dict = Field(
-        description="Dictionary of results with student id as key and score as value."
-    ) 
+    job_id: Optional[str] = Field(
+        default=None,
+        description="Id of the background job, used to publish progress."
+    )
+    offset: int = Field(0, description="Number of profiles fetched so far.")
+    total: Optional[int] = Field(
+        default=None,
+        description="Number of profiles the job will score, None until counted."
+    )
+    last_id: Optional[str] = Field(
+        default=None,
+        description="Id of the last fetched profile, used for keyset pagination."
+    )
+    incremental: bool = Field(
+        False,
+        description="Only score profiles added since the stored result of this query."
+    )
+    watermark: Optional[str] = Field(
+        default=None,
+        description="Highest profile _id covered by the stored result being refreshed."
+    )
+    limit: int = Field(20, description="Maximum number of profiles scored per batch.")
+    batch_token_budget: int = Field(
+        0,
+        ge=0,
+        description="Estimated prompt tokens per LLM batch, adapted to the LLM's answers (0: `limit` only)."
+    )
+    max_in_flight: int = Field(
+        1,
+        ge=1,
+        description="Maximum number of batches scored concurrently."
+    )
+    results: Top_k = Field(
+        default_factory=Top_k,
+        description="Best matches scored so far; its k is the number of matches returned."
+    )
+    prefilter_top_n: int = Field(
+        0,
+        description="Number of candidates to pre-select with the vector index (0 disables)."
+    )
+    constraints: Optional[Match_constraints] = Field(
+        default=None,
+        description="Restrictions on which profiles are eligible as matches."
+    )
+    candidate_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Ids pre-selected by the vector index, None if not pre-filtered."
+    )
+    scoring_mode: Literal["llm", "heuristic", "hybrid"] = Field(
+        "llm",
+        description="How candidates are scored: LLM only, heuristics only, or both."
+    )
+    stats: Match_stats = Field(
+        default_factory=Match_stats,
+        description="Cache and LLM usage counters of the job."
+    )
+    dead_letters: List[Match_dead_letter] = Field(
+        default_factory=list,
+        description="LLM batches that failed after all retries; their candidates are not scored."
+    )
     # chain: Runnable = Field(..., description="The connection finding chain.")
-    chain: Optional[Any] = Field(default=None, exclude=True, description="The connection finding chain.")
+    chain: Optional[Any] = Field(
+        default=None,
+        exclude=True,
+        description="Chain overriding the worker's shared chain of the scoring mode."
+    )
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, computed_field
+
+
+class Match_stats(BaseModel):
+    '''
+    Counters of a match job, reported with its result.
+    '''
+    cache_hits: int = Field(0, description="Candidate scores served from the score cache.")
+    cache_misses: int = Field(0, description="Candidate scores not found in the score cache.")
+    llm_calls: int = Field(0, description="Scoring batches sent to the LLM.")
+    llm_calls_saved: int = Field(
+        0,
+        description="Scoring batches the score cache avoided sending to the LLM."
+    )
+    llm_missing_scores: int = Field(
+        0,
+        description="Candidates sent to the LLM that it returned no score for."
+    )
+    llm_retries: int = Field(
+        0,
+        description="Scoring batches sent to the LLM again after a rate limit, server or connection error."
+    )
+    llm_failed_batches: int = Field(
+        0,
+        description="Scoring batches that still failed after their retries (see the job's dead letters)."
+    )
+    llm_rescored: int = Field(
+        0,
+        description="Candidates sent to the LLM again, in batches of their own, after it left them unscored."
+    )
+
+    @computed_field(description="Share of cache lookups that were hits.")
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return round(self.cache_hits / lookups, 3) if lookups else 0.0
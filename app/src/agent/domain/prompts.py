@@ -154,22 +154,56 @@ INPUT DATA:
 {input}
 
 INSTRUCTIONS:
-1. Identify the query profile (first in the list).
+1. Identify the query profile (first in the list, id 0). Candidates are numbered from 1.
 2. Score each remaining profile against the query using the 5 criteria.
 3. Calculate the total score (sum of all 5 criteria).
-4. Return the result as a SINGLE JSON OBJECT where:
-   - Each **key** is the profile_id as a string EXACTLY as it appears in the input.
-   - Each **value** is the score (a float).
-5. The JSON object MUST NOT contain any other fields, arrays, or nested structures.
-6. DO NOT return:
-   - Arrays of IDs
-   - Arrays of scores
-   - Any text outside the JSON object
-7. All scores should be between 0.5 and 3.0.
+4. Return exactly one [id, score] pair for each candidate, with the integer id of the candidate in the input.
+5. All scores should be between 0.5 and 3.0.
+
+OUTPUT FORMAT: {format_instructions}
+
+CRITICAL:
+- Every candidate must be scored exactly once; do not score the query profile.
+- No explanations, no markdown, no extra text — only the JSON object.
+"""
+
+SCORE_OUTPUT_FORMAT = """\
+A JSON object with a single key "s": a list of [id, score] pairs, e.g. {"s": [[1, 2.5], [2, 0.8], [3, 1.9]]}.\
+"""
+
+PARTIAL_CONNECTION_FINDING_SYSTEM_PROMPT = """\
+You are a student matching system that scores compatibility between student profiles for Final Year Projects (FYP).
+
+TASK:
+- For each candidate profile, score against the query profile using 2 fixed criteria.
+- Each criterion is scored between 0.0 and 1.0 with exactly one decimal place.
+- The FINAL SCORE is the sum of both criteria (maximum 2.0, minimum 0.0).
+- Interest and skill overlap are scored separately; do not score them here.
+
+SCORING CRITERIA:
+1. IDEA_SIMILARITY (0.0–1.0): 0.0 = completely unrelated, 0.5 = somewhat similar, 1.0 = identical idea.
+2. OVERALL_COMPATIBILITY (0.0–1.0): 0.0 = poor fit, 0.5 = moderate fit, 1.0 = excellent fit.
+
+MISSING DATA RULES:
+- If `idea` is missing: IDEA_SIMILARITY = 0.0
+- OVERALL_COMPATIBILITY must still be scored using available context.
+"""
+
+PARTIAL_CONNECTION_FINDING_USER_PROMPT = """\
+QUERY PROFILE: The student looking for matches
+CANDIDATE PROFILES: Students to be scored against the query
+
+INPUT DATA:
+{input}
+
+INSTRUCTIONS:
+1. Identify the query profile (first in the list, id 0). Candidates are numbered from 1.
+2. Score each remaining profile against the query using the 2 criteria.
+3. Calculate the total score (sum of both criteria).
+4. Return exactly one [id, score] pair for each candidate, with the integer id of the candidate in the input.
 
 OUTPUT FORMAT: {format_instructions}
 
 CRITICAL:
-- Output must match the VALID OUTPUT EXAMPLE exactly in structure.
 - No explanations, no markdown, no extra text — only the JSON object.
 """
@@ -0,0 +1,83 @@
+import heapq
+from typing import List, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+from .fyp_data import Fyp_data
+from .fyp_scoring_view import Fyp_scoring_view
+
+
+# Candidates are scored from their scoring view when fetched lean.
+Profile = Union[Fyp_data, Fyp_scoring_view]
+
+
+class Top_k(BaseModel):
+    '''
+    The k best scored profiles seen so far.
+
+    Profiles are kept in a min-heap ordered by (score, id), so the weakest
+    match is replaced in O(log k) and memory stays O(k) however many
+    candidates are scored.
+    '''
+    k: int = Field(5, ge=1, description="Number of matches to keep.")
+    heap: List[Tuple[float, str, Profile]] = Field(
+        default_factory=list,
+        description="Min-heap of (score, id, profile with score set)."
+    )
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, data: Profile, score: float) -> None:
+        '''
+        Offer a scored profile; a profile already kept is rescored.
+        '''
+        entry = (score, data.id)
+
+        for i, (_, id, _) in enumerate(self.heap):
+            if id == data.id:
+                self.heap[i] = (*entry, data.model_copy(update={"score": score}))
+                heapq.heapify(self.heap)
+                return
+
+        if len(self.heap) < self.k:
+            heapq.heappush(
+                self.heap, (*entry, data.model_copy(update={"score": score}))
+            )
+        elif entry > self.heap[0][:2]:
+            heapq.heapreplace(
+                self.heap, (*entry, data.model_copy(update={"score": score}))
+            )
+
+    def push_many(self, profiles: List[Profile], scores: dict) -> None:
+        '''
+        Offer every profile that has a score in `scores` (id -> score).
+        '''
+        kept = set(self.scores())
+        for data in profiles:
+            score = scores.get(data.id)
+            if score is None:
+                continue
+            # Most candidates lose to the weakest kept match: skip them
+            # without scanning the heap.
+            if (
+                len(self.heap) >= self.k
+                and (score, data.id) <= self.heap[0][:2]
+                and data.id not in kept
+            ):
+                continue
+
+            self.push(data, score)
+            kept = set(self.scores())
+
+    def scores(self) -> dict:
+        '''
+        Scores of the kept profiles by id.
+        '''
+        return {id: score for score, id, _ in self.heap}
+
+    def best(self) -> List[Profile]:
+        '''
+        Kept profiles, best first.
+        '''
+        return [data for _, _, data in sorted(self.heap, reverse=True)]
@@ -1,3 +1,32 @@
+from .client import (
+    get_mongo_client,
+    close_mongo_clients,
+    get_async_mongo_client,
+    close_async_mongo_clients,
+)
+from .documents import KeyedUpsertPlan, parse_documents, keyset_filter
 from .service import MongoDBService
+from .async_service import AsyncMongoDBService
+from .filters import SCORING_PROJECTION, build_candidate_filter
+from .indexes import (
+    STD_PROFILES_INDEXES,
+    STD_PROFILES_UNIQUE_INDEXES,
+    MATCH_SCORES_INDEXES,
+)
 
-__all__ = ["MongoDBService"]
+__all__ = [
+    "get_mongo_client",
+    "close_mongo_clients",
+    "get_async_mongo_client",
+    "close_async_mongo_clients",
+    "KeyedUpsertPlan",
+    "parse_documents",
+    "keyset_filter",
+    "MongoDBService",
+    "AsyncMongoDBService",
+    "SCORING_PROJECTION",
+    "build_candidate_filter",
+    "STD_PROFILES_INDEXES",
+    "STD_PROFILES_UNIQUE_INDEXES",
+    "MATCH_SCORES_INDEXES"
+]
@@ -0,0 +1,356 @@
+from typing import Generic, Type, TypeVar
+
+from loguru import logger
+from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel, errors
+
+from src.agent.config import settings
+from .client import get_async_mongo_client
+from .documents import (
+    KeyedUpsertPlan,
+    insert_payload,
+    keyset_filter,
+    parse_documents,
+    upsert_operations,
+)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class AsyncMongoDBService(Generic[T]):
+    """Asyncio counterpart of MongoDBService, built on PyMongo's AsyncMongoClient.
+
+    Offers the same operations as MongoDBService as coroutines, so async
+    routes and graph nodes do not block the event loop. Use it as an async
+    context manager: the shared client of the running event loop is
+    borrowed (and health checked) on enter.
+
+    Args:
+        model: The Pydantic model class to use for document serialization.
+        collection_name: Name of the MongoDB collection to use.
+        database_name: Name of the MongoDB database to use.
+        mongodb_uri: URI for connecting to MongoDB instance.
+
+    Attributes:
+        model: The Pydantic model class used for document serialization.
+        collection_name: Name of the MongoDB collection.
+        database_name: Name of the MongoDB database.
+        mongodb_uri: MongoDB connection URI.
+        client: Shared async MongoDB client of the running event loop.
+        database: Reference to the target MongoDB database.
+        collection: Reference to the target MongoDB collection.
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        collection_name: str,
+        database_name: str = settings.MONGODB_DATABASE_NAME,
+        mongodb_uri: str = settings.MONGODB_URI,
+    ) -> None:
+        self.model = model
+        self.collection_name = collection_name
+        self.database_name = database_name
+        self.mongodb_uri = mongodb_uri
+
+        self.client = None
+        self.database = None
+        self.collection = None
+
+    async def __aenter__(self) -> "AsyncMongoDBService":
+        """Borrow the event loop's client.
+
+        Returns:
+            AsyncMongoDBService: The current instance.
+
+        Raises:
+            Exception: If connection to MongoDB fails.
+        """
+
+        try:
+            self.client = await get_async_mongo_client(self.mongodb_uri)
+        except Exception as e:
+            logger.error(f"Failed to initialize AsyncMongoDBService: {e}")
+            raise
+
+        self.database = self.client[self.database_name]
+        self.collection = self.database[self.collection_name]
+        logger.debug(
+            f"Using MongoDB collection:\n Database: {self.database_name}\n Collection: {self.collection_name}"
+        )
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Release the client when exiting context; it stays open for reuse."""
+
+        logger.debug("Released async MongoDB client.")
+
+    async def clear_collection(self) -> None:
+        """Remove all documents from the collection.
+
+        Raises:
+            errors.PyMongoError: If the deletion operation fails.
+        """
+
+        try:
+            result = await self.collection.delete_many({})
+            logger.debug(
+                f"Cleared collection. Deleted {result.deleted_count} documents."
+            )
+        except errors.PyMongoError as e:
+            logger.error(f"Error clearing the collection: {e}")
+            raise
+
+    async def ingest_documents(self, documents: list[T]) -> list[str]:
+        """Insert multiple documents into the MongoDB collection.
+
+        Args:
+            documents: List of Pydantic model instances to insert.
+
+        Returns:
+            The `_id` of each inserted document as a string, in input order.
+
+        Raises:
+            ValueError: If documents is empty or contains non-Pydantic model items.
+            errors.PyMongoError: If the insertion operation fails.
+        """
+
+        try:
+            dict_documents = insert_payload(documents)
+
+            result = await self.collection.insert_many(dict_documents)
+            logger.debug(f"Inserted {len(documents)} documents into MongoDB.")
+
+            return [str(_id) for _id in result.inserted_ids]
+        except errors.PyMongoError as e:
+            logger.error(f"Error inserting documents: {e}")
+            raise
+
+    async def upsert_documents(self, documents: list[T]) -> int:
+        """Insert or replace documents, using each model's `id` as `_id`.
+
+        Args:
+            documents: List of Pydantic model instances to write.
+
+        Returns:
+            Number of documents inserted or modified.
+
+        Raises:
+            ValueError: If documents contains non-Pydantic model items.
+            errors.PyMongoError: If the write operation fails.
+        """
+
+        try:
+            operations = upsert_operations(documents)
+            if not operations:
+                return 0
+
+            result = await self.collection.bulk_write(operations, ordered=False)
+            written = result.upserted_count + result.modified_count
+            logger.debug(f"Upserted {written} documents into MongoDB.")
+
+            return written
+        except errors.PyMongoError as e:
+            logger.error(f"Error upserting documents: {e}")
+            raise
+
+    async def upsert_documents_by_key(
+        self,
+        documents: list[T],
+        key: str
+    ) -> KeyedUpsertPlan:
+        """Insert or update documents identified by a field, e.g. a student id.
+
+        Documents identical to their stored copy are not written. A unique
+        index on `key` should back this, so concurrent writers cannot
+        create duplicates.
+
+        Args:
+            documents: List of Pydantic model instances to write.
+            key: Dotted field identifying a document, e.g. "metadata.id".
+
+        Returns:
+            The plan, with the `_id` and status ("inserted", "updated",
+            "unchanged" or "failed") of each document, and the error of each
+            failed one.
+
+        Raises:
+            ValueError: If documents contains non-Pydantic model items.
+            errors.PyMongoError: If the write fails for another reason than
+                individual write errors.
+        """
+
+        plan = KeyedUpsertPlan(documents, key)
+
+        try:
+            existing = await self.collection.find(
+                {key: {"$in": plan.keys}},
+                {key: 1, "document_hash": 1}
+            ).to_list()
+            operations = plan.plan(existing)
+            if not operations:
+                return plan
+
+            try:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                plan.apply_result(result.upserted_ids, [])
+            except errors.BulkWriteError as e:
+                plan.apply_result(
+                    {u["index"]: u["_id"] for u in e.details.get("upserted", [])},
+                    e.details.get("writeErrors", [])
+                )
+                logger.warning(f"{len(plan.failed)} documents could not be upserted.")
+
+            logger.debug(
+                f"Upserted {len(operations)} documents by {key} into MongoDB."
+            )
+            return plan
+        except errors.PyMongoError as e:
+            logger.error(f"Error upserting documents: {e}")
+            raise
+
+    async def fetch_documents(
+        self,
+        limit: int,
+        offset: int = 0,
+        query: dict = {},
+        projection: dict | None = None
+    ) -> list[T]:
+        """Retrieve documents from the MongoDB collection based on a query.
+
+        Args:
+            limit: Maximum number of documents to retrieve.
+            offset: Number of documents to skip for pagination (default: 0).
+            query: MongoDB query filter to apply (default: empty dict).
+            projection: Fields to load (default: the whole document). The
+                service's model must accept the projected documents.
+
+        Returns:
+            List of Pydantic model instances matching the query criteria.
+
+        Raises:
+            Exception: If the query operation fails.
+        """
+
+        try:
+            documents = await (
+                self.collection.find(query, projection)
+                .skip(offset)
+                .limit(limit)
+                .to_list()
+            )
+            logger.debug(
+                f"Fetched {len(documents)} documents with query: {query}, "
+                f"offset: {offset}, limit: {limit}"
+            )
+            return parse_documents(self.model, documents)
+        except Exception as e:
+            logger.error(f"Error fetching documents: {e}")
+            raise
+
+    async def fetch_documents_after(
+        self,
+        limit: int,
+        last_id: str | None = None,
+        query: dict = {},
+        projection: dict | None = None
+    ) -> list[T]:
+        """Retrieve the next page of documents using keyset pagination.
+
+        See `MongoDBService.fetch_documents_after`.
+
+        Args:
+            limit: Maximum number of documents to retrieve.
+            last_id: `_id` (as string) of the last document of the previous
+                page, or None for the first page.
+            query: MongoDB query filter to apply (default: empty dict).
+            projection: Fields to load (default: the whole document). The
+                service's model must accept the projected documents.
+
+        Returns:
+            List of Pydantic model instances; pass the `id` of the last one
+            as `last_id` to get the following page.
+
+        Raises:
+            Exception: If the query operation fails.
+        """
+
+        try:
+            query = keyset_filter(query, last_id)
+
+            documents = await (
+                self.collection.find(query, projection)
+                .sort("_id", ASCENDING)
+                .limit(limit)
+                .to_list()
+            )
+            logger.debug(
+                f"Fetched {len(documents)} documents with query: {query}, "
+                f"last_id: {last_id}, limit: {limit}"
+            )
+            return parse_documents(self.model, documents)
+        except Exception as e:
+            logger.error(f"Error fetching documents: {e}")
+            raise
+
+    async def delete_documents(self, query: dict) -> int:
+        """Delete the documents matching a query.
+
+        Args:
+            query: MongoDB query filter selecting the documents to delete.
+
+        Returns:
+            Number of deleted documents.
+
+        Raises:
+            errors.PyMongoError: If the deletion fails.
+        """
+
+        try:
+            result = await self.collection.delete_many(query)
+            logger.debug(f"Deleted {result.deleted_count} documents.")
+            return result.deleted_count
+        except errors.PyMongoError as e:
+            logger.error(f"Error deleting documents: {e}")
+            raise
+
+    async def create_indexes(self, indexes: list[IndexModel]) -> list[str]:
+        """Create indexes on the collection if they do not exist yet.
+
+        Args:
+            indexes: Index definitions to create.
+
+        Returns:
+            Names of the created (or already existing) indexes.
+
+        Raises:
+            errors.PyMongoError: If index creation fails.
+        """
+
+        try:
+            names = await self.collection.create_indexes(indexes)
+            logger.debug(f"Ensured indexes on {self.collection_name}: {names}")
+            return names
+        except errors.PyMongoError as e:
+            logger.error(f"Error creating indexes: {e}")
+            raise
+
+    async def get_collection_count(self, query: dict = {}) -> int:
+        """Count the documents in the collection, optionally matching a query.
+
+        Args:
+            query: MongoDB query filter to apply (default: empty dict).
+
+        Returns:
+            Number of documents matching the query.
+
+        Raises:
+            errors.PyMongoError: If the count operation fails.
+        """
+
+        try:
+            return await self.collection.count_documents(query)
+        except errors.PyMongoError as e:
+            logger.error(f"Error counting documents in MongoDB: {e}")
+            raise
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+
+from loguru import logger
+from pymongo import AsyncMongoClient
+from pymongo.mongo_client import MongoClient
+
+from src.agent.config import settings
+
+
+_clients: dict[str, MongoClient] = {}
+_last_ping: dict[str, float] = {}
+
+# Async clients are bound to the event loop they were created on.
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, AsyncMongoClient]
+] = weakref.WeakKeyDictionary()
+_async_last_ping: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, float]
+] = weakref.WeakKeyDictionary()
+_pid = os.getpid()
+_lock = threading.Lock()
+
+
+def _forget_clients() -> None:
+    """Drop the clients inherited from the parent process.
+
+    Sockets and monitor threads of a MongoClient must not be shared with a
+    forked child, so the child creates its own clients. The inherited ones
+    are not closed: they still belong to the parent.
+    """
+
+    global _pid, _lock
+
+    _clients.clear()
+    _last_ping.clear()
+    _async_clients.clear()
+    _async_last_ping.clear()
+    _pid = os.getpid()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_clients)
+
+
+def _health_check_due(last_ping: float | None) -> bool:
+    return (
+        last_ping is None
+        or time.monotonic() - last_ping >= settings.MONGODB_HEALTH_CHECK_INTERVAL
+    )
+
+
+def get_mongo_client(mongodb_uri: str = settings.MONGODB_URI) -> MongoClient:
+    """Return the process-wide MongoClient for a URI, creating it on first use.
+
+    The client, and its connection pool, is shared by every MongoDBService
+    in the process. The server is pinged when the client is created and
+    again only if the last successful ping is older than
+    MONGODB_HEALTH_CHECK_INTERVAL seconds.
+
+    Args:
+        mongodb_uri: URI for connecting to MongoDB instance.
+
+    Returns:
+        The shared MongoClient.
+
+    Raises:
+        Exception: If the client cannot be created or the server does not
+            answer the health check.
+    """
+
+    if os.getpid() != _pid:
+        # Safety net in case the at-fork hook did not run.
+        _forget_clients()
+
+    with _lock:
+        client = _clients.get(mongodb_uri)
+        if client is None:
+            client = MongoClient(
+                mongodb_uri,
+                appname="FYP_Buddy",
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            )
+            _clients[mongodb_uri] = client
+            logger.debug(f"Created MongoDB client (pid {_pid}).")
+
+    if _health_check_due(_last_ping.get(mongodb_uri)):
+        client.admin.command("ping")
+        _last_ping[mongodb_uri] = time.monotonic()
+
+    return client
+
+
+def close_mongo_clients() -> None:
+    """Close every synchronous client of this process, e.g. on shutdown."""
+
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _last_ping.clear()
+
+    logger.debug("Closed MongoDB clients.")
+
+
+async def get_async_mongo_client(
+    mongodb_uri: str = settings.MONGODB_URI
+) -> AsyncMongoClient:
+    """Return the AsyncMongoClient of the running event loop for a URI.
+
+    Async clients cannot be shared between event loops, so there is one per
+    loop (and URI), created on first use and health checked like
+    `get_mongo_client`.
+
+    Args:
+        mongodb_uri: URI for connecting to MongoDB instance.
+
+    Returns:
+        The shared AsyncMongoClient of the running loop.
+
+    Raises:
+        Exception: If the client cannot be created or the server does not
+            answer the health check.
+    """
+
+    if os.getpid() != _pid:
+        _forget_clients()
+
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+
+    client = clients.get(mongodb_uri)
+    if client is None:
+        client = AsyncMongoClient(
+            mongodb_uri,
+            appname="FYP_Buddy",
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+        )
+        clients[mongodb_uri] = client
+        logger.debug(f"Created async MongoDB client (pid {_pid}).")
+
+    last_ping = _async_last_ping.setdefault(loop, {})
+    if _health_check_due(last_ping.get(mongodb_uri)):
+        await client.admin.command("ping")
+        last_ping[mongodb_uri] = time.monotonic()
+
+    return client
+
+
+async def close_async_mongo_clients() -> None:
+    """Close the async clients of the running event loop.
+
+    Call this before the loop is closed, e.g. at the end of `asyncio.run`
+    or on application shutdown.
+    """
+
+    loop = asyncio.get_running_loop()
+    _async_last_ping.pop(loop, None)
+    for client in _async_clients.pop(loop, {}).values():
+        await client.close()
+
+    logger.debug("Closed async MongoDB clients.")
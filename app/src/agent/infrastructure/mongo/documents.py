@@ -0,0 +1,229 @@
+import hashlib
+import json
+from typing import Type, TypeVar
+
+from bson.objectid import ObjectId
+from pydantic import BaseModel
+from pymongo import ReplaceOne, UpdateOne
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def parse_documents(model: Type[T], documents: list[dict]) -> list[T]:
+    """Convert MongoDB documents to Pydantic model instances.
+
+    Converts MongoDB ObjectId fields to strings and transforms the document structure
+    to match the Pydantic model schema.
+
+    Args:
+        model: The Pydantic model class to validate documents with.
+        documents: List of MongoDB documents to parse.
+
+    Returns:
+        List of validated Pydantic model instances.
+    """
+
+    parsed_documents = []
+    for doc in documents:
+        for key, value in doc.items():
+            if isinstance(value, ObjectId):
+                doc[key] = str(value)
+
+        _id = doc.pop("_id", None)
+        doc["id"] = _id
+
+        parsed_doc = model.model_validate(doc)
+        parsed_documents.append(parsed_doc)
+
+    return parsed_documents
+
+
+def insert_payload(documents: list[BaseModel]) -> list[dict]:
+    """Convert Pydantic model instances to documents for `insert_many`.
+
+    Args:
+        documents: List of Pydantic model instances to insert.
+
+    Returns:
+        List of documents without `_id`, so MongoDB assigns one.
+
+    Raises:
+        ValueError: If documents is empty or contains non-Pydantic model items.
+    """
+
+    if not documents or not all(
+        isinstance(doc, BaseModel) for doc in documents
+    ):
+        raise ValueError("Documents must be a list of Pydantic models.")
+
+    dict_documents = [doc.model_dump() for doc in documents]
+
+    # Remove '_id' fields to avoid duplicate key errors
+    for doc in dict_documents:
+        doc.pop("_id", None)
+
+    return dict_documents
+
+
+def upsert_operations(documents: list[BaseModel]) -> list[ReplaceOne]:
+    """Build `bulk_write` operations replacing each document by its `id`.
+
+    Args:
+        documents: List of Pydantic model instances to write.
+
+    Returns:
+        One upserting ReplaceOne per document, with the model's `id` as `_id`.
+
+    Raises:
+        ValueError: If documents contains non-Pydantic model items.
+    """
+
+    if not all(isinstance(doc, BaseModel) for doc in documents):
+        raise ValueError("Documents must be a list of Pydantic models.")
+
+    operations = []
+    for doc in documents:
+        dict_document = doc.model_dump()
+        _id = dict_document.pop("id")
+        operations.append(ReplaceOne({"_id": _id}, dict_document, upsert=True))
+
+    return operations
+
+
+def keyset_filter(query: dict, last_id: str | None) -> dict:
+    """Restrict a query to the documents after `last_id` in `_id` order.
+
+    Args:
+        query: MongoDB query filter to restrict.
+        last_id: `_id` (as string) of the last document already read, or
+            None to keep the query unchanged.
+
+    Returns:
+        The restricted query.
+    """
+
+    if last_id is None:
+        return query
+
+    range_filter = {"_id": {"$gt": ObjectId(last_id)}}
+    return {"$and": [query, range_filter]} if query else range_filter
+
+
+def key_value(document: dict, key: str):
+    """Value of a dotted `key` (e.g. "metadata.id") in a document."""
+
+    for part in key.split("."):
+        if not isinstance(document, dict):
+            return None
+        document = document.get(part)
+    return document
+
+
+def document_hash(document: dict) -> str:
+    """Hash of a document's content, independent of key order."""
+
+    content = json.dumps(document, sort_keys=True, default=str)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+class KeyedUpsertPlan:
+    """Writes needed to upsert documents keyed by a field, and their outcome.
+
+    Documents whose stored copy has the same `document_hash` are left
+    untouched; when a key repeats, the last document wins.
+
+    Args:
+        documents: List of Pydantic model instances to write.
+        key: Dotted field identifying a document, e.g. "metadata.id".
+
+    Attributes:
+        keys: Distinct key values of the documents, to look up stored copies.
+        operations: UpdateOne upserts to send with `bulk_write`, set by `plan`.
+        ids: `_id` of each document as a string, None until known.
+        statuses: "inserted", "updated", "unchanged" or "failed" per document.
+        failed: Error message by document index.
+
+    Raises:
+        ValueError: If documents contains non-Pydantic model items.
+    """
+
+    def __init__(self, documents: list[BaseModel], key: str) -> None:
+        if not all(isinstance(doc, BaseModel) for doc in documents):
+            raise ValueError("Documents must be a list of Pydantic models.")
+
+        self.key = key
+        self.payloads = []
+        last = {}
+        for i, doc in enumerate(documents):
+            payload = doc.model_dump()
+            payload.pop("_id", None)
+            payload["document_hash"] = document_hash(payload)
+            self.payloads.append(payload)
+            last[key_value(payload, key)] = i
+
+        self.keys = [value for value in last if value is not None]
+        self.operations: list[UpdateOne] = []
+        self.ids: list[str | None] = [None] * len(documents)
+        self.statuses: list[str] = ["failed"] * len(documents)
+        self.failed: dict[int, str] = {}
+        self._last = last
+        self._positions: list[int] = []
+
+    def plan(self, existing: list[dict]) -> list[UpdateOne]:
+        """Compare the documents with their stored copies.
+
+        Args:
+            existing: Stored `{"_id", key, "document_hash"}` documents.
+
+        Returns:
+            The operations to send with `bulk_write(..., ordered=False)`.
+        """
+
+        stored = {key_value(doc, self.key): doc for doc in existing}
+
+        for i, payload in enumerate(self.payloads):
+            value = key_value(payload, self.key)
+            if value is None:
+                self.failed[i] = f"Missing {self.key}."
+                continue
+            if self._last[value] != i:
+                self.failed[i] = f"Superseded by a later document with the same {self.key}."
+                continue
+
+            current = stored.get(value)
+            if current is not None:
+                self.ids[i] = str(current["_id"])
+                if current.get("document_hash") == payload["document_hash"]:
+                    self.statuses[i] = "unchanged"
+                    continue
+                self.statuses[i] = "updated"
+            else:
+                self.statuses[i] = "inserted"
+
+            self.operations.append(
+                UpdateOne({self.key: value}, {"$set": payload}, upsert=True)
+            )
+            self._positions.append(i)
+
+        return self.operations
+
+    def apply_result(
+        self,
+        upserted_ids: dict[int, ObjectId],
+        write_errors: list[dict]
+    ) -> None:
+        """Record the outcome of the bulk write of `operations`.
+
+        Args:
+            upserted_ids: `_id` of each inserted document by operation index.
+            write_errors: Write errors of the bulk write, if any.
+        """
+
+        for index, _id in upserted_ids.items():
+            self.ids[self._positions[index]] = str(_id)
+
+        for error in write_errors:
+            i = self._positions[error["index"]]
+            self.ids[i] = None
+            self.statuses[i] = "failed"
+            self.failed[i] = error["errmsg"]
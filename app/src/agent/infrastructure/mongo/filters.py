@@ -0,0 +1,83 @@
+from bson.objectid import ObjectId
+
+from src.agent.domain.fyp_data import Fyp_data
+from src.agent.domain.match_constraints import Match_constraints
+
+
+# Fields of a candidate profile read while scoring: the connection finding
+# prompt input, the heuristic criteria and the score cache key.
+SCORING_PROJECTION = {
+    "idea": 1,
+    "idea_summary": 1,
+    "interests": 1,
+    "tech_stack": 1,
+    "metadata.skills": 1,
+}
+
+
+def object_ids(ids: list[str]) -> list[ObjectId]:
+    """Convert string ids to ObjectIds, dropping ids that are not valid ObjectIds.
+
+    Args:
+        ids: Profile ids as strings.
+
+    Returns:
+        List of ObjectIds.
+    """
+
+    return [ObjectId(i) for i in ids if ObjectId.is_valid(i)]
+
+
+def build_candidate_filter(
+    query: Fyp_data,
+    constraints: Match_constraints | None = None,
+    candidate_ids: list[str] | None = None,
+) -> dict:
+    """Build the MongoDB filter selecting the profiles eligible as matches.
+
+    Every constraint maps onto an indexed field (see `STD_PROFILES_INDEXES`),
+    so the server only walks eligible profiles instead of the whole
+    collection.
+
+    Args:
+        query: The profile looking for matches.
+        constraints: Optional restrictions on eligible profiles.
+        candidate_ids: Optional ids pre-selected by the vector index.
+
+    Returns:
+        MongoDB query filter (empty if there is nothing to restrict).
+    """
+
+    mongo_filter: dict = {}
+    id_filter: dict = {}
+
+    if candidate_ids is not None:
+        id_filter["$in"] = object_ids(candidate_ids)
+
+    if constraints is not None:
+        if constraints.exclude_ids:
+            id_filter["$nin"] = object_ids(constraints.exclude_ids)
+
+        if constraints.same_year:
+            mongo_filter["metadata.year"] = query.metadata.year
+
+        if constraints.departments:
+            mongo_filter["metadata.department"] = {"$in": constraints.departments}
+
+        if constraints.min_skill_overlap > 0:
+            skills = query.metadata.skills
+            # The $in on the multikey index narrows the scan to profiles with
+            # at least one shared skill; $expr then enforces the minimum.
+            mongo_filter["metadata.skills"] = {"$in": skills}
+            if constraints.min_skill_overlap > 1:
+                mongo_filter["$expr"] = {
+                    "$gte": [
+                        {"$size": {"$setIntersection": ["$metadata.skills", skills]}},
+                        constraints.min_skill_overlap,
+                    ]
+                }
+
+    if id_filter:
+        mongo_filter["_id"] = id_filter
+
+    return mongo_filter
@@ -0,0 +1,32 @@
+from pymongo import ASCENDING, IndexModel
+
+from src.agent.config import settings
+
+
+# Indexes backing the candidate filters built by `build_candidate_filter`.
+STD_PROFILES_INDEXES = [
+    IndexModel([("metadata.skills", ASCENDING)], name="metadata_skills"),
+    IndexModel([("interests", ASCENDING)], name="interests"),
+    IndexModel(
+        [("metadata.department", ASCENDING), ("metadata.year", ASCENDING)],
+        name="metadata_department_year",
+    ),
+]
+
+# Makes ingestion idempotent: one profile per student (see
+# `upsert_documents_by_key`). Kept apart so existing duplicates, which make
+# it fail, do not prevent the other indexes from being created.
+STD_PROFILES_UNIQUE_INDEXES = [
+    IndexModel(
+        [("metadata.id", ASCENDING)], name="metadata_id_unique", unique=True
+    ),
+]
+
+# Expires spilled score cache entries (see ScoreCache).
+MATCH_SCORES_INDEXES = [
+    IndexModel(
+        [("updated_at", ASCENDING)],
+        name="updated_at_ttl",
+        expireAfterSeconds=settings.MATCH_SCORE_CACHE_MONGO_TTL,
+    ),
+]
@@ -1,12 +1,17 @@
 from typing import Generic, Type, TypeVar
 
-from bson.objectid import ObjectId
 from loguru import logger
 from pydantic import BaseModel
-from pymongo.mongo_client import MongoClient
-from pymongo import errors
+from pymongo import ASCENDING, IndexModel, errors
 
 from src.agent.config import settings
+from .client import get_mongo_client
+from .documents import (
+    insert_payload,
+    keyset_filter,
+    parse_documents,
+    upsert_operations,
+)
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -28,7 +33,7 @@ class MongoDBService(Generic[T]):
         collection_name: Name of the MongoDB collection.
         database_name: Name of the MongoDB database.
         mongodb_uri: MongoDB connection URI.
-        client: MongoDB client instance for database connections.
+        client: Shared MongoDB client of this process.
         database: Reference to the target MongoDB database.
         collection: Reference to the target MongoDB collection.
     """
@@ -60,16 +65,16 @@ class MongoDBService(Generic[T]):
         self.mongodb_uri = mongodb_uri
 
         try:
-            self.client = MongoClient(mongodb_uri, appname="FYP_Buddy")
-            self.client.admin.command("ping")
+            # Borrow the process-wide client instead of connecting per service.
+            self.client = get_mongo_client(mongodb_uri)
         except Exception as e:
             logger.error(f"Failed to initialize MongoDBService: {e}")
             raise
 
         self.database = self.client[database_name]
         self.collection = self.database[collection_name]
-        logger.info(
-            f"Connected to MongoDB instance:\n URI: {mongodb_uri}\n Database: {database_name}\n Collection: {collection_name}"
+        logger.debug(
+            f"Using MongoDB collection:\n Database: {database_name}\n Collection: {collection_name}"
         )
 
     def __enter__(self) -> "MongoDBService":
@@ -82,7 +87,7 @@ class MongoDBService(Generic[T]):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Close MongoDB connection when exiting context.
+        """Release the MongoDB client when exiting context.
 
         Args:
             exc_type: Type of exception that occurred, if any.
@@ -111,40 +116,65 @@ class MongoDBService(Generic[T]):
             logger.error(f"Error clearing the collection: {e}")
             raise
 
-    def ingest_documents(self, documents: list[T]) -> None:
+    def ingest_documents(self, documents: list[T]) -> list[str]:
         """Insert multiple documents into the MongoDB collection.
 
         Args:
             documents: List of Pydantic model instances to insert.
 
+        Returns:
+            The `_id` of each inserted document as a string, in input order.
+
         Raises:
             ValueError: If documents is empty or contains non-Pydantic model items.
             errors.PyMongoError: If the insertion operation fails.
         """
 
         try:
-            if not documents or not all(
-                isinstance(doc, BaseModel) for doc in documents
-            ):
-                raise ValueError("Documents must be a list of Pydantic models.")
-
-            dict_documents = [doc.model_dump() for doc in documents]
-
-            # Remove '_id' fields to avoid duplicate key errors
-            for doc in dict_documents:
-                doc.pop("_id", None)
+            dict_documents = insert_payload(documents)
 
-            self.collection.insert_many(dict_documents)
+            result = self.collection.insert_many(dict_documents)
             logger.debug(f"Inserted {len(documents)} documents into MongoDB.")
+
+            return [str(_id) for _id in result.inserted_ids]
         except errors.PyMongoError as e:
             logger.error(f"Error inserting documents: {e}")
             raise
 
+    def upsert_documents(self, documents: list[T]) -> int:
+        """Insert or replace documents, using each model's `id` as `_id`.
+
+        Args:
+            documents: List of Pydantic model instances to write.
+
+        Returns:
+            Number of documents inserted or modified.
+
+        Raises:
+            ValueError: If documents contains non-Pydantic model items.
+            errors.PyMongoError: If the write operation fails.
+        """
+
+        try:
+            operations = upsert_operations(documents)
+            if not operations:
+                return 0
+
+            result = self.collection.bulk_write(operations, ordered=False)
+            written = result.upserted_count + result.modified_count
+            logger.debug(f"Upserted {written} documents into MongoDB.")
+
+            return written
+        except errors.PyMongoError as e:
+            logger.error(f"Error upserting documents: {e}")
+            raise
+
     def fetch_documents(
         self,
         limit: int,
         offset: int = 0,
-        query: dict = {}
+        query: dict = {},
+        projection: dict | None = None
     ) -> list[T]:
         """Retrieve documents from the MongoDB collection based on a query.
 
@@ -152,6 +182,8 @@ class MongoDBService(Generic[T]):
             limit: Maximum number of documents to retrieve.
             offset: Number of documents to skip for pagination (default: 0).
             query: MongoDB query filter to apply (default: empty dict).
+            projection: Fields to load (default: the whole document). The
+                service's model must accept the projected documents.
 
         Returns:
             List of Pydantic model instances matching the query criteria.
@@ -161,7 +193,7 @@ class MongoDBService(Generic[T]):
             """
         try:
             documents = list(
-                self.collection.find(query)
+                self.collection.find(query, projection)
                 .skip(offset)  # Skip the specified number of documents
                 .limit(limit)  # Limit the number of results
             )
@@ -169,59 +201,123 @@ class MongoDBService(Generic[T]):
                 f"Fetched {len(documents)} documents with query: {query}, "
                 f"offset: {offset}, limit: {limit}"
             )
-            return self.__parse_documents(documents)
+            return parse_documents(self.model, documents)
         except Exception as e:
             logger.error(f"Error fetching documents: {e}")
             raise
 
-    def __parse_documents(self, documents: list[dict]) -> list[T]:
-        """Convert MongoDB documents to Pydantic model instances.
+    def fetch_documents_after(
+        self,
+        limit: int,
+        last_id: str | None = None,
+        query: dict = {},
+        projection: dict | None = None
+    ) -> list[T]:
+        """Retrieve the next page of documents using keyset pagination.
 
-        Converts MongoDB ObjectId fields to strings and transforms the document structure
-        to match the Pydantic model schema.
+        Documents are returned in `_id` order, starting after `last_id`, so
+        every page is an indexed range query on `_id` no matter how deep the
+        scan is (unlike `skip`, whose cost grows with the offset).
 
         Args:
-            documents: List of MongoDB documents to parse.
+            limit: Maximum number of documents to retrieve.
+            last_id: `_id` (as string) of the last document of the previous
+                page, or None for the first page.
+            query: MongoDB query filter to apply (default: empty dict).
+            projection: Fields to load (default: the whole document). The
+                service's model must accept the projected documents.
 
         Returns:
-            List of validated Pydantic model instances.
+            List of Pydantic model instances; pass the `id` of the last one
+            as `last_id` to get the following page.
+
+        Raises:
+            Exception: If the query operation fails.
         """
-        parsed_documents = []
-        for doc in documents:
-            for key, value in doc.items():
-                if isinstance(value, ObjectId):
-                    doc[key] = str(value)
+        try:
+            query = keyset_filter(query, last_id)
 
-            _id = doc.pop("_id", None)
-            doc["id"] = _id
+            documents = list(
+                self.collection.find(query, projection)
+                .sort("_id", ASCENDING)
+                .limit(limit)
+            )
+            logger.debug(
+                f"Fetched {len(documents)} documents with query: {query}, "
+                f"last_id: {last_id}, limit: {limit}"
+            )
+            return parse_documents(self.model, documents)
+        except Exception as e:
+            logger.error(f"Error fetching documents: {e}")
+            raise
+
+    def delete_documents(self, query: dict) -> int:
+        """Delete the documents matching a query.
+
+        Args:
+            query: MongoDB query filter selecting the documents to delete.
+
+        Returns:
+            Number of deleted documents.
+
+        Raises:
+            errors.PyMongoError: If the deletion fails.
+        """
+
+        try:
+            result = self.collection.delete_many(query)
+            logger.debug(f"Deleted {result.deleted_count} documents.")
+            return result.deleted_count
+        except errors.PyMongoError as e:
+            logger.error(f"Error deleting documents: {e}")
+            raise
+
+    def create_indexes(self, indexes: list[IndexModel]) -> list[str]:
+        """Create indexes on the collection if they do not exist yet.
+
+        Args:
+            indexes: Index definitions to create.
 
-            parsed_doc = self.model.model_validate(doc)
-            parsed_documents.append(parsed_doc)
+        Returns:
+            Names of the created (or already existing) indexes.
 
-        return parsed_documents
+        Raises:
+            errors.PyMongoError: If index creation fails.
+        """
 
-    def get_collection_count(self) -> int:
-        """Count the total number of documents in the collection.
+        try:
+            names = self.collection.create_indexes(indexes)
+            logger.debug(f"Ensured indexes on {self.collection_name}: {names}")
+            return names
+        except errors.PyMongoError as e:
+            logger.error(f"Error creating indexes: {e}")
+            raise
+
+    def get_collection_count(self, query: dict = {}) -> int:
+        """Count the documents in the collection, optionally matching a query.
+
+        Args:
+            query: MongoDB query filter to apply (default: empty dict).
 
         Returns:
-            Total number of documents in the collection.
+            Number of documents matching the query.
 
         Raises:
             errors.PyMongoError: If the count operation fails.
         """
 
         try:
-            return self.collection.count_documents({})
+            return self.collection.count_documents(query)
         except errors.PyMongoError as e:
             logger.error(f"Error counting documents in MongoDB: {e}")
             raise
 
     def close(self) -> None:
-        """Close the MongoDB connection.
+        """Release the MongoDB client.
 
-        This method should be called when the service is no longer needed
-        to properly release resources, unless using the context manager.
+        The client is shared by the whole process and stays open; this method
+        is kept so callers do not need to know that. Use
+        `close_mongo_clients` to close the clients on shutdown.
         """
 
-        self.client.close()
-        logger.debug("Closed MongoDB connection.")
\ No newline at end of file
+        logger.debug("Released MongoDB client.")
@@ -0,0 +1,42 @@
+from .client import (
+    get_redis_connection,
+    get_shared_redis_connection,
+    get_async_redis_connection,
+)
+from .rate_limiter import TokenBucketRateLimiter, estimate_tokens, get_rate_limiter
+from .score_cache import ScoreCache
+from .progress import progress_channel, progress_key, publish_progress
+from .jobs import JobStore, decode_envelope, encode_envelope, job_key
+from .checkpoints import (
+    RedisCheckpointSaver,
+    checkpoint_key,
+    checkpoint_namespaces_key,
+)
+from .worker_pools import (
+    get_worker_pool_states,
+    publish_worker_pool_state,
+    worker_pool_key,
+)
+
+__all__ = [
+    "get_redis_connection",
+    "get_shared_redis_connection",
+    "get_async_redis_connection",
+    "TokenBucketRateLimiter",
+    "estimate_tokens",
+    "get_rate_limiter",
+    "ScoreCache",
+    "progress_channel",
+    "progress_key",
+    "publish_progress",
+    "JobStore",
+    "decode_envelope",
+    "encode_envelope",
+    "job_key",
+    "RedisCheckpointSaver",
+    "checkpoint_key",
+    "checkpoint_namespaces_key",
+    "get_worker_pool_states",
+    "publish_worker_pool_state",
+    "worker_pool_key",
+]
@@ -0,0 +1,369 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+import ormsgpack
+import redis
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from src.agent.config import settings
+from .client import get_shared_redis_connection
+
+
+# Channels of the match state copied to the checkpoint's position, which
+# the job status reports without decoding the checkpoint.
+POSITION_CHANNELS = ("offset", "total", "last_id", "done")
+
+
+def checkpoint_key(thread_id: str, checkpoint_ns: str = "") -> str:
+    """Hash holding the latest checkpoint of a graph thread."""
+
+    return f"match_checkpoint:{thread_id}:{checkpoint_ns}"
+
+
+def checkpoint_namespaces_key(thread_id: str) -> str:
+    """Set of the checkpoint namespaces of a graph thread."""
+
+    return f"match_checkpoint_ns:{thread_id}"
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver[int]):
+    """LangGraph checkpointer keeping the latest checkpoint of each thread
+    in Redis.
+
+    Match jobs only resume from where they stopped, never replay history,
+    so only the latest checkpoint of a thread is kept:
+
+    - `match_checkpoint:{thread}:{ns}`: the checkpoint without its channel
+      values, its metadata, id and parent id, and its position (step and
+      `POSITION_CHANNELS`) in plain fields.
+    - `...:blobs`: channel values by channel and version. Values are only
+      written when their channel changed, and dropped once no longer
+      referenced.
+    - `...:writes`: pending writes of the tasks of the latest checkpoint.
+
+    Every write renews the expiry of the thread's keys, `ttl` seconds.
+    Values are serialized with the checkpointer's serde. The async methods
+    run the blocking calls in a thread.
+
+    Args:
+        client: Redis client returning bytes. Defaults to the shared client.
+        ttl: Seconds a thread is kept after its last checkpoint.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis | None = None,
+        ttl: int = settings.JOB_RESULT_TTL,
+    ) -> None:
+        super().__init__()
+        self.client = client or get_shared_redis_connection(decode_responses=False)
+        self.ttl = ttl
+
+    def _dumps(self, value: Any) -> bytes:
+        return ormsgpack.packb(self.serde.dumps_typed(value))
+
+    def _loads(self, data: bytes) -> Any:
+        type_, value = ormsgpack.unpackb(data)
+        return self.serde.loads_typed((type_, value))
+
+    @staticmethod
+    def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+            }
+        }
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Return the latest checkpoint of the config's thread.
+
+        Args:
+            config: Config with the thread id and, optionally, the checkpoint
+                namespace and id.
+
+        Returns:
+            The checkpoint, or None if the thread has none or its latest
+            checkpoint is not the requested one.
+        """
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        key = checkpoint_key(thread_id, checkpoint_ns)
+
+        saved = self.client.hmget(key, "checkpoint", "metadata", "id", "parent_id")
+        if saved[0] is None:
+            return None
+
+        checkpoint_id = saved[2].decode()
+        if (requested := get_checkpoint_id(config)) and requested != checkpoint_id:
+            return None
+
+        checkpoint: Checkpoint = self._loads(saved[0])
+        versions = list(checkpoint["channel_versions"].items())
+        blobs = (
+            self.client.hmget(
+                f"{key}:blobs", [f"{channel}:{version}" for channel, version in versions]
+            )
+            if versions else []
+        )
+        channel_values = {
+            channel: self._loads(blob)
+            for (channel, _), blob in zip(versions, blobs)
+            if blob is not None
+        }
+
+        prefix = f"{checkpoint_id}:".encode()
+        writes = sorted(
+            (field.decode(), self._loads(value))
+            for field, value in self.client.hgetall(f"{key}:writes").items()
+            if field.startswith(prefix)
+        )
+
+        parent_id = saved[3].decode() if saved[3] else None
+        return CheckpointTuple(
+            config=self._config(thread_id, checkpoint_ns, checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self._loads(saved[1]),
+            parent_config=(
+                self._config(thread_id, checkpoint_ns, parent_id) if parent_id else None
+            ),
+            pending_writes=[
+                (task_id, channel, value) for _, (task_id, channel, value) in writes
+            ],
+        )
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List the checkpoints of a thread: its latest one, if it matches.
+
+        Args:
+            config: Config with the thread id.
+            filter: Metadata the checkpoint must have.
+            before: Only list checkpoints older than this one.
+            limit: Maximum number of checkpoints listed.
+
+        Yields:
+            The latest checkpoint of the thread.
+        """
+
+        if config is None or (limit is not None and limit <= 0):
+            return
+
+        saved = self.get_tuple(config)
+        if saved is None:
+            return
+        if before and (before_id := get_checkpoint_id(before)):
+            if saved.checkpoint["id"] >= before_id:
+                return
+        if filter and any(saved.metadata.get(k) != v for k, v in filter.items()):
+            return
+        yield saved
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint as the latest of its thread.
+
+        Args:
+            config: Config of the parent checkpoint.
+            checkpoint: The checkpoint.
+            metadata: Metadata of the checkpoint.
+            new_versions: Versions of the channels updated since the parent.
+
+        Returns:
+            The config of the stored checkpoint.
+        """
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        key = checkpoint_key(thread_id, checkpoint_ns)
+
+        checkpoint = checkpoint.copy()
+        values = checkpoint.pop("channel_values")
+        current = {
+            f"{channel}:{version}".encode()
+            for channel, version in checkpoint["channel_versions"].items()
+        }
+        prefix = f"{checkpoint['id']}:".encode()
+
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.hkeys(f"{key}:blobs")
+            pipe.hkeys(f"{key}:writes")
+            blob_fields, write_fields = pipe.execute()
+
+        fields = {
+            "checkpoint": self._dumps(checkpoint),
+            "metadata": self._dumps(get_checkpoint_metadata(config, metadata)),
+            "id": checkpoint["id"],
+            "parent_id": config["configurable"].get("checkpoint_id") or "",
+            "step": metadata.get("step", -1),
+            "updated_at": time.time(),
+        }
+        for channel in POSITION_CHANNELS:
+            if channel in values and values[channel] is not None:
+                fields[channel] = str(values[channel])
+
+        blobs = {
+            f"{channel}:{version}": self._dumps(values[channel])
+            for channel, version in new_versions.items()
+            if channel in values
+        }
+        stale_blobs = [field for field in blob_fields if field not in current]
+        stale_writes = [field for field in write_fields if not field.startswith(prefix)]
+
+        with self.client.pipeline(transaction=True) as pipe:
+            if blobs:
+                pipe.hset(f"{key}:blobs", mapping=blobs)
+            if stale_blobs:
+                pipe.hdel(f"{key}:blobs", *stale_blobs)
+            if stale_writes:
+                pipe.hdel(f"{key}:writes", *stale_writes)
+            pipe.hset(key, mapping=fields)
+            pipe.sadd(checkpoint_namespaces_key(thread_id), checkpoint_ns)
+            for name in (key, f"{key}:blobs", f"{key}:writes", checkpoint_namespaces_key(thread_id)):
+                pipe.expire(name, self.ttl)
+            pipe.execute()
+
+        return self._config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store the writes of a task of the latest checkpoint.
+
+        Args:
+            config: Config of the checkpoint.
+            writes: (channel, value) pairs written by the task.
+            task_id: Id of the task.
+            task_path: Path of the task.
+        """
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        key = f"{checkpoint_key(thread_id, checkpoint_ns)}:writes"
+
+        with self.client.pipeline(transaction=True) as pipe:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                field = f"{checkpoint_id}:{task_id}:{write_idx:06d}"
+                payload = self._dumps((task_id, channel, value))
+                # Regular writes are kept from the first attempt of the task,
+                # special ones (errors, interrupts) are replaced.
+                if write_idx >= 0:
+                    pipe.hsetnx(key, field, payload)
+                else:
+                    pipe.hset(key, field, payload)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete the checkpoints of a thread.
+
+        Args:
+            thread_id: Id of the thread.
+        """
+
+        namespaces = self.client.smembers(checkpoint_namespaces_key(thread_id))
+        keys = [checkpoint_namespaces_key(thread_id)]
+        for checkpoint_ns in namespaces:
+            key = checkpoint_key(thread_id, checkpoint_ns.decode())
+            keys += [key, f"{key}:blobs", f"{key}:writes"]
+        self.client.delete(*keys)
+
+    def get_position(self, thread_id: str) -> dict | None:
+        """Return where the latest checkpoint of a thread stands.
+
+        Args:
+            thread_id: Id of the thread.
+
+        Returns:
+            The step of the checkpoint, when it was stored, and the
+            `POSITION_CHANNELS` it recorded, or None without a checkpoint.
+        """
+
+        fields = ("id", "step", "updated_at") + POSITION_CHANNELS
+        values = self.client.hmget(checkpoint_key(thread_id), *fields)
+        if values[0] is None:
+            return None
+
+        position = {
+            field: value.decode()
+            for field, value in zip(fields, values)
+            if value is not None
+        }
+        position["checkpoint_id"] = position.pop("id")
+        position["step"] = int(position["step"])
+        position["updated_at"] = float(position["updated_at"])
+        for field in ("offset", "total"):
+            if field in position:
+                position[field] = int(position[field])
+        if "done" in position:
+            position["done"] = position["done"] == "True"
+        return position
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        saved = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in saved:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -0,0 +1,75 @@
+import os
+
+import redis
+import redis.asyncio as aioredis
+
+from src.agent.config import settings
+
+
+def get_redis_connection(decode_responses: bool = True) -> redis.Redis:
+    """Create a new Redis client from the application settings.
+
+    Args:
+        decode_responses: Whether replies are decoded to str.
+
+    Returns:
+        A Redis client with its own connection pool.
+    """
+
+    return redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        decode_responses=decode_responses,
+        username=settings.REDIS_USERNAME,
+        password=settings.REDIS_PASSWORD,
+        socket_connect_timeout=10,
+        socket_timeout=10,
+        retry_on_timeout=True,
+        health_check_interval=30,
+        max_connections=20,
+    )
+
+
+_shared: dict[tuple[int, bool], redis.Redis] = {}
+
+
+def get_shared_redis_connection(decode_responses: bool = True) -> redis.Redis:
+    """Return the process-wide Redis client, creating it on first use.
+
+    Clients are keyed by process id so a forked worker never reuses the
+    parent's sockets.
+
+    Args:
+        decode_responses: Whether replies are decoded to str.
+
+    Returns:
+        The shared Redis client for this process.
+    """
+
+    key = (os.getpid(), decode_responses)
+    if key not in _shared:
+        _shared[key] = get_redis_connection(decode_responses=decode_responses)
+    return _shared[key]
+
+
+def get_async_redis_connection(decode_responses: bool = True) -> aioredis.Redis:
+    """Create a new asyncio Redis client from the application settings.
+
+    Args:
+        decode_responses: Whether replies are decoded to str.
+
+    Returns:
+        An asyncio Redis client with its own connection pool.
+    """
+
+    return aioredis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        decode_responses=decode_responses,
+        username=settings.REDIS_USERNAME,
+        password=settings.REDIS_PASSWORD,
+        socket_connect_timeout=10,
+        retry_on_timeout=True,
+        health_check_interval=30,
+        max_connections=50,
+    )
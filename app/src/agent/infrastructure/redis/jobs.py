@@ -0,0 +1,172 @@
+import time
+import zlib
+from typing import Any
+
+import orjson
+import redis
+
+from src.agent.config import settings
+from .client import get_shared_redis_connection
+
+
+# Bump when the layout of envelopes changes; older envelopes are rejected.
+ENVELOPE_VERSION = 1
+
+
+def encode_envelope(
+    kind: str,
+    body: Any,
+    compress_min_bytes: int = settings.JOB_COMPRESS_MIN_BYTES
+) -> bytes:
+    """Encode a job payload or result as a versioned envelope.
+
+    The envelope is `{"v": version, "kind": kind, "body": body}` encoded
+    with orjson, and zlib compressed when it is at least
+    `compress_min_bytes` long. Plain envelopes start with `{`, which a zlib
+    stream never does, so no flag is needed to tell them apart.
+
+    Args:
+        kind: What the body is, checked on decoding, e.g. "match_job".
+        body: orjson-serializable body.
+        compress_min_bytes: Size from which the envelope is compressed.
+
+    Returns:
+        The encoded envelope.
+    """
+
+    data = orjson.dumps({"v": ENVELOPE_VERSION, "kind": kind, "body": body})
+    if len(data) >= compress_min_bytes:
+        data = zlib.compress(data, 1)
+    return data
+
+
+def decode_envelope(data: bytes, kind: str) -> Any:
+    """Decode an envelope made by `encode_envelope`.
+
+    Args:
+        data: The encoded envelope.
+        kind: Kind of body expected.
+
+    Returns:
+        The body.
+
+    Raises:
+        ValueError: If the envelope is corrupt, of another version or of
+            another kind.
+    """
+
+    try:
+        if not data.startswith(b"{"):
+            data = zlib.decompress(data)
+        envelope = orjson.loads(data)
+    except (zlib.error, orjson.JSONDecodeError) as e:
+        raise ValueError(f"Corrupt {kind} envelope: {e}") from e
+
+    if envelope.get("v") != ENVELOPE_VERSION or envelope.get("kind") != kind:
+        raise ValueError(
+            f"Expected a {kind} envelope of version {ENVELOPE_VERSION}, got "
+            f"{envelope.get('kind')} of version {envelope.get('v')}."
+        )
+    return envelope["body"]
+
+
+def job_key(job_id: str) -> str:
+    """Hash holding the status and result of a match job."""
+
+    return f"job:{job_id}"
+
+
+class JobStore:
+    """Status and result of match jobs, kept in Redis hashes.
+
+    Each job is a hash `job:{id}` with a plain `status` field, so status
+    reads are a single HGET and never decode the result. The result is an
+    envelope (see `encode_envelope`) in the `result` field. Every write
+    renews the hash's expiry, JOB_RESULT_TTL seconds.
+
+    Args:
+        client: Redis client returning bytes. Defaults to the shared client.
+        ttl: Seconds a job is kept after its last update.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis | None = None,
+        ttl: int = settings.JOB_RESULT_TTL
+    ) -> None:
+        self.client = client or get_shared_redis_connection(decode_responses=False)
+        self.ttl = ttl
+
+    def _write(self, job_id: str, fields: dict) -> None:
+        fields["updated_at"] = time.time()
+        # A retried job must not keep the error or result of its last run.
+        stale = [field for field in ("error", "result") if field not in fields]
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.hdel(job_key(job_id), *stale)
+            pipe.hset(job_key(job_id), mapping=fields)
+            pipe.expire(job_key(job_id), self.ttl)
+            pipe.execute()
+
+    def create(self, job_id: str) -> None:
+        """Record a job as processing, e.g. when it is enqueued."""
+
+        self._write(job_id, {"status": "processing"})
+
+    def set_result(self, job_id: str, result: dict) -> None:
+        """Record a job as done with its result."""
+
+        self._write(job_id, {
+            "status": "done",
+            "result": encode_envelope("match_result", result),
+        })
+
+    def set_error(self, job_id: str, error: str) -> None:
+        """Record a job as failed."""
+
+        self._write(job_id, {"status": "error", "error": error})
+
+    def exists(self, job_id: str) -> bool:
+        """Whether a job is known (and not expired)."""
+
+        return bool(self.client.exists(job_key(job_id)))
+
+    def get_status(self, job_id: str) -> dict | None:
+        """Return the status of a job, without its result.
+
+        Returns:
+            `{"status": ...}`, with the `error` of failed jobs, or None if
+            the job is unknown.
+        """
+
+        status, error = self.client.hmget(job_key(job_id), "status", "error")
+        return self._status_payload(status, error)
+
+    def get(self, job_id: str) -> dict | None:
+        """Return the status of a job and, once it is done, its result.
+
+        Returns:
+            The status payload, merged with the result of done jobs, or
+            None if the job is unknown.
+
+        Raises:
+            ValueError: If the stored result cannot be decoded.
+        """
+
+        status, error, result = self.client.hmget(
+            job_key(job_id), "status", "error", "result"
+        )
+        payload = self._status_payload(status, error)
+        if payload is not None and result is not None:
+            payload.update(decode_envelope(result, "match_result"))
+        return payload
+
+    @staticmethod
+    def _status_payload(status: bytes | None, error: bytes | None) -> dict | None:
+        if status is None:
+            return None
+
+        payload = {"status": status.decode()}
+        if error is not None:
+            payload["error"] = error.decode()
+        return payload
+
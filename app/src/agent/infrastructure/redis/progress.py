@@ -0,0 +1,50 @@
+import json
+
+import redis
+from loguru import logger
+
+from .client import get_shared_redis_connection
+
+
+# Seconds the latest progress event of a job is kept for late subscribers.
+PROGRESS_TTL = 3600
+
+
+def progress_channel(job_id: str) -> str:
+    """Pub/sub channel carrying the progress events of a match job."""
+
+    return f"match_progress:{job_id}"
+
+
+def progress_key(job_id: str) -> str:
+    """Key holding the latest progress event of a match job."""
+
+    return f"match_progress:{job_id}:latest"
+
+
+def publish_progress(
+    job_id: str,
+    event: dict,
+    redis_client: redis.Redis | None = None
+) -> None:
+    """Publish a progress event of a match job.
+
+    The event is sent on the job's channel and kept as the job's latest
+    event, so subscribers that connect late still start from the current
+    state. Failures are logged and never fail the job.
+
+    Args:
+        job_id: Id of the match job.
+        event: JSON-serializable event, with at least a `status` entry.
+        redis_client: Redis client to use. Defaults to the shared client.
+    """
+
+    message = json.dumps(event)
+    try:
+        client = redis_client or get_shared_redis_connection()
+        with client.pipeline(transaction=False) as pipe:
+            pipe.set(progress_key(job_id), message, ex=PROGRESS_TTL)
+            pipe.publish(progress_channel(job_id), message)
+            pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to publish progress of job {job_id}: {e}")
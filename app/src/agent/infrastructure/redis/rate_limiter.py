@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import time
+import weakref
+
+import redis
+from loguru import logger
+
+from src.agent.config import settings
+from .client import get_shared_redis_connection
+
+
+# Two token buckets (requests and tokens) refilled continuously and consumed
+# atomically: either both have enough capacity and are debited, or nothing is
+# debited and the time until both would have enough is returned.
+#
+# KEYS[1]: request bucket, KEYS[2]: token bucket
+# ARGV: request capacity, request refill/s, token capacity, token refill/s,
+#       requested tokens, key ttl (s)
+TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+
+local function refill(key, capacity, rate)
+    local data = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    return math.min(capacity, level + math.max(0, now - ts) * rate)
+end
+
+local req_capacity, req_rate = tonumber(ARGV[1]), tonumber(ARGV[2])
+local tok_capacity, tok_rate = tonumber(ARGV[3]), tonumber(ARGV[4])
+local requested = math.min(tonumber(ARGV[5]), tok_capacity)
+local ttl = tonumber(ARGV[6])
+
+local req_level = refill(KEYS[1], req_capacity, req_rate)
+local tok_level = refill(KEYS[2], tok_capacity, tok_rate)
+
+local wait = 0
+if req_level < 1 then
+    wait = math.max(wait, (1 - req_level) / req_rate)
+end
+if tok_level < requested then
+    wait = math.max(wait, (requested - tok_level) / tok_rate)
+end
+if wait == 0 then
+    req_level = req_level - 1
+    tok_level = tok_level - requested
+end
+
+redis.call('HSET', KEYS[1], 'level', req_level, 'ts', now)
+redis.call('HSET', KEYS[2], 'level', tok_level, 'ts', now)
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('EXPIRE', KEYS[2], ttl)
+
+-- Lua numbers are truncated to integers in replies, so return a string.
+return tostring(wait)
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt (about four characters per token).
+
+    Args:
+        text: Prompt text.
+
+    Returns:
+        Estimated number of tokens.
+    """
+
+    return len(text) // 4 + 1
+
+
+class _LocalTokenBuckets:
+    """In-process equivalent of TOKEN_BUCKET_SCRIPT."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self.req_capacity = float(requests_per_minute)
+        self.tok_capacity = float(tokens_per_minute)
+        self.req_level = self.req_capacity
+        self.tok_level = self.tok_capacity
+        self.ts = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self, tokens: int) -> float:
+        with self.lock:
+            now = time.monotonic()
+            elapsed = now - self.ts
+            self.ts = now
+
+            req_rate = self.req_capacity / 60
+            tok_rate = self.tok_capacity / 60
+            self.req_level = min(self.req_capacity, self.req_level + elapsed * req_rate)
+            self.tok_level = min(self.tok_capacity, self.tok_level + elapsed * tok_rate)
+
+            requested = min(float(tokens), self.tok_capacity)
+            wait = 0.0
+            if self.req_level < 1:
+                wait = max(wait, (1 - self.req_level) / req_rate)
+            if self.tok_level < requested:
+                wait = max(wait, (requested - self.tok_level) / tok_rate)
+            if wait == 0:
+                self.req_level -= 1
+                self.tok_level -= requested
+
+            return wait
+
+
+class TokenBucketRateLimiter:
+    """Requests/min and tokens/min limiter shared by every process via Redis.
+
+    Buckets live in Redis so all API processes and RQ workers draw from the
+    same quota. If Redis is unreachable the limiter falls back to in-process
+    buckets and retries Redis after `fallback_seconds`.
+
+    Args:
+        name: Name of the quota, e.g. the model name.
+        requests_per_minute: Request bucket capacity and refill per minute.
+        tokens_per_minute: Token bucket capacity and refill per minute.
+        redis_client: Redis client to use. Defaults to the shared client.
+        fallback_seconds: How long to use the in-process buckets after a
+            Redis failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        redis_client: redis.Redis | None = None,
+        fallback_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.fallback_seconds = fallback_seconds
+
+        self._redis = redis_client
+        self._script = None
+        self._keys = [
+            f"rate_limit:{{{name}}}:requests",
+            f"rate_limit:{{{name}}}:tokens",
+        ]
+        self._local = _LocalTokenBuckets(requests_per_minute, tokens_per_minute)
+        self._redis_down_until = 0.0
+        self._loop_locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+
+    def try_acquire(self, tokens: int) -> float:
+        """Try to take one request and `tokens` tokens from the buckets.
+
+        Args:
+            tokens: Estimated tokens of the request.
+
+        Returns:
+            0.0 if the quota was taken, otherwise the seconds to wait before
+            trying again.
+        """
+
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                if self._script is None:
+                    client = self._redis or get_shared_redis_connection()
+                    self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+                wait = self._script(
+                    keys=self._keys,
+                    args=[
+                        self.requests_per_minute,
+                        self.requests_per_minute / 60,
+                        self.tokens_per_minute,
+                        self.tokens_per_minute / 60,
+                        tokens,
+                        120,
+                    ],
+                )
+                return float(wait)
+            except redis.RedisError as e:
+                logger.warning(
+                    f"Rate limiter '{self.name}' cannot reach Redis, "
+                    f"using in-process buckets: {e}"
+                )
+                self._redis_down_until = time.monotonic() + self.fallback_seconds
+
+        return self._local.try_acquire(tokens)
+
+    def acquire(self, tokens: int) -> float:
+        """Block until the quota allows a request of `tokens` tokens.
+
+        Returns:
+            Total seconds spent waiting.
+        """
+
+        waited = 0.0
+        while (wait := self.try_acquire(tokens)) > 0:
+            time.sleep(wait)
+            waited += wait
+
+        if waited:
+            logger.debug(f"Rate limiter '{self.name}' delayed request by {waited:.1f}s")
+        return waited
+
+    async def aacquire(self, tokens: int) -> float:
+        """Async version of `acquire` that yields to the event loop while waiting.
+
+        Requests of the same event loop, e.g. the match jobs of an async
+        worker, wait for the quota in turn (first come, first served)
+        instead of all polling Redis.
+
+        Returns:
+            Total seconds spent waiting.
+        """
+
+        loop = asyncio.get_running_loop()
+        lock = self._loop_locks.get(loop)
+        if lock is None:
+            lock = self._loop_locks[loop] = asyncio.Lock()
+
+        waited = 0.0
+        async with lock:
+            while (wait := await asyncio.to_thread(self.try_acquire, tokens)) > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+
+        if waited:
+            logger.debug(f"Rate limiter '{self.name}' delayed request by {waited:.1f}s")
+        return waited
+
+
+_limiters: dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_rate_limiter(name: str) -> TokenBucketRateLimiter:
+    """Return the process-wide limiter for a quota, creating it on first use.
+
+    Args:
+        name: Name of the quota, e.g. the model name.
+
+    Returns:
+        The limiter configured from GROQ_REQUESTS_PER_MINUTE and
+        GROQ_TOKENS_PER_MINUTE.
+    """
+
+    if name not in _limiters:
+        _limiters[name] = TokenBucketRateLimiter(
+            name=name,
+            requests_per_minute=settings.GROQ_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.GROQ_TOKENS_PER_MINUTE,
+        )
+    return _limiters[name]
@@ -0,0 +1,149 @@
+from datetime import datetime, timezone
+
+import redis
+from loguru import logger
+
+from src.agent.config import settings
+from src.agent.domain.match_score import Match_score
+from src.agent.infrastructure.mongo.service import MongoDBService
+from .client import get_shared_redis_connection
+
+
+class ScoreCache:
+    """Cache of pairwise compatibility scores.
+
+    Entries are keyed by the content hashes of the query and candidate
+    profiles and by the scoring version (mode, prompt and model), so a score
+    is reused only while neither profile nor the way it is scored changes.
+
+    Scores live in Redis with a TTL that is renewed on every hit, so pairs
+    that are no longer requested expire first; with a `volatile-lru`
+    maxmemory policy Redis also evicts the least recently used entries under
+    memory pressure. Optionally, scores are spilled to the Mongo
+    `match_scores` collection (expired by a TTL index) so they outlive Redis
+    evictions and restarts.
+
+    Cache failures are logged and treated as misses; they never fail a job.
+
+    Args:
+        version: Scoring version the cached scores belong to.
+        ttl: Seconds an entry stays in Redis after its last use.
+        use_mongo: Whether to read from and write to `match_scores`.
+        redis_client: Redis client to use. Defaults to the shared client.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        ttl: int = settings.MATCH_SCORE_CACHE_TTL,
+        use_mongo: bool = settings.MATCH_SCORE_CACHE_MONGO,
+        redis_client: redis.Redis | None = None,
+    ) -> None:
+        self.version = version
+        self.ttl = ttl
+        self.use_mongo = use_mongo
+        self._redis = redis_client
+
+    @property
+    def redis(self) -> redis.Redis:
+        return self._redis or get_shared_redis_connection()
+
+    def key(self, query_hash: str, candidate_hash: str) -> str:
+        """Cache key of a (query, candidate) pair.
+
+        Args:
+            query_hash: Content hash of the query profile.
+            candidate_hash: Content hash of the candidate profile.
+
+        Returns:
+            The cache key.
+        """
+
+        return f"match_score:{self.version}:{query_hash}:{candidate_hash}"
+
+    def get_many(self, keys: list[str]) -> dict[str, float]:
+        """Look up cached scores.
+
+        Args:
+            keys: Cache keys built with `key`.
+
+        Returns:
+            Mapping of found keys to their scores.
+        """
+
+        if not keys:
+            return {}
+
+        found = {}
+        try:
+            values = self.redis.mget(keys)
+            with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in zip(keys, values):
+                    if value is not None:
+                        found[key] = float(value)
+                        pipe.expire(key, self.ttl)
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Score cache lookup in Redis failed: {e}")
+
+        missing = [key for key in keys if key not in found]
+        if self.use_mongo and missing:
+            spilled = self._get_from_mongo(missing)
+            if spilled:
+                # Warm Redis so the next lookup does not reach Mongo.
+                self._set_in_redis(spilled)
+                found.update(spilled)
+
+        return found
+
+    def set_many(self, scores: dict[str, float]) -> None:
+        """Store scores.
+
+        Args:
+            scores: Mapping of cache keys to scores.
+        """
+
+        if not scores:
+            return
+
+        self._set_in_redis(scores)
+        if self.use_mongo:
+            self._set_in_mongo(scores)
+
+    def _set_in_redis(self, scores: dict[str, float]) -> None:
+        try:
+            with self.redis.pipeline(transaction=False) as pipe:
+                for key, score in scores.items():
+                    pipe.set(key, score, ex=self.ttl)
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Score cache write to Redis failed: {e}")
+
+    def _get_from_mongo(self, keys: list[str]) -> dict[str, float]:
+        try:
+            with MongoDBService(
+                model=Match_score,
+                collection_name="match_scores"
+            ) as service:
+                documents = service.fetch_documents(
+                    limit=len(keys),
+                    query={"_id": {"$in": keys}}
+                )
+            return {doc.id: doc.score for doc in documents}
+        except Exception as e:
+            logger.warning(f"Score cache lookup in Mongo failed: {e}")
+            return {}
+
+    def _set_in_mongo(self, scores: dict[str, float]) -> None:
+        now = datetime.now(timezone.utc)
+        try:
+            with MongoDBService(
+                model=Match_score,
+                collection_name="match_scores"
+            ) as service:
+                service.upsert_documents([
+                    Match_score(id=key, score=score, updated_at=now)
+                    for key, score in scores.items()
+                ])
+        except Exception as e:
+            logger.warning(f"Score cache write to Mongo failed: {e}")
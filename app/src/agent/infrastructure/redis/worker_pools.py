@@ -0,0 +1,58 @@
+import orjson
+import redis
+from loguru import logger
+
+from src.agent.config import settings
+from .client import get_shared_redis_connection
+
+
+def worker_pool_key(name: str) -> str:
+    """Key holding the latest state of a worker pool."""
+
+    return f"worker_pool:{name}"
+
+
+def publish_worker_pool_state(
+    name: str,
+    state: dict,
+    redis_client: redis.Redis | None = None
+) -> None:
+    """Publish the state of a worker pool.
+
+    The state expires after a few scaling intervals, so pools that stopped
+    or died disappear on their own. Failures are logged and never stop the
+    pool.
+
+    Args:
+        name: Name of the pool.
+        state: JSON-serializable state.
+        redis_client: Redis client to use. Defaults to the shared client.
+    """
+
+    try:
+        client = redis_client or get_shared_redis_connection()
+        client.set(
+            worker_pool_key(name),
+            orjson.dumps(state),
+            ex=max(15, int(3 * settings.WORKER_SCALE_INTERVAL)),
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Failed to publish the state of worker pool {name}: {e}")
+
+
+def get_worker_pool_states(redis_client: redis.Redis | None = None) -> list[dict]:
+    """Return the latest state of every running worker pool.
+
+    Args:
+        redis_client: Redis client to use. Defaults to the shared client.
+
+    Returns:
+        The states, by pool name.
+    """
+
+    client = redis_client or get_shared_redis_connection()
+    keys = sorted(client.scan_iter(match=worker_pool_key("*"), count=100))
+    if not keys:
+        return []
+
+    return [orjson.loads(state) for state in client.mget(keys) if state is not None]
@@ -0,0 +1,9 @@
+from .vectorizer import ProfileVectorizer
+from .index import LSHVectorIndex, get_vector_index, rebuild_vector_index
+
+__all__ = [
+    "ProfileVectorizer",
+    "LSHVectorIndex",
+    "get_vector_index",
+    "rebuild_vector_index"
+]
@@ -0,0 +1,304 @@
+import fcntl
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from src.agent.config import settings
+from src.agent.domain.fyp_data import Fyp_data
+
+from .vectorizer import ProfileVectorizer
+
+
+class LSHVectorIndex:
+    """Approximate nearest-neighbour index over profile vectors.
+
+    Uses random-hyperplane locality sensitive hashing (SimHash): every vector
+    gets one `num_bits`-bit signature per table, and a query only considers
+    rows that share a signature with it in at least one table. Candidates are
+    then re-ranked by exact cosine similarity. All data lives in NumPy arrays
+    and is persisted to a single `.npz` file.
+
+    Args:
+        path: Location of the persisted index file.
+        dim: Dimensionality of the profile vectors.
+        num_tables: Number of independent hash tables.
+        num_bits: Number of hyperplanes (signature bits) per table.
+        seed: Seed for the random hyperplanes.
+
+    Attributes:
+        vectorizer: The vectorizer used to embed profiles.
+        ids: Profile ids, aligned with the rows of `vectors`.
+        vectors: Matrix of L2-normalised profile vectors.
+        codes: Matrix of per-table LSH signatures.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = settings.VECTOR_INDEX_PATH,
+        dim: int = settings.VECTOR_INDEX_DIM,
+        num_tables: int = settings.VECTOR_INDEX_NUM_TABLES,
+        num_bits: int = settings.VECTOR_INDEX_NUM_BITS,
+        seed: int = 42,
+    ) -> None:
+        self.path = Path(path)
+        self.dim = dim
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.vectorizer = ProfileVectorizer(dim=dim)
+
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal(
+            (num_tables, num_bits, dim)
+        ).astype(np.float32)
+        self._bit_weights = (1 << np.arange(num_bits, dtype=np.int64))
+
+        self._reset()
+        self._mtime: float | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _reset(self) -> None:
+        self.ids: list[str] = []
+        self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.codes = np.zeros((0, self.num_tables), dtype=np.int64)
+        self._positions: dict[str, int] = {}
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Compute the LSH signature of each vector in every table."""
+
+        # (tables, bits, dim) x (n, dim) -> (n, tables, bits)
+        projections = np.einsum("tbd,nd->ntb", self.planes, vectors)
+        return ((projections > 0).astype(np.int64) * self._bit_weights).sum(axis=2)
+
+    def add(self, ids: list[str], profiles: list[Fyp_data]) -> None:
+        """Add profiles to the index, replacing any existing entry per id.
+
+        Args:
+            ids: Profile ids (MongoDB `_id` as string), aligned with profiles.
+            profiles: Profiles to embed.
+
+        Raises:
+            ValueError: If ids and profiles have different lengths.
+        """
+
+        if len(ids) != len(profiles):
+            raise ValueError("ids and profiles must have the same length.")
+        if not ids:
+            return
+
+        vectors = self.vectorizer.transform(profiles)
+        codes = self._hash(vectors)
+
+        new_rows = []
+        for profile_id, vector, code in zip(ids, vectors, codes):
+            position = self._positions.get(profile_id)
+            if position is None:
+                self._positions[profile_id] = len(self.ids) + len(new_rows)
+                new_rows.append((profile_id, vector, code))
+            elif position >= len(self.ids):
+                # Same id repeated within this call: keep the latest.
+                new_rows[position - len(self.ids)] = (profile_id, vector, code)
+            else:
+                self.vectors[position] = vector
+                self.codes[position] = code
+
+        if new_rows:
+            self.ids.extend(row[0] for row in new_rows)
+            self.vectors = np.vstack([self.vectors, [row[1] for row in new_rows]])
+            self.codes = np.vstack([self.codes, [row[2] for row in new_rows]])
+
+        logger.debug(f"Indexed {len(ids)} profiles ({len(self.ids)} total).")
+
+    def search(
+        self,
+        query: Fyp_data,
+        top_n: int,
+        exclude_ids: set[str] | None = None
+    ) -> list[tuple[str, float]]:
+        """Find the profiles most similar to the query.
+
+        Args:
+            query: Query profile.
+            top_n: Maximum number of neighbours to return.
+            exclude_ids: Ids that must not be returned.
+
+        Returns:
+            List of (id, cosine similarity) pairs, most similar first.
+        """
+
+        if not self.ids or top_n <= 0:
+            return []
+
+        vector = self.vectorizer.transform_one(query)
+        query_codes = self._hash(vector[None, :])[0]
+
+        candidates = np.flatnonzero((self.codes == query_codes).any(axis=1))
+        if len(candidates) < top_n:
+            # Too few collisions to fill the request: fall back to an exact
+            # scan, which is a single matrix-vector product anyway.
+            candidates = np.arange(len(self.ids))
+
+        similarities = self.vectors[candidates] @ vector
+
+        if exclude_ids:
+            mask = np.array(
+                [self.ids[i] not in exclude_ids for i in candidates],
+                dtype=bool
+            )
+            candidates, similarities = candidates[mask], similarities[mask]
+
+        if len(candidates) > top_n:
+            best = np.argpartition(-similarities, top_n - 1)[:top_n]
+        else:
+            best = np.arange(len(candidates))
+        best = best[np.argsort(-similarities[best])]
+
+        return [
+            (self.ids[candidates[i]], float(similarities[i]))
+            for i in best
+        ]
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive inter-process lock on the index file."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        """Atomically persist the index to `path`."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                ids=np.array(self.ids, dtype=str),
+                vectors=self.vectors,
+                codes=self.codes,
+                planes=self.planes,
+            )
+        os.replace(tmp_path, self.path)
+        self._mtime = self.path.stat().st_mtime
+
+        logger.debug(f"Saved vector index with {len(self.ids)} profiles to {self.path}.")
+
+    def load(self) -> bool:
+        """Load the index from `path` if it exists.
+
+        Returns:
+            True if an index file was loaded, False otherwise.
+        """
+
+        if not self.path.exists():
+            self._reset()
+            return False
+
+        with np.load(self.path) as data:
+            if data["planes"].shape != self.planes.shape:
+                logger.warning(
+                    f"Vector index at {self.path} was built with different "
+                    "parameters; ignoring it until it is rebuilt."
+                )
+                self._reset()
+                return False
+
+            self.planes = data["planes"]
+            self.ids = data["ids"].tolist()
+            self.vectors = data["vectors"]
+            self.codes = data["codes"]
+
+        self._positions = {profile_id: i for i, profile_id in enumerate(self.ids)}
+        self._mtime = self.path.stat().st_mtime
+
+        logger.debug(f"Loaded vector index with {len(self.ids)} profiles.")
+        return True
+
+    def refresh(self) -> None:
+        """Reload the index if another process has saved a newer version."""
+
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    def add_and_save(self, ids: list[str], profiles: list[Fyp_data]) -> None:
+        """Add profiles and persist, merging with concurrent writers.
+
+        Args:
+            ids: Profile ids, aligned with profiles.
+            profiles: Profiles to embed.
+        """
+
+        with self._locked():
+            self.refresh()
+            self.add(ids, profiles)
+            self.save()
+
+
+_index: LSHVectorIndex | None = None
+
+
+def get_vector_index() -> LSHVectorIndex:
+    """Return the process-wide vector index, reloading it if it changed on disk."""
+
+    global _index
+
+    if _index is None:
+        _index = LSHVectorIndex()
+        _index.load()
+    else:
+        _index.refresh()
+
+    return _index
+
+
+def rebuild_vector_index(batch_size: int = 500) -> int:
+    """Rebuild the vector index from every profile in `std_profiles`.
+
+    Args:
+        batch_size: Number of profiles fetched per query.
+
+    Returns:
+        Number of indexed profiles.
+    """
+
+    from src.agent.infrastructure.mongo.service import MongoDBService
+
+    index = LSHVectorIndex()
+
+    with MongoDBService(
+        model=Fyp_data,
+        collection_name="std_profiles"
+    ) as service:
+        last_id = None
+        while True:
+            profiles = service.fetch_documents_after(
+                limit=batch_size, last_id=last_id
+            )
+            if not profiles:
+                break
+            index.add([profile.id for profile in profiles], profiles)
+            last_id = profiles[-1].id
+
+    with index._locked():
+        index.save()
+
+    logger.info(f"Rebuilt vector index with {len(index)} profiles.")
+    return len(index)
+
+
+if __name__ == "__main__":
+    rebuild_vector_index()
@@ -0,0 +1,126 @@
+import math
+import re
+import zlib
+
+import numpy as np
+
+from src.agent.domain.fyp_data import Fyp_data
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from",
+    "has", "in", "into", "is", "it", "its", "of", "on", "or", "that", "the",
+    "their", "this", "to", "using", "will", "with", "which", "system",
+})
+
+
+class ProfileVectorizer:
+    """Stateless hashing vectorizer for student profiles.
+
+    Tokens from the profile's idea, interests, tech stack and skills are
+    hashed into a fixed number of buckets (the "hashing trick"), weighted
+    with sublinear term frequency and L2-normalised. No vocabulary has to be
+    fitted or stored, so vectors computed in different processes are always
+    comparable.
+
+    Args:
+        dim: Number of hash buckets (vector dimensionality).
+        field_weights: Relative weight of each profile field.
+    """
+
+    DEFAULT_FIELD_WEIGHTS = {
+        "idea": 1.0,
+        "interests": 1.5,
+        "tech_stack": 1.0,
+        "skills": 1.0,
+    }
+
+    def __init__(
+        self,
+        dim: int = 1024,
+        field_weights: dict[str, float] | None = None
+    ) -> None:
+        self.dim = dim
+        self.field_weights = field_weights or self.DEFAULT_FIELD_WEIGHTS
+
+    @staticmethod
+    def tokenize(text: str) -> list[str]:
+        """Split free text into lowercase word tokens without stop words."""
+
+        return [
+            token.strip(".")
+            for token in TOKEN_PATTERN.findall(text.lower())
+            if token not in STOP_WORDS and len(token) > 1
+        ]
+
+    def _profile_terms(self, profile: Fyp_data) -> dict[str, float]:
+        """Collect weighted term counts for a single profile."""
+
+        terms: dict[str, float] = {}
+
+        def add(term: str, weight: float) -> None:
+            terms[term] = terms.get(term, 0.0) + weight
+
+        for token in self.tokenize(profile.idea or ""):
+            add(token, self.field_weights["idea"])
+
+        list_fields = {
+            "interests": profile.interests,
+            "tech_stack": profile.tech_stack,
+            "skills": profile.metadata.skills,
+        }
+        for field, values in list_fields.items():
+            weight = self.field_weights[field]
+            for value in values or []:
+                # Whole phrase as one feature plus its individual words, so
+                # "Machine Learning" also overlaps with "learning" in an idea.
+                phrase = " ".join(self.tokenize(value))
+                if phrase:
+                    add(f"#{phrase}", weight)
+                for token in self.tokenize(value):
+                    add(token, weight * 0.5)
+
+        return terms
+
+    def transform_one(self, profile: Fyp_data) -> np.ndarray:
+        """Vectorize a single profile.
+
+        Args:
+            profile: Profile to vectorize.
+
+        Returns:
+            L2-normalised float32 vector of length `dim`.
+        """
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        for term, count in self._profile_terms(profile).items():
+            digest = zlib.crc32(term.encode("utf-8"))
+            index = digest % self.dim
+            sign = 1.0 if (digest >> 31) & 1 == 0 else -1.0
+            # Sublinear tf: repeated terms saturate instead of dominating.
+            weight = 1.0 + math.log(count) if count > 1 else count
+            vector[index] += sign * weight
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+
+        return vector
+
+    def transform(self, profiles: list[Fyp_data]) -> np.ndarray:
+        """Vectorize a list of profiles.
+
+        Args:
+            profiles: Profiles to vectorize.
+
+        Returns:
+            Matrix of shape (len(profiles), dim).
+        """
+
+        if not profiles:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        return np.vstack([self.transform_one(profile) for profile in profiles])
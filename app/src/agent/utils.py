@@ -1,6 +1,10 @@
+import hashlib
+import json
 import random
 import string
 
+from src.agent.domain.fyp_data import Fyp_data
+
 
 def generate_random_hex(length: int) -> str:
     """Generate a random hex string of specified length.
@@ -14,3 +18,29 @@ def generate_random_hex(length: int) -> str:
 
     hex_chars = string.hexdigits.lower()
     return "".join(random.choice(hex_chars) for _ in range(length))
+
+
+def profile_content_hash(profile: Fyp_data) -> str:
+    """Hash the profile fields that scoring depends on.
+
+    Two profiles with the same idea, interests, tech stack and skills get the
+    same hash, so a score computed for one can be reused for the other.
+
+    Args:
+        profile: The profile to hash.
+
+    Returns:
+        str: Hex digest identifying the profile content.
+    """
+
+    content = json.dumps(
+        [
+            profile.idea,
+            profile.interests,
+            profile.tech_stack,
+            profile.metadata.skills,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
@@ -32,6 +32,21 @@ class TestRunner:
             ("Project Generation Agent", "test_project_agent.py"),
             ("Interest Generation Agent", "test_interest_agent.py"),
             ("Match Finding Agent", "test_match_agent.py"),
+            ("Vector Index Test", "test_vector_index.py"),
+            ("Heuristic Scorer Test", "test_scoring.py"),
+            ("Rate Limiter Test", "test_rate_limiter.py"),
+            ("Score Cache Test", "test_score_cache.py"),
+            ("Top-k Test", "test_top_k.py"),
+            ("Bulk Ingestion Test", "test_bulk_ingestion.py"),
+            ("Prompt Registry Test", "test_prompt_registry.py"),
+            ("Job Envelope Test", "test_job_envelope.py"),
+            ("Worker Pool Test", "test_worker_pool.py"),
+            ("Async Worker Test", "test_async_worker.py"),
+            ("Batching Test", "test_batching.py"),
+            ("Encoding Test", "test_encoding.py"),
+            ("Score Output Test", "test_score_output.py"),
+            ("LLM Retry Test", "test_llm_retry.py"),
+            ("Checkpoints Test", "test_checkpoints.py"),
             ("Error Handling Test", "test_error_handling.py")
         ]
         
@@ -205,6 +220,21 @@ class TestRunner:
             "test_project_agent.log",
             "test_interest_agent.log",
             "test_match_agent.log",
+            "test_vector_index.log",
+            "test_scoring.log",
+            "test_rate_limiter.log",
+            "test_score_cache.log",
+            "test_top_k.log",
+            "test_bulk_ingestion.log",
+            "test_prompt_registry.log",
+            "test_job_envelope.log",
+            "test_worker_pool.log",
+            "test_async_worker.log",
+            "test_batching.log",
+            "test_encoding.log",
+            "test_score_output.log",
+            "test_llm_retry.log",
+            "test_checkpoints.log",
             "test_error_handling.log"
         ]
         
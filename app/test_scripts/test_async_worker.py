@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Async Worker Test - Tests the RQ bookkeeping of the async match worker: jobs
+returning a Retry and the warm shutdown with jobs in flight
+"""
+
+import os
+import sys
+import signal
+import asyncio
+import traceback
+from pathlib import Path
+from uuid import uuid4
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_async_worker.log", level="DEBUG")
+
+
+def retried_job(key):
+    """Asks RQ to run it again the first time, then succeeds"""
+    from rq import Retry
+    from src.agent.infrastructure.redis import get_redis_connection
+
+    if get_redis_connection().incr(key) == 1:
+        return Retry(max=2)
+    return "done"
+
+
+async def stopping_job(seconds):
+    """Asks its worker for a warm shutdown, then keeps running"""
+    os.kill(os.getpid(), signal.SIGTERM)
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+def test_async_worker():
+    """Test Retry results and warm shutdown against the configured Redis server"""
+    logger.info("⚙️ Testing Async Worker...")
+
+    queue = None
+    key = f"test-async-worker-{uuid4()}"
+    try:
+        from rq import Queue
+        from rq.job import JobStatus
+        from src.agent.application.jobs.async_worker import AsyncMatchWorker
+        from src.agent.infrastructure.redis import get_redis_connection
+
+        connection = get_redis_connection(decode_responses=False)
+        queue = Queue(key, connection=connection)
+
+        # By path: RQ does not run functions of the __main__ module.
+        job = queue.enqueue("test_async_worker.retried_job", key)
+        AsyncMatchWorker([queue], connection=connection, concurrency=2).work(burst=True)
+
+        job.refresh()
+        if job.get_status() != JobStatus.FINISHED or job.return_value() != "done":
+            raise Exception(f"Retried job should finish: {job.get_status()}, {job.return_value()}")
+        if int(connection.get(key)) != 2 or job.number_of_retries != 1:
+            raise Exception(f"Job should run twice: {connection.get(key)} runs")
+        logger.info("✓ Job returning a Retry is queued again and finishes")
+
+        # One slot: the second job waits in the queue while the first runs.
+        running = queue.enqueue("test_async_worker.stopping_job", 0.5)
+        waiting = queue.enqueue("test_async_worker.stopping_job", 0.5)
+        worker = AsyncMatchWorker([queue], connection=connection, concurrency=1)
+        worker.work(burst=True)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        if running.get_status() != JobStatus.FINISHED or running.return_value() != 0.5:
+            raise Exception(f"Job in flight should finish: {running.get_status()}")
+        if waiting.get_status() != JobStatus.QUEUED:
+            raise Exception(f"Queued job should not start: {waiting.get_status()}")
+        if worker._in_flight:
+            raise Exception("Worker should not stop with jobs in flight")
+        logger.info("✓ Warm shutdown finishes the job in flight and starts no other")
+
+        logger.success("✅ Async worker test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Async worker test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+    finally:
+        if queue is not None:
+            try:
+                queue.empty()
+                queue.delete(delete_jobs=True)
+                queue.connection.delete(key)
+            except Exception:
+                pass
+
+
+if __name__ == "__main__":
+    success = test_async_worker()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Batching Test - Tests the token-aware sizing of LLM scoring batches
+"""
+
+import sys
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_batching.log", level="DEBUG")
+
+
+def make_profile(id, idea):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea=idea,
+        tech_stack=["Python"], interests=["AI"], score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="male", skills=["Python"], email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+def test_batching():
+    """Test batch planning and the adaptation of the token budget"""
+    logger.info("📦 Testing Token-Aware Batching...")
+
+    try:
+        from src.agent.application.scoring import (
+            MIN_BATCH_TOKEN_BUDGET,
+            LLMScorer,
+            adapt_token_budget,
+            plan_token_batches,
+            profile_tokens,
+        )
+
+        query = make_profile("query", "Detect tumors in MRI scans.")
+        short = [make_profile(f"s{i}", "A chatbot.") for i in range(40)]
+        long = [make_profile(f"l{i}", "A long project idea. " * 40) for i in range(10)]
+
+        batches = plan_token_batches(query, short, 0, 25)
+        if [len(batch) for batch in batches] != [25, 15]:
+            raise Exception("A budget of 0 must only cap the batch size")
+        logger.info("✓ Budget of 0 batches by size only")
+
+        budget = 1500
+        for candidates in (short, long):
+            batches = plan_token_batches(query, candidates, budget, 25)
+            if [data for batch in batches for data in batch] != candidates:
+                raise Exception("Batches must keep every candidate, in order")
+            for batch in batches:
+                tokens = profile_tokens(query) + sum(map(profile_tokens, batch))
+                if len(batch) > 25 or (len(batch) > 1 and tokens > budget):
+                    raise Exception(f"Batch of {len(batch)} ({tokens} tokens) over budget")
+            logger.info(f"✓ Batch sizes within budget: {[len(b) for b in batches]}")
+
+        # Ideas are summarized in the prompt: only a long list of terms is
+        # larger than the budget.
+        giant = make_profile("giant", "A long project idea.")
+        giant.tech_stack = [f"library{i}" for i in range(1000)]
+        batches = plan_token_batches(query, [giant] + short[:3], budget, 25)
+        if batches[0] != [giant]:
+            raise Exception("A profile over the budget must be scored alone")
+        logger.info("✓ Oversized profile scored alone")
+
+        cases = [
+            # (budget, coverage) -> next budget
+            ((3000, [(10, 10), (8, 8)]), 3000, "complete answers keep the budget"),
+            ((3000, [(10, 10), (6, 8)]), 2250, "missing ids shrink the budget"),
+            ((3000, [(1, 10)]), 1500, "the budget shrinks by half at most"),
+            ((300, [(1, 10)]), MIN_BATCH_TOKEN_BUDGET, "the budget has a floor"),
+            ((0, [(1, 10)]), 0, "a budget of 0 is left disabled"),
+        ]
+        for (current, coverage), expected, description in cases:
+            adapted = adapt_token_budget(current, coverage)
+            if adapted != expected:
+                raise Exception(f"{description}: expected {expected}, got {adapted}")
+            logger.info(f"✓ {description.capitalize()}")
+
+        scorer = LLMScorer(chain=None)
+        scores, unscored = scorer.merge_results(
+            [short[:2], short[2:4]],
+            [[(1, 3.0), (2, 2.0)], [(1, 1.0), (7, 4.0)]]
+        )
+        if scores != {"s0": 3.0, "s1": 2.0, "s2": 1.0}:
+            raise Exception(f"Unexpected merged scores: {scores}")
+        if unscored != [[short[3]]]:
+            raise Exception(f"Unexpected unscored candidates: {unscored}")
+        if scorer.batch_coverage != [(2, 2), (1, 2)]:
+            raise Exception(f"Unexpected coverage: {scorer.batch_coverage}")
+        logger.info("✓ Scorer records how many candidates each batch scored")
+
+        logger.success("✅ Batching test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Batching test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_batching()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Bulk Ingestion Test - Tests record parsing, chunk validation and upsert planning of /ingest_users
+"""
+
+import sys
+import json
+import asyncio
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_bulk_ingestion.log", level="DEBUG")
+
+
+def make_record(id, **overrides):
+    record = {
+        "id": id, "title": "Smart Campus", "domain": "IoT",
+        "idea": "Sensors that track classroom occupancy",
+        "tech_stack": ["Python", "MQTT"], "interests": ["IoT"], "score": 0.0,
+        "metadata": {
+            "id": id, "department": "Computer Science", "year": 2022,
+            "gpa": 3.0, "gender": "female", "skills": ["Python"],
+            "email": f"{id}@nu.edu.pk"
+        }
+    }
+    record.update(overrides)
+    return record
+
+
+async def read_ndjson(data: bytes, chunk_size: int) -> list:
+    from src.agent.application.ingestion import iter_ndjson
+
+    async def chunks():
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
+    return [record async for record in iter_ndjson(chunks())]
+
+
+def test_bulk_ingestion():
+    """Test NDJSON parsing and per-record validation failures"""
+    logger.info("📦 Testing Bulk Ingestion...")
+
+    try:
+        from src.agent.application.ingestion import validate_chunk
+
+        records = [make_record(f"i22-{i:04d}") for i in range(5)]
+        data = b"\n".join(json.dumps(r).encode() for r in records) + b"\n\n{oops\n"
+
+        # Lines split across network chunks must be reassembled.
+        parsed = asyncio.run(read_ndjson(data, chunk_size=17))
+        if parsed[:5] != records or len(parsed) != 6:
+            raise Exception(f"Expected 5 records and 1 invalid line, got {len(parsed)}")
+        logger.info("✓ NDJSON lines are parsed across chunk boundaries")
+
+        chunk = parsed + [make_record("i22-bad", score="high"), 42]
+        profiles, positions, failures = validate_chunk(chunk, start=100)
+
+        if [p.id for p in profiles] != [r["id"] for r in records]:
+            raise Exception(f"Unexpected valid profiles: {[p.id for p in profiles]}")
+        if positions != [100, 101, 102, 103, 104]:
+            raise Exception(f"Unexpected positions: {positions}")
+        logger.info("✓ Valid records survive invalid neighbours")
+
+        failed = [(f.index, f.id) for f in failures]
+        if failed != [(105, None), (106, "i22-bad"), (107, None)]:
+            raise Exception(f"Unexpected failures: {failed}")
+        if not failures[1].error.startswith("score:"):
+            raise Exception(f"Failure should name the field: {failures[1].error}")
+        logger.info(f"✓ Failures reported per record: {failed}")
+
+        from bson import ObjectId
+        from src.agent.infrastructure.mongo.documents import KeyedUpsertPlan
+
+        # Resubmissions: one identical, one changed, one repeated in the batch.
+        stored = KeyedUpsertPlan(profiles[:2], "metadata.id")
+        stored.plan([])
+        existing = [
+            {"_id": ObjectId(), "metadata": {"id": p["metadata"]["id"]}, "document_hash": p["document_hash"]}
+            for p in stored.payloads
+        ]
+        changed = profiles[1].model_copy(update={"idea": "A different idea"})
+        plan = KeyedUpsertPlan([profiles[0], changed, profiles[2], profiles[2]], "metadata.id")
+        operations = plan.plan(existing)
+
+        if plan.statuses != ["unchanged", "updated", "failed", "inserted"]:
+            raise Exception(f"Unexpected upsert statuses: {plan.statuses}")
+        if len(operations) != 2:
+            raise Exception(f"Expected 2 writes, got {len(operations)}")
+        if plan.ids[:2] != [str(doc["_id"]) for doc in existing]:
+            raise Exception("Stored profiles should keep their _id")
+        logger.info(f"✓ Upserts skip unchanged profiles: {plan.statuses}")
+
+        logger.success("✅ Bulk ingestion test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Bulk ingestion test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_bulk_ingestion()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Checkpoints Test - Tests the Redis checkpointer of match jobs: resuming a
+graph run after a failure, the checkpoint position and the cleanup, and the
+error of jobs abandoned by a dead worker
+"""
+
+import sys
+import asyncio
+import traceback
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_checkpoints.log", level="DEBUG")
+
+
+def build_scan_graph(checkpointer, scanned, fail_at):
+    """A scan shaped like the match graph: one batch of 10 profiles per step
+    until `total` is reached, failing once at offset `fail_at`"""
+    from pydantic import BaseModel
+    from langgraph.graph import StateGraph, START, END
+
+    class Scan_state(BaseModel):
+        offset: int = 0
+        total: int = 50
+        last_id: Optional[str] = None
+        done: bool = False
+        results: list[int] = []
+
+    def scan(state: Scan_state) -> dict:
+        if state.offset == fail_at and not failed:
+            failed.append(state.offset)
+            raise RuntimeError("worker crashed")
+        scanned.append(state.offset)
+        offset = state.offset + 10
+        return {
+            "offset": offset,
+            "last_id": f"id-{offset - 1}",
+            "done": offset >= state.total,
+            "results": state.results + [state.offset],
+        }
+
+    failed: list[int] = []
+
+    builder = StateGraph(Scan_state)
+    builder.add_node("scan", scan)
+    builder.add_edge(START, "scan")
+    builder.add_conditional_edges("scan", lambda state: END if state.done else "scan")
+    return builder.compile(checkpointer=checkpointer)
+
+
+async def run_resume(saver, thread_id):
+    config = {"configurable": {"thread_id": thread_id}}
+    scanned: list[int] = []
+    graph = build_scan_graph(saver, scanned, fail_at=30)
+
+    try:
+        await graph.ainvoke({"total": 50}, config, checkpoint_during=True)
+        raise Exception("The scan should fail at offset 30")
+    except RuntimeError:
+        pass
+    if scanned != [0, 10, 20]:
+        raise Exception(f"Unexpected batches before the failure: {scanned}")
+
+    position = saver.get_position(thread_id)
+    if position is None or position["offset"] != 30 or position["total"] != 50:
+        raise Exception(f"Unexpected position after the failure: {position}")
+    if position["last_id"] != "id-29" or position["done"]:
+        raise Exception(f"Unexpected position after the failure: {position}")
+    logger.info(f"✓ Failed run left its position: {position}")
+
+    saved = await graph.aget_state(config)
+    if saved.next != ("scan",):
+        raise Exception(f"Failed step should be pending: {saved.next}")
+
+    result = await graph.ainvoke(None, config, checkpoint_during=True)
+    if scanned != [0, 10, 20, 30, 40]:
+        raise Exception(f"Resumed run should skip scanned batches: {scanned}")
+    if result["results"] != [0, 10, 20, 30, 40] or not result["done"]:
+        raise Exception(f"Unexpected resumed result: {result}")
+    logger.info("✓ Resumed run continued from the last completed batch")
+
+    saved = await graph.aget_state(config)
+    if saved.next or saved.values["offset"] != 50:
+        raise Exception(f"Finished run should have no pending step: {saved}")
+    logger.info("✓ Finished run is kept as the latest checkpoint")
+
+
+def test_checkpoints():
+    """Test the Redis checkpointer against the configured Redis server"""
+    logger.info("💾 Testing Checkpoints...")
+
+    thread_id = f"test-checkpoints-{uuid4()}"
+    saver = None
+    try:
+        from src.agent.infrastructure.redis import (
+            RedisCheckpointSaver,
+            checkpoint_key,
+            checkpoint_namespaces_key,
+            get_redis_connection,
+        )
+
+        client = get_redis_connection(decode_responses=False)
+        client.ping()
+        saver = RedisCheckpointSaver(client, ttl=60)
+
+        if saver.get_position(thread_id) is not None:
+            raise Exception("Unknown thread should have no position")
+
+        asyncio.run(run_resume(saver, thread_id))
+
+        key = checkpoint_key(thread_id)
+        blobs = client.hkeys(f"{key}:blobs")
+        channels = {field.decode().split(":")[0] for field in blobs}
+        if len(blobs) != len(channels):
+            raise Exception(f"Stale channel values should be pruned: {blobs}")
+        if len(list(saver.list({"configurable": {"thread_id": thread_id}}))) != 1:
+            raise Exception("Only the latest checkpoint should be listed")
+        if not 0 < client.ttl(key) <= 60:
+            raise Exception(f"Checkpoint should expire: {client.ttl(key)}")
+        logger.info("✓ Only the latest checkpoint and its values are kept")
+
+        saver.delete_thread(thread_id)
+        keys = [key, f"{key}:blobs", f"{key}:writes", checkpoint_namespaces_key(thread_id)]
+        if client.exists(*keys):
+            raise Exception("Deleted thread should leave no keys")
+        if saver.get_position(thread_id) is not None:
+            raise Exception("Deleted thread should have no position")
+        logger.info("✓ Deleting a thread removes its checkpoint")
+
+        logger.success("✅ Checkpoints test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Checkpoints test failed: {e}")
+        logger.error(traceback.format_exc())
+        if saver is not None:
+            try:
+                saver.delete_thread(thread_id)
+            except Exception:
+                pass
+        return False
+
+
+def test_abandoned_jobs():
+    """Test that a job abandoned after its last retry is recorded as failed"""
+    logger.info("🪦 Testing Abandoned Jobs...")
+
+    queue = None
+    jobs = {}
+    try:
+        from rq import Callback, Queue, Retry
+        from rq.job import Job
+        from src.agent.application.jobs import on_match_job_failure, run_match_job
+        from src.agent.infrastructure.redis import JobStore, get_redis_connection, job_key
+
+        queue = Queue(f"test-abandoned-{uuid4()}", connection=get_redis_connection(decode_responses=False))
+        store = JobStore()
+        jobs = {f"{queue.name}-retried": 1, f"{queue.name}-failed": 0}
+
+        for job_id, retries in jobs.items():
+            store.create(job_id)
+            job = queue.enqueue(
+                run_match_job, job_id, b"",
+                job_id=job_id,
+                retry=Retry(max=retries) if retries else None,
+                on_failure=Callback(on_match_job_failure),
+            )
+            # What a worker that died while running the job leaves behind.
+            queue.remove(job)
+            queue.connection.zadd(queue.started_job_registry.key, {f"{job_id}:execution": 1})
+
+        queue.started_job_registry.cleanup()
+
+        retried, failed = jobs
+        if store.get_status(retried) != {"status": "processing"}:
+            raise Exception(f"Job with retries left should stay processing: {store.get_status(retried)}")
+        if Job.fetch(retried, connection=queue.connection).get_status() != "queued":
+            raise Exception("Job with retries left should be queued again")
+        logger.info("✓ Abandoned job with retries left is queued again")
+
+        status = store.get_status(failed)
+        if status is None or status["status"] != "error" or "AbandonedJobError" not in status["error"]:
+            raise Exception(f"Abandoned job should be recorded as failed: {status}")
+        logger.info(f"✓ Abandoned job without retries is recorded as failed: {status['error']}")
+
+        logger.success("✅ Abandoned jobs test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Abandoned jobs test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+    finally:
+        if queue is not None:
+            try:
+                queue.empty()
+                queue.delete(delete_jobs=True)
+                JobStore().client.delete(*(job_key(job_id) for job_id in jobs))
+            except Exception:
+                pass
+
+
+if __name__ == "__main__":
+    success = test_checkpoints() and test_abandoned_jobs()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Encoding Test - Tests the compact encoding of profiles in the scoring prompt
+"""
+
+import sys
+import json
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_encoding.log", level="DEBUG")
+
+
+IDEA = (
+    "This project aims to build a system that detects brain tumors in MRI scans "
+    "using convolutional neural networks. The model is trained on public datasets "
+    "and deployed as a web application for radiologists. Doctors can upload scans, "
+    "review highlighted regions and export reports. Future work includes support "
+    "for CT scans and integration with hospital information systems."
+)
+
+
+def make_profile(id, idea=IDEA):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea=idea,
+        tech_stack=["Python", "PyTorch", "ReactJS", "python "],
+        interests=["ML", "Machine Learning", "Medical Imaging", "AI"],
+        score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="male", skills=["Python", "Python programming", "React.js", "Docker"],
+            email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+def test_encoding():
+    """Test aliases, canonical terms, idea summaries and the prompt size"""
+    logger.info("🗜️ Testing Profile Encoding...")
+
+    try:
+        from src.agent.application.scoring import (
+            LLMScorer,
+            canonical_terms,
+            decode_alias,
+            encode_batch,
+            summarize_idea,
+        )
+        from src.agent.infrastructure.redis import estimate_tokens
+
+        query = make_profile("query")
+        candidates = [make_profile(f"6650f1c2a9e4b7d3c8{i:06d}") for i in range(5)]
+
+        encoded = encode_batch(query, candidates)["input"]
+        if [item["id"] for item in encoded] != [0, 1, 2, 3, 4, 5]:
+            raise Exception(f"Unexpected aliases: {[item['id'] for item in encoded]}")
+        for alias, data in enumerate(candidates, start=1):
+            if decode_alias(alias, candidates) != data.id:
+                raise Exception(f"Alias {alias} does not map back to {data.id}")
+        for alias in (0, 6, "x", None, "2"):
+            decoded = decode_alias(alias, candidates)
+            if (alias == "2") != (decoded == candidates[1].id):
+                raise Exception(f"Unexpected id for alias {alias!r}: {decoded}")
+        logger.info("✓ Candidates are numbered from 1 and mapped back")
+
+        cases = [
+            # (terms, known) -> canonical terms
+            ((["ML", "Machine Learning", "AI"], None), ["machine learning", "ai"]),
+            ((["Python", "python ", "Python programming"], None), ["python"]),
+            ((["C++", "C#", "cpp"], None), ["c++", "c#"]),
+            ((["Python", "Docker"], ["python"]), ["docker"]),
+        ]
+        for (terms, known), expected in cases:
+            kept = canonical_terms(terms, known=known)
+            if kept != expected:
+                raise Exception(f"{terms}: expected {expected}, got {kept}")
+        logger.info("✓ Terms are canonicalized and deduplicated")
+
+        for max_words in (5, 20, 40):
+            summary = summarize_idea(IDEA, max_words=max_words)
+            if not summary or len(summary.split()) > max_words:
+                raise Exception(f"Summary over {max_words} words: {summary!r}")
+        if summarize_idea(IDEA, max_words=40).lower().startswith("this project"):
+            raise Exception("The summary must drop the 'This project aims to' opening")
+        if summarize_idea("A chatbot.", max_words=40) != "A chatbot.":
+            raise Exception("A short idea must be kept as is")
+        logger.info("✓ Idea summaries are bounded")
+
+        stored = make_profile("stored")
+        stored.idea_summary = "Stored summary."
+        if encode_batch(query, [stored])["input"][1]["idea"] != "Stored summary.":
+            raise Exception("The summary stored at ingest must be used")
+        logger.info("✓ Summary stored at ingest is used")
+
+        raw = json.dumps({"input": [
+            {
+                "id": data.id, "idea": data.idea, "interests": data.interests,
+                "tech_stack": data.tech_stack, "skills": data.metadata.skills
+            }
+            for data in [query] + candidates
+        ]})
+        before, after = estimate_tokens(raw), estimate_tokens(json.dumps(encoded))
+        if after > before * 0.75:
+            raise Exception(f"Encoding saved too little: {before} -> {after} tokens")
+        logger.info(f"✓ Prompt input reduced from {before} to {after} tokens")
+
+        scores, _ = LLMScorer(chain=None).parse_result(
+            [(1, 4.0), (3, 2.0), (0, 5.0), (9, 1.0)], candidates
+        )
+        if scores != {candidates[0].id: 4.0, candidates[2].id: 2.0}:
+            raise Exception(f"Unexpected parsed scores: {scores}")
+        logger.info("✓ Scorer maps aliases of the answer back to ids")
+
+        logger.success("✅ Encoding test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Encoding test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_encoding()
+    sys.exit(0 if success else 1)
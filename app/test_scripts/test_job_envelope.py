@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Job Envelope Test - Tests the encoding of match job payloads and results
+"""
+
+import sys
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_job_envelope.log", level="DEBUG")
+
+
+def test_job_envelope():
+    """Test envelope round-trips, compression and version checks"""
+    logger.info("📦 Testing Job Envelope...")
+
+    try:
+        import orjson
+        from src.agent.infrastructure.redis.jobs import (
+            ENVELOPE_VERSION,
+            decode_envelope,
+            encode_envelope,
+        )
+
+        body = {"result": [{"id": str(i), "score": 4.5} for i in range(3)]}
+
+        small = encode_envelope("match_result", body, compress_min_bytes=1 << 20)
+        if not small.startswith(b"{") or decode_envelope(small, "match_result") != body:
+            raise Exception("Small envelope did not round-trip uncompressed")
+        logger.info("✓ Small envelopes are plain JSON")
+
+        large = encode_envelope("match_result", body, compress_min_bytes=0)
+        if large.startswith(b"{") or decode_envelope(large, "match_result") != body:
+            raise Exception("Large envelope did not round-trip compressed")
+        logger.info("✓ Large envelopes are compressed")
+
+        for data, reason in [
+            (small, "another kind"),
+            (orjson.dumps({"v": ENVELOPE_VERSION + 1, "kind": "match_job", "body": {}}), "another version"),
+            (b"not an envelope", "corrupt data"),
+        ]:
+            try:
+                decode_envelope(data, "match_job")
+                raise Exception(f"Envelope of {reason} was accepted")
+            except ValueError:
+                logger.info(f"✓ Envelope of {reason} is rejected")
+
+        logger.success("✅ Job envelope test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Job envelope test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_job_envelope()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+LLM Retry Test - Tests the retry of failed LLM scoring batches and the dead
+letters of the batches that still fail
+"""
+
+import sys
+import time
+import traceback
+from email.utils import formatdate
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_llm_retry.log", level="DEBUG")
+
+
+def make_profile(id):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea="A chatbot.",
+        tech_stack=["Python"], interests=["AI"], score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="male", skills=["Python"], email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+def groq_error(error_class, status, headers=None):
+    import httpx
+
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return error_class(f"Error code: {status}", response=response, body=None)
+
+
+class FlakyChain:
+    """Fails the batches whose first candidate is in `failures` with the next
+    error scripted for it, else scores every candidate"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def answer(self, input):
+        self.calls += 1
+        candidates = input["input"][1:]
+        errors = self.failures.get(candidates[0]["idea"], [])
+        if errors:
+            return errors.pop(0)
+        return [(candidate["id"], 1.0) for candidate in candidates]
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        return [self.answer(input) for input in inputs]
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        return self.batch(inputs, config, return_exceptions)
+
+
+def test_llm_retry():
+    """Test backoff delays, batch retries and dead letters"""
+    logger.info("🔁 Testing LLM Retry...")
+
+    try:
+        import asyncio
+        import groq
+        from src.agent.application.scoring import (
+            LLMScorer, backoff_delay, is_transient, retry_after
+        )
+        from src.agent.application.agents.graphs.nodes.find_connection_node import (
+            find_connection_node
+        )
+        from src.agent.config import settings
+        from src.agent.domain.match_state import Match_State
+        from src.agent.domain.top_k import Top_k
+
+        settings.MATCH_SCORE_CACHE_ENABLED = False
+
+        rate_limited = groq_error(groq.RateLimitError, 429, {"retry-after": "7"})
+        dated = groq_error(
+            groq.RateLimitError, 429, {"retry-after": formatdate(time.time() + 30, usegmt=True)}
+        )
+        cases = [
+            (rate_limited, 7.0),
+            (groq_error(groq.InternalServerError, 503), None),
+            (ValueError("not an HTTP error"), None),
+        ]
+        for error, expected in cases:
+            if retry_after(error) != expected:
+                raise Exception(f"Expected retry-after {expected} for {error!r}")
+        if not 28 <= retry_after(dated) <= 30:
+            raise Exception(f"Unexpected retry-after of an HTTP date: {retry_after(dated)}")
+        logger.info("✓ Retry-after headers are read in seconds and as dates")
+
+        import httpx
+        connection_error = groq.APITimeoutError(request=httpx.Request("POST", "https://api.groq.com"))
+        if not all(map(is_transient, [rate_limited, dated, connection_error])):
+            raise Exception("Rate limit, server and connection errors must be retried")
+        if is_transient(groq_error(groq.AuthenticationError, 401)) or is_transient(ValueError()):
+            raise Exception("Other errors must not be retried")
+        logger.info("✓ Rate limit, server and connection errors are transient")
+
+        for attempt in (1, 2, 3, 10):
+            delays = [backoff_delay(attempt, base_delay=0.5, max_delay=3.0) for _ in range(200)]
+            if min(delays) < 0 or max(delays) > min(3.0, 0.5 * 2 ** (attempt - 1)):
+                raise Exception(f"Backoff of attempt {attempt} out of bounds")
+            if len(set(delays)) < 100:
+                raise Exception("Backoff delays must be jittered")
+        delay = backoff_delay(1, rate_limited, base_delay=0.5, max_delay=3.0)
+        if not 7.0 <= delay <= 7.5:
+            raise Exception(f"Retry-after must be honored: {delay}")
+        at_limit = groq_error(groq.RateLimitError, 429, {"retry-after": "3"})
+        if max(backoff_delay(1, at_limit, base_delay=0.5, max_delay=3.0) for _ in range(200)) > 3.0:
+            raise Exception("Jitter must not take a retry-after within the maximum over it")
+        logger.info("✓ Backoff is exponential, capped, jittered and honors retry-after")
+
+        now = {"retry-after": "0"}
+        query = make_profile("query")
+        candidates = [make_profile(f"c{i}") for i in range(6)]
+        for data in candidates:
+            data.idea = data.id
+        batches = [candidates[:2], candidates[2:4], candidates[4:]]
+
+        chain = FlakyChain({
+            # Recovers on the second retry.
+            "c0": [
+                groq_error(groq.RateLimitError, 429, now),
+                groq_error(groq.InternalServerError, 500, now),
+            ],
+            # Never recovers.
+            "c2": [groq_error(groq.InternalServerError, 503, now)] * 10,
+        })
+
+        scorer = LLMScorer(chain)
+        scores = scorer.invoke_chain(query, batches)
+        if set(scores) != {"c0", "c1", "c4", "c5"}:
+            raise Exception(f"Unexpected scored candidates: {sorted(scores)}")
+        if chain.calls != 3 + 2 + 2 + settings.GROQ_RETRY_ATTEMPTS - 2:
+            raise Exception(f"Unexpected number of calls: {chain.calls}")
+        failed = [([d.id for d in b], n) for b, _, n in scorer.failed_batches]
+        if failed != [(["c2", "c3"], settings.GROQ_RETRY_ATTEMPTS + 1)]:
+            raise Exception(f"Unexpected failed batches: {failed}")
+        if scorer.batch_coverage != [(2, 2), (2, 2)] or scorer.rescored_batches:
+            raise Exception("Failed batches must not shrink the budget nor be rescored")
+        logger.info(f"✓ Transient errors retried, {scorer.retries} retries, one batch failed for good")
+
+        chain = FlakyChain({"c0": [groq_error(groq.AuthenticationError, 401)]})
+        scorer = LLMScorer(chain)
+        scores = asyncio.run(scorer.ainvoke_chain(query, batches))
+        if "c0" in scores or chain.calls != 3 or len(scorer.failed_batches) != 1:
+            raise Exception("Errors that are not transient must not be retried")
+        logger.info("✓ Errors that are not transient fail the batch without retries")
+
+        chain = FlakyChain({"c0": [ConnectionResetError("reset by peer")]})
+        scorer = LLMScorer(chain)
+        scores = scorer.invoke_chain(query, batches)
+        failed = [[d.id for d in b] for b, _, _ in scorer.failed_batches]
+        if failed != [["c0", "c1"]] or set(scores) != {"c2", "c3", "c4", "c5"}:
+            raise Exception(f"Other errors of the request must fail only their batch: {failed}")
+        logger.info("✓ Errors other than Groq's fail only their batch")
+
+        chain = FlakyChain({"c0": [TypeError("bug in the chain")]})
+        try:
+            LLMScorer(chain).invoke_chain(query, batches)
+            raise Exception("Programming errors must fail the job")
+        except TypeError:
+            logger.info("✓ Programming errors fail the job")
+
+        chain = FlakyChain({"c0": [groq_error(groq.RateLimitError, 429, {"retry-after": "3600"})]})
+        scorer = LLMScorer(chain)
+        started = time.monotonic()
+        scorer.invoke_chain(query, batches)
+        if time.monotonic() - started > 5 or len(scorer.failed_batches) != 1:
+            raise Exception("A retry-after over GROQ_RETRY_MAX_DELAY must not be waited for")
+        logger.info("✓ Retry-after over the maximum delay fails the batch at once")
+
+        chain = FlakyChain({
+            "c0": [groq_error(groq.RateLimitError, 429, {"retry-after": "3600"})] * 10,
+            "c2": [groq_error(groq.InternalServerError, 500, now)],
+        })
+        scorer = LLMScorer(chain)
+        scores = scorer.invoke_chain(query, batches)
+        failed = [[d.id for d in b] for b, _, _ in scorer.failed_batches]
+        if failed != [["c0", "c1"]] or set(scores) != {"c2", "c3", "c4", "c5"}:
+            raise Exception(f"Other batches must still be retried: {failed}, {sorted(scores)}")
+        if chain.calls != 4:
+            raise Exception(f"The batch given up must not be sent again: {chain.calls} calls")
+        logger.info("✓ A long retry-after only gives up its own batch")
+
+        chain = FlakyChain({"c2": [groq_error(groq.AuthenticationError, 401)]})
+        state = Match_State(
+            all_data=[data.model_copy() for data in candidates], query=query, done=False,
+            limit=2, results=Top_k(k=10), scoring_mode="llm", chain=chain,
+        )
+        state = find_connection_node(state)
+        kept = sorted(data.id for data in state.results.best())
+        if kept != ["c0", "c1", "c4", "c5"]:
+            raise Exception(f"The job must keep the other scores: {kept}")
+        letters = [(letter.candidate_ids, letter.attempts) for letter in state.dead_letters]
+        if letters != [(["c2", "c3"], 1)] or state.stats.llm_failed_batches != 1:
+            raise Exception(f"Unexpected dead letters: {letters}")
+        logger.info(f"✓ Job keeps its scores and records the dead letter: {state.dead_letters[0].error}")
+
+        logger.success("✅ LLM retry test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ LLM retry test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_llm_retry()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Prompt Registry Test - Tests offline prompt loading, the local prompt cache
+and the per-process chain registry
+"""
+
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_prompt_registry.log", level="DEBUG")
+
+
+def test_prompt_registry():
+    """Test fallback templates and the cache round-trip without LangSmith"""
+    logger.info("📝 Testing Prompt Registry...")
+
+    try:
+        from langchain_core.load import dumpd
+        from src.agent.application.agents.prompts.registry import (
+            CACHE_FORMAT_VERSION,
+            PromptRegistry,
+        )
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            registry = PromptRegistry(cache_dir=cache_dir, refresh=False)
+
+            prompt = registry.get("project_generation")
+            if set(prompt.input_variables) != {
+                "previous_ideas", "departments", "yos", "format_instructions"
+            }:
+                raise Exception(f"Unexpected variables: {prompt.input_variables}")
+            logger.info("✓ Local template is used before any pull")
+
+            # What a refresh writes after pulling a new commit.
+            cached = prompt.partial(format_instructions="{}")
+            registry._save("project_generation", {
+                "format": CACHE_FORMAT_VERSION,
+                "name": "project_generation",
+                "commit_hash": "abc123",
+                "prompt": dumpd(cached),
+                "checked_at": 0.0,
+            })
+
+            restored = PromptRegistry(cache_dir=cache_dir, refresh=False)
+            if restored.get("project_generation") != cached:
+                raise Exception("Cached prompt did not round-trip")
+            logger.info("✓ Cached prompt is loaded by a new registry")
+
+            if restored.version("project_generation") != "abc123":
+                raise Exception("Cached prompt should keep its commit hash")
+            logger.info("✓ Cached prompt keeps its commit hash")
+
+            registry._path("project_generation").write_text("{not json")
+            corrupt = PromptRegistry(cache_dir=cache_dir, refresh=False)
+            if corrupt.version("project_generation") != "local":
+                raise Exception("A corrupt cache file should fall back to the local template")
+            logger.info("✓ Corrupt cache file falls back to the local template")
+
+            try:
+                registry.get("unknown_prompt")
+                raise Exception("Unknown prompts should raise KeyError")
+            except KeyError:
+                logger.info("✓ Unknown prompts are rejected")
+
+        logger.success("✅ Prompt registry test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Prompt registry test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+def test_chain_registry():
+    """Test that chains are built once per process and version"""
+    logger.info("🔗 Testing Chain Registry...")
+
+    try:
+        from src.agent.application.agents.chains.registry import ChainRegistry
+
+        registry = ChainRegistry()
+
+        chain = registry.get("partial_connection_finding")
+        if registry.get("partial_connection_finding") is not chain:
+            raise Exception("Chain was rebuilt instead of reused")
+        logger.info("✓ Chain is reused by later calls")
+
+        for name in ("connection_finding", "partial_connection_finding"):
+            if registry.version(name) != "local":
+                raise Exception(f"Code-defined prompt of {name} should have the local version")
+        logger.info("✓ Connection finding prompts are defined in code")
+
+        try:
+            registry.get("unknown_chain")
+            raise Exception("Unknown chains should raise KeyError")
+        except KeyError:
+            logger.info("✓ Unknown chains are rejected")
+
+        logger.success("✅ Chain registry test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Chain registry test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_prompt_registry() and test_chain_registry()
+    sys.exit(0 if success else 1)
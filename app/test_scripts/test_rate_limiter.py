@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Test - Tests the Groq token-bucket rate limiter
+"""
+
+import sys
+import time
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_rate_limiter.log", level="DEBUG")
+
+
+def test_rate_limiter():
+    """Test the rate limiter with its in-process fallback buckets"""
+    logger.info("⏱️  Testing Rate Limiter...")
+
+    try:
+        import redis
+        from src.agent.infrastructure.redis import TokenBucketRateLimiter
+
+        # Nothing listens on this port, so the limiter must fall back to
+        # its in-process buckets.
+        unreachable = redis.Redis(port=1, socket_connect_timeout=0.1)
+
+        limiter = TokenBucketRateLimiter(
+            name="test", requests_per_minute=3, tokens_per_minute=600,
+            redis_client=unreachable
+        )
+        waits = [limiter.try_acquire(10) for _ in range(4)]
+        logger.info(f"✓ Request bucket waits: {waits}")
+        if waits[:3] != [0.0, 0.0, 0.0]:
+            raise Exception("Requests within the quota should not wait")
+        if not 0 < waits[3] <= 20:
+            raise Exception(f"Expected a wait of up to 20s, got {waits[3]}")
+
+        limiter = TokenBucketRateLimiter(
+            name="test", requests_per_minute=600, tokens_per_minute=6000,
+            redis_client=unreachable
+        )
+        if limiter.try_acquire(5000) != 0.0:
+            raise Exception("Tokens within the quota should not wait")
+        wait = limiter.try_acquire(2000)
+        logger.info(f"✓ Token bucket wait: {wait:.2f}s")
+        if not 9 < wait <= 10:
+            raise Exception(f"Expected a wait of about 10s, got {wait}")
+
+        limiter = TokenBucketRateLimiter(
+            name="test", requests_per_minute=600, tokens_per_minute=6000,
+            redis_client=unreachable
+        )
+        while limiter.try_acquire(1) == 0.0:
+            pass
+        start = time.time()
+        limiter.acquire(1)
+        elapsed = time.time() - start
+        logger.info(f"✓ acquire on an empty bucket waited {elapsed:.2f}s")
+        if not 0.05 < elapsed < 0.5:
+            raise Exception("acquire should wait only until one request refills")
+
+        logger.success("✅ Rate limiter test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Rate limiter test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_rate_limiter()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Score Cache Test - Tests profile hashing and score cache fallbacks
+"""
+
+import sys
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_score_cache.log", level="DEBUG")
+
+
+def make_profile(id, idea, skills):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea=idea,
+        tech_stack=["Python"], interests=["NLP"], score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="female", skills=skills, email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+def test_score_cache():
+    """Test the score cache without a Redis server"""
+    logger.info("🗄️  Testing Score Cache...")
+
+    try:
+        import redis
+        from src.agent.domain.match_stats import Match_stats
+        from src.agent.infrastructure.redis import ScoreCache
+        from src.agent.utils import profile_content_hash
+
+        a = make_profile("a", "Chatbot for admissions", ["Python"])
+        same_content = make_profile("b", "Chatbot for admissions", ["Python"])
+        edited = make_profile("a", "Chatbot for admissions", ["Python", "NLP"])
+
+        if profile_content_hash(a) != profile_content_hash(same_content):
+            raise Exception("Hash should only depend on scored content")
+        if profile_content_hash(a) == profile_content_hash(edited):
+            raise Exception("Editing a profile should change its hash")
+        logger.info("✓ Profile content hashes are stable and change on edits")
+
+        stats = Match_stats(cache_hits=3, cache_misses=1)
+        if stats.model_dump()["cache_hit_rate"] != 0.75:
+            raise Exception(f"Unexpected hit rate: {stats.model_dump()}")
+        logger.info("✓ Cache hit rate reported")
+
+        # Nothing listens on this port: the cache must degrade to misses.
+        cache = ScoreCache(
+            version="test",
+            use_mongo=False,
+            redis_client=redis.Redis(port=1, socket_connect_timeout=0.1)
+        )
+        key = cache.key(profile_content_hash(a), profile_content_hash(edited))
+        cache.set_many({key: 4.2})
+        if cache.get_many([key]) != {}:
+            raise Exception("Unreachable cache should report only misses")
+        logger.info("✓ Unreachable Redis is treated as a cache miss")
+
+        logger.success("✅ Score cache test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Score cache test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_score_cache()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Score Output Test - Tests the parsing of LLM scores and the rescoring of
+the candidates the LLM left unscored
+"""
+
+import sys
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_score_output.log", level="DEBUG")
+
+
+def make_profile(id):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea="A chatbot.",
+        tech_stack=["Python"], interests=["AI"], score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="male", skills=["Python"], email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+class ScriptedChain:
+    """Answers each batch with the next scripted answer, recording the inputs"""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.inputs = []
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        from src.agent.application.agents.chains.score_output_parser import ScoreOutputParser
+
+        self.inputs.append(inputs)
+        results = []
+        for _ in inputs:
+            try:
+                results.append(ScoreOutputParser().parse(self.answers.pop(0)))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+def test_score_output():
+    """Test the strict score parser and the rescoring of missing candidates"""
+    logger.info("🧾 Testing Score Output...")
+
+    try:
+        from langchain_core.exceptions import OutputParserException
+        from src.agent.application.agents.chains.score_output_parser import ScoreOutputParser
+        from src.agent.application.scoring import HybridScorer, LLMScorer, adapt_token_budget
+        from src.agent.config import settings
+
+        parser = ScoreOutputParser()
+        cases = [
+            ('{"s": [[1, 2.5], [2, 0.8]]}', [(1, 2.5), (2, 0.8)], "pairs are parsed"),
+            ('[[1, 2.5], ["2", 1]]', [(1, 2.5), (2, 1.0)], "a bare list and quoted ids are accepted"),
+            (
+                '{"s": [[1, 2.5], [2], ["x", 1.0], [3, 9.0], [4, "high"], [true, 1.0]]}',
+                [(1, 2.5)],
+                "malformed pairs are dropped"
+            ),
+        ]
+        for text, expected, description in cases:
+            pairs = parser.parse(text)
+            if pairs != expected:
+                raise Exception(f"{description}: expected {expected}, got {pairs}")
+            logger.info(f"✓ {description.capitalize()}")
+
+        for text in ('{"id": [1], "score": [2.0]}', '{"s": [[1, 2.0]', "Sure! Here are the scores"):
+            try:
+                parser.parse(text)
+                raise Exception(f"Parsed an invalid answer: {text!r}")
+            except OutputParserException:
+                pass
+        logger.info("✓ Answers of another shape are rejected")
+
+        if ScoreOutputParser(max_score=2.0).parse('{"s": [[1, 2.5]]}'):
+            raise Exception("Scores over max_score must be dropped")
+        logger.info("✓ Scores are bounded by max_score")
+
+        candidates = [make_profile(f"c{i}") for i in range(4)]
+        scores, missing = LLMScorer.parse_result(
+            [(1, 2.0), (2, 1.0), (2, 1.5), (3, 0.5), (3, 0.5), (7, 3.0)], candidates
+        )
+        if scores != {"c0": 2.0, "c2": 0.5} or missing != [candidates[1], candidates[3]]:
+            raise Exception(f"Unexpected scores {scores} and missing {missing}")
+        logger.info("✓ Conflicting duplicates and missing candidates are scored again")
+
+        query = make_profile("query")
+        chain = ScriptedChain([
+            '{"s": [[1, 2.0], [3, 1.0]]}',
+            "not json",
+            '{"s": [[1, 1.5]]}',
+            '{"s": [[1, 0.5], [2, 0.7]]}',
+        ])
+        scorer = LLMScorer(chain)
+        scores = scorer.invoke_chain(query, [candidates[:3], candidates[3:]])
+
+        rescored = [[item["id"] for item in batch["input"][1:]] for batch in chain.inputs[1]]
+        if rescored != [[1], [1]]:
+            raise Exception(f"Only the missing candidates must be sent again: {rescored}")
+        if scores != {"c0": 2.0, "c2": 1.0, "c1": 1.5, "c3": 0.5}:
+            raise Exception(f"Unexpected scores: {scores}")
+        if scorer.batch_coverage != [(2, 3)] or scorer.rescored_batches != [1, 1]:
+            raise Exception(
+                f"Unexpected coverage {scorer.batch_coverage} or "
+                f"rescored batches {scorer.rescored_batches}"
+            )
+        logger.info("✓ Only the unscored candidates are sent again")
+
+        # The unparsable answer says nothing about the prompt length.
+        if scorer.unparsed_candidates != 1:
+            raise Exception(f"Unexpected unparsed candidates: {scorer.unparsed_candidates}")
+        if adapt_token_budget(1000, scorer.batch_coverage) != 666:
+            raise Exception("Only parsed answers should resize the batches")
+        logger.info("✓ Unparsable answers do not shrink the batches")
+
+        chain = ScriptedChain(['{"s": [[1, 2.0]]}'] + ['{"s": []}'] * settings.MATCH_LLM_RESCORE_ROUNDS)
+        scores = HybridScorer(chain).score_batches(query, [candidates[:2]])
+        if set(scores) != {"c0"} or scores["c0"] < 2.0:
+            raise Exception(f"Candidates the LLM never scored must be left out: {scores}")
+        logger.info("✓ Hybrid scores leave out the candidates the LLM never scored")
+
+        logger.success("✅ Score output test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Score output test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_score_output()
+    sys.exit(0 if success else 1)
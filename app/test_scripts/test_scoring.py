@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Scoring Test - Tests the deterministic (heuristic) compatibility scorer
+"""
+
+import sys
+import time
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_scoring.log", level="DEBUG")
+
+
+def make_profile(id, idea, interests, tech_stack, skills):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea=idea,
+        tech_stack=tech_stack, interests=interests, score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="male", skills=skills, email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+def test_scoring():
+    """Test the heuristic scorer"""
+    logger.info("🧮 Testing Heuristic Scorer...")
+
+    try:
+        from src.agent.application.scoring import (
+            HEURISTIC_CRITERIA, HeuristicScorer, compute_criteria, get_scorer
+        )
+
+        query = make_profile(
+            "query", "Detect brain tumors in MRI scans with computer vision.",
+            ["Computer Vision", "Healthcare"], ["Python", "PyTorch"],
+            ["Python", "Deep Learning"]
+        )
+        good = make_profile(
+            "good", "Segment medical images for radiologists.",
+            ["Computer Vision", "Healthcare AI"], ["Python"],
+            ["Python", "PyTorch"]
+        )
+        bad = make_profile(
+            "bad", "A marketplace web app for used books.",
+            ["Web Development"], ["React"], ["JavaScript"]
+        )
+        empty = make_profile("empty", "", [], [], [])
+
+        criteria = compute_criteria(query, [good, bad, empty])
+        logger.info(f"✓ Criteria {HEURISTIC_CRITERIA}:\n{criteria}")
+
+        if criteria.shape != (3, len(HEURISTIC_CRITERIA)):
+            raise Exception(f"Unexpected criteria shape {criteria.shape}")
+        if (criteria < 0).any() or (criteria > 1).any():
+            raise Exception("Criteria outside the 0.0-1.0 range")
+        if criteria[0].sum() <= criteria[1].sum():
+            raise Exception("Related profile did not outscore unrelated profile")
+        if criteria[2].sum() != 0:
+            raise Exception("Empty profile should score 0.0 on every criterion")
+        logger.info("✓ Criteria ranges and ordering are valid")
+
+        scores = get_scorer("heuristic").score(query, [good, bad, empty])
+        if set(scores) != {"good", "bad", "empty"}:
+            raise Exception(f"Unexpected scored ids: {list(scores)}")
+        if not 0.0 <= min(scores.values()) <= max(scores.values()) <= 5.0:
+            raise Exception("Scores outside the 0.0-5.0 range")
+        logger.info(f"✓ Heuristic scores: {scores}")
+
+        cohort = [good, bad, empty] * 10000
+        start = time.time()
+        HeuristicScorer().score(query, cohort)
+        elapsed = time.time() - start
+        logger.info(f"✓ Scored {len(cohort)} profiles in {elapsed:.3f}s")
+        if elapsed > 1.0:
+            logger.warning("⚠️  Heuristic scoring slower than expected")
+
+        logger.success("✅ Heuristic scorer test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Heuristic scorer test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_scoring()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Top-k Test - Tests the bounded best-matches accumulator
+"""
+
+import sys
+import random
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_top_k.log", level="DEBUG")
+
+
+def make_profile(id):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea="", tech_stack=[], interests=[],
+        score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="male", skills=[], email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+def test_top_k():
+    """Test the Top_k accumulator against a full sort"""
+    logger.info("🏆 Testing Top-k Accumulator...")
+
+    try:
+        from src.agent.domain.top_k import Top_k
+
+        profiles = [make_profile(str(i)) for i in range(2000)]
+        scores = {p.id: round(random.uniform(0, 5), 1) for p in profiles}
+
+        top = Top_k(k=7)
+        for i in range(0, len(profiles), 100):
+            top.push_many(profiles[i:i + 100], scores)
+
+        expected = sorted(
+            scores.items(), key=lambda x: (x[1], x[0]), reverse=True
+        )[:7]
+        best = [(data.id, data.score) for data in top.best()]
+        logger.info(f"✓ Best matches: {best}")
+
+        if len(top) != 7:
+            raise Exception(f"Expected 7 kept matches, got {len(top)}")
+        if best != expected:
+            raise Exception(f"Expected {expected}, got {best}")
+        logger.info("✓ Kept matches equal the top 7 of a full sort")
+
+        winner = profiles[0]
+        top.push(winner, 10.0)
+        top.push(winner, 10.0)
+        if top.best()[0].id != winner.id or len(top) != 7:
+            raise Exception("Rescoring a kept profile should not duplicate it")
+        logger.info("✓ Rescored profiles are not duplicated")
+
+        restored = Top_k.model_validate(top.model_dump())
+        if restored.best() != top.best():
+            raise Exception("Top_k did not survive serialization")
+        logger.info("✓ Top_k round-trips through serialization")
+
+        logger.success("✅ Top-k test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Top-k test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_top_k()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Vector Index Test - Tests profile vectorization, LSH search and persistence
+"""
+
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_vector_index.log", level="DEBUG")
+
+
+def make_profile(id, idea, interests, tech_stack, skills):
+    from src.agent.domain.fyp_data import Fyp_data
+    from src.agent.domain.metadata import Metadata
+
+    return Fyp_data(
+        id=id, title="", domain="", idea=idea,
+        tech_stack=tech_stack, interests=interests, score=0.0,
+        metadata=Metadata(
+            id=id, department="Computer Science", year=2022, gpa=3.0,
+            gender="female", skills=skills, email=f"{id}@nu.edu.pk"
+        )
+    )
+
+
+def test_vector_index():
+    """Test the local vector index"""
+    logger.info("🧭 Testing Vector Index...")
+
+    try:
+        from src.agent.infrastructure.vector_index import LSHVectorIndex
+
+        profiles = [
+            make_profile(
+                "ml", "Detect brain tumors from MRI scans with deep learning.",
+                ["Machine Learning", "Healthcare"], ["Python", "PyTorch"],
+                ["Python", "Deep Learning"]
+            ),
+            make_profile(
+                "web", "A marketplace web app for second hand books.",
+                ["Web Development"], ["React", "Node.js"],
+                ["JavaScript", "React"]
+            ),
+            make_profile(
+                "iot", "IoT based solar power monitoring with edge devices.",
+                ["IoT", "Embedded Systems"], ["C++", "MQTT"],
+                ["Arduino", "C++"]
+            ),
+        ]
+        query = make_profile(
+            "query", "Classify tumors in MRI images using deep learning.",
+            ["Machine Learning", "Computer Vision"], ["Python", "TensorFlow"],
+            ["Python", "Deep Learning"]
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "index.npz"
+
+            index = LSHVectorIndex(path=path)
+            index.add_and_save([p.id for p in profiles], profiles)
+            logger.info(f"✓ Indexed {len(index)} profiles")
+
+            results = index.search(query, top_n=2)
+            logger.info(f"✓ Search results: {results}")
+            if results[0][0] != "ml":
+                raise Exception(f"Expected 'ml' as nearest profile, got {results[0][0]}")
+
+            excluded = index.search(query, top_n=3, exclude_ids={"ml"})
+            if any(profile_id == "ml" for profile_id, _ in excluded):
+                raise Exception("Excluded id returned by search")
+            logger.info("✓ Excluded ids are filtered out")
+
+            # Re-adding an id replaces its vector instead of duplicating it
+            index.add(["web"], [profiles[1]])
+            if len(index) != 3:
+                raise Exception(f"Expected 3 profiles after re-adding, got {len(index)}")
+            logger.info("✓ Re-adding an id does not duplicate it")
+
+            reloaded = LSHVectorIndex(path=path)
+            if not reloaded.load() or len(reloaded) != 3:
+                raise Exception("Persisted index could not be reloaded")
+            if reloaded.search(query, top_n=1)[0][0] != "ml":
+                raise Exception("Reloaded index returned different results")
+            logger.info("✓ Index persisted and reloaded")
+
+        logger.success("✅ Vector index test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Vector index test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_vector_index()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Worker Pool Test - Tests the scaling decisions of the match worker pool
+"""
+
+import sys
+import traceback
+from pathlib import Path
+from loguru import logger
+
+# Add the src directory to Python path (from test_scripts directory)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+# Configure logger
+logger.remove()
+logger.add(sys.stdout, level="INFO")
+logger.add("test_worker_pool.log", level="DEBUG")
+
+
+def test_worker_pool():
+    """Test how many workers the pool asks for under different loads"""
+    logger.info("👷 Testing Worker Pool Scaling...")
+
+    try:
+        from src.agent.application.jobs.worker_pool import desired_workers
+
+        cases = [
+            # (current, queued, started, oldest_age, concurrency) -> workers
+            ((1, 0, 0, 0.0, 1), 1, "idle pool keeps its minimum"),
+            ((1, 5, 1, 1.0, 1), 1, "fresh backlog is left to running workers"),
+            ((1, 5, 1, 10.0, 1), 4, "old backlog scales up to the maximum"),
+            ((2, 1, 1, 10.0, 1), 2, "one worker per started or queued job"),
+            ((4, 0, 1, 0.0, 1), 1, "spare workers are released"),
+            ((1, 5, 3, 10.0, 8), 1, "async worker absorbs jobs up to its concurrency"),
+            ((1, 10, 8, 10.0, 8), 3, "one async worker per concurrency jobs"),
+            ((3, 2, 6, 0.0, 8), 1, "spare async workers are released"),
+        ]
+        for (*args, concurrency), expected, description in cases:
+            workers = desired_workers(
+                *args, minimum=1, maximum=4, scale_up_age=5.0,
+                concurrency=concurrency
+            )
+            if workers != expected:
+                raise Exception(f"{description}: expected {expected}, got {workers}")
+            logger.info(f"✓ {description.capitalize()}")
+
+        logger.success("✅ Worker pool test passed")
+        return True
+
+    except ImportError as e:
+        logger.error(f"❌ Failed to import required modules: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Worker pool test failed: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+if __name__ == "__main__":
+    success = test_worker_pool()
+    sys.exit(0 if success else 1)
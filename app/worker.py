@@ -0,0 +1,26 @@
+# worker.py
+import argparse
+import os
+
+from src.agent.config import settings
+from src.agent.application.jobs.worker_pool import run_worker_pool
+
+# ---------------------------------------------------
+# Configure LangSmith Tracing
+# ---------------------------------------------------
+os.environ["LANGCHAIN_TRACING_V2"] = settings.LANGSMITH_TRACING
+os.environ["LANGCHAIN_ENDPOINT"] = settings.LANGSMITH_ENDPOINT
+os.environ["LANGCHAIN_API_KEY"] = settings.LANGSMITH_API_KEY
+os.environ["LANGCHAIN_PROJECT"] = settings.LANGSMITH_PROJECT
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the match worker pool.")
+    parser.add_argument(
+        "--burst",
+        action="store_true",
+        help="Exit once the matches queue is empty."
+    )
+    args = parser.parse_args()
+
+    run_worker_pool(burst=args.burst)